@@ -8,6 +8,8 @@ import signal
 from typing import Dict, List, Set, Optional, Tuple
 from threading import RLock, Thread
 
+from ravestate.spawner import ContextSpawner
+
 from reggol import get_logger
 logger = get_logger(__name__)
 
@@ -41,10 +43,12 @@ class SessionManager:
                  num_idle_instances,
                  usable_ports,
                  hostname,
-                 zombie_heartbeat_threshold=20.):
+                 zombie_heartbeat_threshold=20.,
+                 session_spawner: Optional[ContextSpawner] = None):
         self.db_path = db_path
         self.refresh_iv_secs = refresh_iv_secs
         self.session_launch_args: List[str] = session_launch_args
+        self.session_spawner = session_spawner
         self.num_idle_instances = num_idle_instances
         self.usable_ports = usable_ports
         self.conn = sqlite3.connect(db_path, check_same_thread=False)
@@ -148,16 +152,25 @@ class SessionManager:
             """)
             # commit before starting the new process, such that the entry is definitely seen
             self.conn.commit()
-            # start raveboard on the selected port
-            new_session.process = psutil.Popen([
-                arg.replace(
-                    "{port}", str(new_session.port)
-                ).replace(
-                    "{python}", py_interpreter
-                ).replace(
-                    "{session_db}", self.db_path)
-                for arg in self.session_launch_args
-            ])
+            # start raveboard on the selected port, preferably
+            #  by forking it from the pre-warmed template process
+            pid = None
+            if self.session_spawner:
+                pid = self.session_spawner.spawn(runtime_overrides=[
+                    ("raveboard", "port", new_session.port),
+                    ("raveboard", "session_db", self.db_path)])
+            if pid is not None:
+                new_session.process = psutil.Process(pid)
+            else:
+                new_session.process = psutil.Popen([
+                    arg.replace(
+                        "{port}", str(new_session.port)
+                    ).replace(
+                        "{python}", py_interpreter
+                    ).replace(
+                        "{session_db}", self.db_path)
+                    for arg in self.session_launch_args
+                ])
             self.created_sessions += 1
 
     def is_authorized(self, url, secret_token):
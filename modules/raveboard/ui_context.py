@@ -40,9 +40,45 @@ RAVEBOARD_CONFIG = {
 }
 
 
+# The raveboard module is shared by all UIContexts in a process, e.g. by the sessions
+#  which are forked from a template, so it's states access the UIContext which runs them.
+with rs.Module(name=RAVEBOARD, config=RAVEBOARD_CONFIG, depends=(rawio.mod, verbaliser.mod, nlp.mod)) as mod:
+
+    sig_last_output = rs.Signal(name="last-output")
+    sig_heartbeat = rs.Signal(name="heartbeat")
+    prop_connections = rs.Property(name="connections")
+
+    @rs.state(cond=rs.sig_startup.detached().min_age(1.), write=rawio.prop_out)
+    def startup(ctx):
+        ui_ctx: UIContext = ctx.ctx
+        session_db_path = ctx.conf(mod=RAVEBOARD, key=SESSION_DB_KEY)
+        if session_db_path:
+            ui_ctx.session_client = SessionClient(db_path=session_db_path, port=ctx.conf(key=PORT_CONFIG_KEY))
+        ui_ctx.config_parsed.set()
+        if ctx.conf(key=URL_ANNOUNCE_KEY) == ANNOUNCE_URL_YES:
+            sio_uri = urllib.parse.quote(f"{ctx.conf(key=URL_PREFIX_KEY)}:{ctx.conf(key=PORT_CONFIG_KEY)}")
+            url = f"{ctx.conf(key=URL_PREFIX_KEY)}:{ctx.conf(key=PORT_CONFIG_KEY)}/ravestate/index.html?rs-sio-url={sio_uri}"
+            logger.info(f"Raveboard URL: {url}")
+            ctx[rawio.prop_out] = f"Watch your conversation on Raveboard here! {url}"
+
+    @rs.state(cond=rs.sig_startup | sig_heartbeat.min_age(1.), signal=sig_heartbeat, emit_detached=True, boring=True)
+    def heartbeat(ctx):
+        ui_ctx: UIContext = ctx.ctx
+        ui_ctx.config_parsed.wait()
+        if ui_ctx.session_client and not ui_ctx.session_client.dead():
+            ui_ctx.session_client.heartbeat()
+            return rs.Emit()
+
+    @rs.state(read=rawio.prop_out, signal=sig_last_output, emit_detached=True, boring=True)
+    def emit_output(ctx):
+        ctx.ctx.sio.emit("output", {"type": "output", "text": ctx[rawio.prop_out.changed()]})
+        return rs.Emit(wipe=True)
+
+
 class UIContext(rs.Context):
 
-    def __init__(self, *arguments, runtime_overrides: List[Tuple[str, str, Any]] = None, skip_http_serve=False):
+    def __init__(self, *arguments, runtime_overrides: List[Tuple[str, str, Any]] = None, skip_http_serve=False,
+                 template: Optional[rs.Context] = None):
         self.msgs_lock = Lock()
         self.sio = socketio.Server(cors_allowed_origins="*", async_mode="threading")
         self.next_id_for_object = defaultdict(int)
@@ -53,7 +89,7 @@ class UIContext(rs.Context):
         self.new_connection: Callable = lambda: None
         self.new_connection_called: bool = False
 
-        super().__init__(*arguments, runtime_overrides=runtime_overrides)
+        super().__init__(*arguments, runtime_overrides=runtime_overrides, template=template)
         if not skip_http_serve:
             Thread(target=self.ui_serve_events_async).start()
 
@@ -92,39 +128,16 @@ class UIContext(rs.Context):
 
     def _load_modules(self, modules: List[str]):
         super()._load_modules(modules)
-
-        with rs.Module(name=RAVEBOARD, config=RAVEBOARD_CONFIG, depends=(rawio.mod, verbaliser.mod, nlp.mod)) as mod:
-
-            sig_last_output = rs.Signal(name="last-output")
-            sig_heartbeat = rs.Signal(name="heartbeat")
-            prop_connections = rs.Property(name="connections")
-
-            @rs.state(cond=rs.sig_startup.detached().min_age(1.), write=rawio.prop_out)
-            def startup(ctx):
-                session_db_path = ctx.conf(mod=RAVEBOARD, key=SESSION_DB_KEY)
-                if session_db_path:
-                    self.session_client = SessionClient(db_path=session_db_path, port=ctx.conf(key=PORT_CONFIG_KEY))
-                self.config_parsed.set()
-                if ctx.conf(key=URL_ANNOUNCE_KEY) == ANNOUNCE_URL_YES:
-                    sio_uri = urllib.parse.quote(f"{ctx.conf(key=URL_PREFIX_KEY)}:{ctx.conf(key=PORT_CONFIG_KEY)}")
-                    url = f"{ctx.conf(key=URL_PREFIX_KEY)}:{ctx.conf(key=PORT_CONFIG_KEY)}/ravestate/index.html?rs-sio-url={sio_uri}"
-                    logger.info(f"Raveboard URL: {url}")
-                    ctx[rawio.prop_out] = f"Watch your conversation on Raveboard here! {url}"
-
-            @rs.state(cond=rs.sig_startup | sig_heartbeat.min_age(1.), signal=sig_heartbeat, emit_detached=True, boring=True)
-            def heartbeat(ctx):
-                self.config_parsed.wait()
-                if self.session_client and not self.session_client.dead():
-                    self.session_client.heartbeat()
-                    return rs.Emit()
-
-            @rs.state(read=rawio.prop_out, signal=sig_last_output, emit_detached=True, boring=True)
-            def emit_output(ctx):
-                self.sio.emit("output", {"type": "output", "text": ctx[rawio.prop_out.changed()]})
-                return rs.Emit(wipe=True)
-
         self._add_ravestate_module(mod)
+        self._add_receptors()
 
+    def _adopt_template(self, template: rs.Context):
+        # The template already contains the raveboard module, whose states
+        #  access the UIContext which runs them, so only the receptors are bound to this context.
+        super()._adopt_template(template)
+        self._add_receptors()
+
+    def _add_receptors(self):
         @rs.receptor(ctx_wrap=self, write=(rawio.prop_in,))
         def receive_input(ctx, _, new_input_event):
             if 'text' not in new_input_event:
@@ -259,3 +272,14 @@ class UIContext(rs.Context):
     def _spike_discarded(self, spike: rs.Spike):
         super(UIContext, self)._spike_discarded(spike)
         self.ui_objects.pop(spike)
+
+
+def create_ui_context(arguments, runtime_overrides, template: Optional[rs.Context]) -> UIContext:
+    """
+    Context factory for forking raveboard sessions with a `ContextSpawner`.
+     The template is a UIContext which does not serve http, and every session
+     adopts it's modules, states and completed constraints.
+    """
+    if template is None:
+        return UIContext(*arguments, runtime_overrides=runtime_overrides, skip_http_serve=True)
+    return UIContext(runtime_overrides=runtime_overrides, template=template)
@@ -7,7 +7,9 @@ import time
 import yaml
 import sys
 import codecs
-from raveboard.session import SessionManager
+from raveboard.session import SessionManager, py_interpreter
+from raveboard.ui_context import create_ui_context
+from ravestate.spawner import ContextSpawner
 
 from reggol import get_logger
 logger = get_logger(__name__)
@@ -15,6 +17,7 @@ logger = get_logger(__name__)
 
 # Valid config keys
 RAVESTATE_SESSION_COMMAND = "ravestate_session_command"
+RAVESTATE_SESSION_ARGS = "ravestate_session_args"
 SESSION_DB_PATH = "session_db_path"
 SESSION_REFRESH_INTERVAL = "session_refresh_interval"
 NUM_IDLE_SESSIONS = "num_idle_sessions"
@@ -39,16 +42,27 @@ start_timestamp = time.time()
 app = Flask(__name__)
 CORS(app)
 
-# Child ravestate process call.
-ravestate_session_command = config.pop(RAVESTATE_SESSION_COMMAND, [
-    "{python}",
-    "-m", "raveboard",
+# Child ravestate process call. Only used if explicitly configured,
+#  otherwise sessions are forked from a pre-warmed template process.
+ravestate_session_command = config.pop(RAVESTATE_SESSION_COMMAND, None)
+ravestate_session_args = config.pop(RAVESTATE_SESSION_ARGS, [
     "ravestate_hibye",
-    "-d", "raveboard", "port",       "{port}",
-    "-d", "raveboard", "session_db", "{session_db}",
     "-d", "raveboard", "announce",   "skip",
     "-d", "raveboard", "greet",      "connect"
 ])
+session_spawner = None
+if not ravestate_session_command:
+    session_spawner = ContextSpawner(
+        *ravestate_session_args,
+        context_factory=create_ui_context,
+        executable=py_interpreter)
+    ravestate_session_command = [
+        "{python}",
+        "-m", "raveboard",
+        *ravestate_session_args,
+        "-d", "raveboard", "port",       "{port}",
+        "-d", "raveboard", "session_db", "{session_db}"
+    ]
 
 # Session manager. Manages raveboard subprocesses.
 sessions = SessionManager(
@@ -58,7 +72,8 @@ sessions = SessionManager(
     num_idle_instances=config.pop(NUM_IDLE_SESSIONS, 2),
     usable_ports=set(range(*config.pop(USABLE_PORT_RANGE, [5010, 5020]))),
     hostname=config.pop(HOSTNAME, "localhost"),
-    zombie_heartbeat_threshold=config.pop(ZOMBIE_HEARTBEAT_THRESHOLD, 30))
+    zombie_heartbeat_threshold=config.pop(ZOMBIE_HEARTBEAT_THRESHOLD, 30),
+    session_spawner=session_spawner)
 
 
 @app.route('/', methods=['GET'])
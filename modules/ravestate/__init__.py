@@ -4,8 +4,10 @@ from .causal import *
 from .config import *
 from .constraint import *
 from .context import *
+from .host import *
 from .module import *
 from .property import *
 from .receptor import *
+from .spawner import *
 from .spike import *
 from .state import *
@@ -40,6 +40,17 @@ class Activation(IActivation):
     consenting_causal_groups: Set[CausalGroup]
     pressuring_causal_groups: Set[ICausalGroup]
 
+    # Set by context, if this activation should be counted towards
+    #  the `core:pressure` and `core:activity` properties.
+    counts_for_core_properties: bool
+    # Remember how this activation is currently counted by context,
+    #  such that the counters may be updated incrementally.
+    counted_as_pressured: bool
+    counted_as_active: bool
+    # Remember whether this activation referenced any spike when it was last
+    #  seen by context, to detect activations which have become redundant.
+    counted_as_spiky: bool
+
     def __init__(self, st: State, ctx: IContext):
         self.id = f"{st.module_name}:{st.name}#{Activation._count_for_state[st]}"
         Activation._count_for_state[st] += 1
@@ -54,6 +65,10 @@ class Activation(IActivation):
         self.death_clock = None
         self.pressuring_causal_groups = set()
         self.spike_payloads = dict()
+        self.counts_for_core_properties = False
+        self.counted_as_pressured = False
+        self.counted_as_active = False
+        self.counted_as_spiky = False
 
     def __del__(self):
         logger.debug(f"Deleted {self}")
@@ -83,7 +98,8 @@ class Activation(IActivation):
         """
         return min(
             sum(self.ctx.signal_specificity(sig) for sig in conj.signals())
-            for conj in self.constraint.conjunctions()) * self.state_to_activate.get_current_weight()
+            for conj in self.constraint.conjunctions()) * self.state_to_activate.get_current_weight(
+                self.ctx.clock(), self.ctx.last_activation_time(self.state_to_activate))
 
     def dereference(self, *, spike: Optional[ISpike]=None, reacquire: bool=False, reject: bool=False, pressured: bool=False) -> None:
         """
@@ -121,6 +137,7 @@ class Activation(IActivation):
                     cg.rejected(dereferenced_spike, self, reason=0)
         # Update pressured causal groups, remove groups for which no spike is referenced anymore
         self.pressuring_causal_groups &= set(self.constraint.referenced_causal_groups())
+        self.ctx.activation_changed(self)
         if message:
             logger.debug(f"Dereferenced {self} from" + message)
 
@@ -142,6 +159,7 @@ class Activation(IActivation):
         if self.constraint.acquire(spike, self):
             if self.death_clock is not None or self._has_pressured_fulfilled_causal_groups():
                 self._reset_death_clock()
+            self.ctx.activation_changed(self)
             return True
         return False
 
@@ -169,6 +187,7 @@ class Activation(IActivation):
         self.pressuring_causal_groups = {causal for causal in self.pressuring_causal_groups} | {give_me_up}
         if self.death_clock is None and self._has_pressured_fulfilled_causal_groups():
             self._reset_death_clock()
+        self.ctx.activation_changed(self)
 
     def is_pressured(self):
         """
@@ -229,6 +248,7 @@ class Activation(IActivation):
             self.ctx.reacquire(self, signal)
             affected = True
         if affected:
+            self.ctx.activation_changed(self)
             logger.debug(f"{self}.effect_not_caused({group}, {effect})")
 
     def update(self) -> bool:
@@ -245,6 +265,7 @@ class Activation(IActivation):
 
         # Update pressured causal groups, remove groups for which no spike is referenced anymore
         self.pressuring_causal_groups &= set(self.constraint.referenced_causal_groups())
+        self.ctx.activation_changed(self)
 
         # Iterate over fulfilled conjunctions and look to activate with one of them
         for conjunction in self.constraint.conjunctions():
@@ -307,6 +328,7 @@ class Activation(IActivation):
                 self.dereference(reacquire=True, reject=True, pressured=True)
                 logger.info(f"Eliminated {self} from {self.pressuring_causal_groups}.")
                 self.pressuring_causal_groups = set()
+                self.ctx.activation_changed(self)
             else:
                 self.death_clock -= 1
 
@@ -335,9 +357,10 @@ class Activation(IActivation):
                                          state=self.state_to_activate,
                                          spike_parents=self.parent_spikes,
                                          spike_payloads=self.spike_payloads)
-        # -- Run state function
+        # -- Run state function, while holding the locks for the state's write-props
         try:
-            result = self.state_to_activate(context_wrapper, *self.args, **self.kwargs)
+            with context_wrapper:
+                result = self.state_to_activate(context_wrapper, *self.args, **self.kwargs)
         except:
             logger.error(f"An exception occurred while activating {self}: {traceback.format_exc()}")
             result = Resign()
@@ -379,5 +402,5 @@ class Activation(IActivation):
                 elif result.causal_group_action == StateResult.CAUSAL_GROUP_RESIGN:
                     cg.resigned(self)
 
-        self.state_to_activate.activation_finished()
+        self.ctx.state_activation_finished(self.state_to_activate)
 
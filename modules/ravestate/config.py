@@ -56,6 +56,21 @@ class Configuration:
         self.config_per_module[mod.name] = mod.conf
         self._apply_parsed_config(mod.name)
 
+    def clone(self) -> 'Configuration':
+        """
+        Create a copy of this configuration, whose entries may be
+         set without affecting this instance. Config values themselves are not copied.
+
+        **Returns:** A new Configuration instance with the same entries.
+        """
+        result = Configuration([])
+        for module_name, parsed_config in self.parsed_config_per_module.items():
+            result.parsed_config_per_module[module_name] = dict(parsed_config)
+        result.config_per_module = {
+            module_name: dict(config_entries)
+            for module_name, config_entries in self.config_per_module.items()}
+        return result
+
     def get_conf(self, module_name: str):
         """
         Retrieve updated config values for a module that was previously
@@ -1,13 +1,13 @@
 # Ravestate context class
-from threading import Thread, RLock, Event
-from typing import Optional, Any, Tuple, Set, Dict, Iterable, List, Generator
+from threading import Thread, Lock, RLock, Event, Semaphore
+from typing import Optional, Any, Tuple, Set, Dict, Iterable, List, Generator, Union
 from collections import defaultdict
 from math import ceil
 from copy import deepcopy
 import gc
 import importlib
 
-from ravestate.wrappers import PropertyWrapper
+from ravestate.wrappers import PropertyWrapper, PropertyAccessTable
 
 from ravestate.icontext import IContext
 from ravestate.module import Module, has_module, get_module
@@ -129,12 +129,48 @@ class Context(IContext):
     #  Y or Z, the constraint will become (Y & X) | (Z & X).
     _signal_causes: Dict[Signal, List[Conjunct]]
 
+    # Number of tracked activations which are pressured/partially fulfilled.
+    #  Maintained incrementally through activation_changed(), such that
+    #  `core:pressure` and `core:activity` do not need a sweep over all activations.
+    #  Guarded by a separate lock, because activations may report changes
+    #  from their own threads while holding causal group locks.
+    _num_pressured_acts: int
+    _num_active_acts: int
+    _act_status_lock: Lock
+
+    # Every state has exactly one explicitly tracked catch-all activation,
+    #  which does not reference any spikes yet. Other activations which
+    #  lose all of their spikes are redundant: They are collected in
+    #  _unspiky_acts (guarded by _act_status_lock), and removed by run_once().
+    _catch_all_act_per_state: Dict[State, Activation]
+    _unspiky_acts: Set[Activation]
+
+    # Property access permissions per state, which are used to construct
+    #  context wrappers. The whole dictionary is replaced when a property is
+    #  added or removed, such that concurrently computed tables are discarded.
+    _access_table_per_state: Dict[State, PropertyAccessTable]
+
+    # States which consume a property or signal, by (is property, id), see consumers().
+    #  The whole dictionary is replaced when a state or property is added or removed.
+    _consumers: Dict[Tuple[bool, str], Set[State]]
+
+    # Virtual time in seconds, which is advanced by run_once().
+    #  Used to measure state cooldowns.
+    _clock: float
+
+    # Clock time at which the last activation of each state finished, and a semaphore
+    #  per state which counts finished activations. They are kept by the context
+    #  instead of the states, since contexts which share a template share their states.
+    _last_activation_time_per_state: Dict[State, float]
+    _activated_per_state: Dict[State, Semaphore]
+
     _config: Configuration
     _core_config: Dict[str, Any]
     _run_task: Optional[Thread]
     _shutdown_flag: Event
 
-    def __init__(self, *arguments, runtime_overrides: List[Tuple[str, str, Any]] = None):
+    def __init__(self, *arguments, runtime_overrides: List[Tuple[str, str, Any]] = None,
+                 template: Optional['Context'] = None):
         """
         Construct a context from command line arguments.
 
@@ -144,9 +180,17 @@ class Context(IContext):
          Can be used to set config entries to values other than strings or lists like in command line arguments.
          An example use-case is a module that starts a new context (in separate process) and can set
          config entries to Connection Objects to enable communication between old and new context.
+        * `template`: Another context, whose modules, states and completed constraints should be
+         adopted instead of loading modules from `arguments`. The new context obtains clones of the
+         template's properties and a copy of it's configuration, such that it is isolated from
+         the template and from other contexts created from the same template. See `ContextHost`.
         """
-        modules, overrides, config_files = argparser.handle_args(*arguments)
-        self._config = Configuration(config_files)
+        if template:
+            modules, overrides = [], []
+            self._config = template._config.clone()
+        else:
+            modules, overrides, config_files = argparser.handle_args(*arguments)
+            self._config = Configuration(config_files)
         self._lock = RLock()
         self._shutdown_flag = Event()
         self._properties = dict()
@@ -154,12 +198,25 @@ class Context(IContext):
         self._needy_acts_per_state_per_signal = dict()
         self._signal_causes = dict()
         self._activations_per_state = dict()
+        self._num_pressured_acts = 0
+        self._num_active_acts = 0
+        self._act_status_lock = Lock()
+        self._catch_all_act_per_state = dict()
+        self._unspiky_acts = set()
+        self._access_table_per_state = dict()
+        self._consumers = dict()
+        self._clock = .0
+        self._last_activation_time_per_state = dict()
+        self._activated_per_state = dict()
         self._run_task = None
         self._modules = set()
 
-        # Load required modules
-        self.add_module(CORE_MODULE_NAME)
-        self._load_modules(self.conf(mod=CORE_MODULE_NAME, key=IMPORT_MODULES_CONFIG_KEY) + modules)
+        if template:
+            self._adopt_template(template)
+        else:
+            # Load required modules
+            self.add_module(CORE_MODULE_NAME)
+            self._load_modules(self.conf(mod=CORE_MODULE_NAME, key=IMPORT_MODULES_CONFIG_KEY) + modules)
 
         # Set required config overrides
         for module_name, key, value in overrides:
@@ -272,6 +329,16 @@ class Context(IContext):
         for mod in modules_under_name:
             self._add_ravestate_module(mod)
 
+    def preload_modules(self) -> None:
+        """
+        Load the resources of all modules of this context, which are otherwise
+         loaded on first use, see the `preload` argument of `Module`.
+        """
+        for mod in self._modules:
+            if mod.preload:
+                logger.info(f"Preloading module {mod.name}...")
+                mod.preload()
+
     def add_state(self, *, st: State) -> None:
         """
         Add a state to this context. It will be indexed wrt/ the properties/signals
@@ -324,12 +391,17 @@ class Context(IContext):
 
             # add state to state activation map
             self._activations_per_state[st] = set()
+            self._consumers = dict()
 
             # complete constraint, create a new default state activation for every affected state.
             for state in states_to_recomplete:
                 self._complete_constraint(state)
                 # remove (filter out) the current default (catch-all) activation
-                self._activations_per_state[state] = {act for act in self._activations_per_state[state] if act.spiky()}
+                for act in self._activations_per_state[state].copy():
+                    if not act.spiky():
+                        self._activations_per_state[state].remove(act)
+                        self._untrack_activation(act)
+                self._catch_all_act_per_state.pop(state, None)
                 # create a new default (catch-all) activation
                 self._new_state_activation(state)
 
@@ -357,6 +429,7 @@ class Context(IContext):
             self._del_state_activations(st)
             # Actually forget about the state
             del self._activations_per_state[st]
+            self._consumers = dict()
         # unregister the state's consumable dummy
         self.rm_prop(prop=st.consumable)
 
@@ -376,6 +449,8 @@ class Context(IContext):
         with self._lock:
             # register property
             self._properties[prop.id()] = prop
+            self._access_table_per_state = dict()
+            self._consumers = dict()
             # register all of the property's signals
             for signal in prop.signals():
                 self._add_sig(signal)
@@ -392,6 +467,8 @@ class Context(IContext):
             return
         # remove property from context
         self._properties.pop(prop.id())
+        self._access_table_per_state = dict()
+        self._consumers = dict()
         states_to_remove: Set[State] = set()
         with self._lock:
             # remove all of the property's signals
@@ -424,6 +501,83 @@ class Context(IContext):
             return None
         return self._properties[key]
 
+    def property_access_table(self, state: State) -> PropertyAccessTable:
+        """
+        Obtain the (cached) property access permissions of a state,
+         which are needed to construct a context wrapper for it.
+
+        * `state`: The state whose access table should be returned.
+
+        **Returns:** An access table, which must not be modified.
+        """
+        tables = self._access_table_per_state
+        table = tables.get(state)
+        if table is None:
+            table = PropertyAccessTable(ctx=self, state=state)
+            tables[state] = table
+        return table
+
+    def consumers(self, item: Union[Property, Signal]) -> Set[State]:
+        """
+        Obtain the (cached) states which consume a property or signal: For a property,
+         these are the states which read it or are constrained on one of it's signals.
+         For a signal, these are the states which are constrained on it.
+
+        * `item`: The property or signal whose consumers should be returned.
+
+        **Returns:** A set of states, which must not be modified.
+        """
+        is_prop = isinstance(item, Property)
+        key = (is_prop, item.id())
+        consumers = self._consumers
+        result = consumers.get(key)
+        if result is None:
+            signals = set(item.signals()) if is_prop else {item}
+            with self._lock:
+                result = {
+                    st for st in self._activations_per_state
+                    if (is_prop and item.id() in st.read_props) or
+                    (st.constraint and any(sig in signals for sig in st.constraint.signals()))}
+            consumers[key] = result
+        return result
+
+    def last_activation_time(self, st: State) -> Optional[float]:
+        """
+        Called by activation to obtain the time of this context's clock
+         at which the last activation of a state in this context finished.
+
+        * `st`: The state whose last activation time should be returned.
+
+        **Returns:** The clock time, or None if the state was not activated yet.
+        """
+        return self._last_activation_time_per_state.get(st)
+
+    def state_activation_finished(self, st: State):
+        """
+        Called by a running activation, once it is about to exit it's dedicated thread.
+         Starts the state's cooldown in this context.
+
+        * `st`: The state of the activation.
+        """
+        if st.cooldown > .0:
+            self._last_activation_time_per_state[st] = self._clock
+        self._activated_per_state.setdefault(st, Semaphore(0)).release()
+        st.activation_finished()
+
+    def wait_for_state(self, st: State, timeout: float = 5.) -> bool:
+        """
+        Wait for an activation of a state in this context to finish.
+
+        * `st`: The state to wait for.
+
+        * `timeout`: Seconds after which this function should return False,
+         if no activation finishes.
+
+        **Returns:** True if an activation of the state in this context finished
+         since the last call to this function, False otherwise.
+        """
+        return self._activated_per_state.setdefault(st, Semaphore(0)).acquire(timeout=timeout)
+
     def conf(self, *, mod: str, key: Optional[str]=None) -> Any:
         """
         Get a single config value, or all config values for a particular module.
@@ -496,6 +650,40 @@ class Context(IContext):
         interested_acts = self._needy_acts_per_state_per_signal[sig][act.state_to_activate]
         interested_acts.discard(act)
 
+    def activation_changed(self, act: IActivation):
+        """
+        Called by activation, whenever it's set of referenced spikes or
+         pressuring causal groups changed. The context will update it's
+         counts of pressured/partially fulfilled activations, which
+         determine the values of `core:pressure` and `core:activity`.
+         Activations which lost all of their spikes are remembered,
+         such that they may be compacted in the next update.
+
+        * `act`: The activation whose status might have changed.
+        """
+        assert isinstance(act, Activation)  # No way around it to avoid import loop
+        with self._act_status_lock:
+            pressured = act.counts_for_core_properties and act.is_pressured()
+            active = act.counts_for_core_properties and act.spiky(filter_boring=True)
+            self._num_pressured_acts += int(pressured) - int(act.counted_as_pressured)
+            self._num_active_acts += int(active) - int(act.counted_as_active)
+            act.counted_as_pressured = pressured
+            act.counted_as_active = active
+            spiky = act.spiky()
+            if act.counted_as_spiky and not spiky:
+                self._unspiky_acts.add(act)
+            act.counted_as_spiky = spiky
+
+    def clock(self) -> float:
+        """
+        Obtain the context's current virtual time in seconds. The clock
+         starts at zero, and is advanced by `seconds_passed` with every
+         call to run_once().
+
+        **Returns:** Seconds which have passed on this context's clock.
+        """
+        return self._clock
+
     def secs_to_ticks(self, seconds: float) -> int:
         """
         Convert seconds to an equivalent integer number of ticks,
@@ -507,6 +695,21 @@ class Context(IContext):
         """
         return ceil(seconds * float(self.tick_rate))
 
+    def lock_wait_metrics(self) -> Dict[str, Dict[str, float]]:
+        """
+        Collect the lock wait time metrics of all properties in this context.
+
+        **Returns:** A dictionary, which maps every property name to a dictionary
+         with the number of lock acquisitions (`count`), as well as the total (`total`)
+         and maximum (`max`) time in seconds spent waiting for the property's lock.
+        """
+        return {
+            prop_id: {
+                "count": prop.lock_wait_count,
+                "total": prop.lock_wait_total,
+                "max": prop.lock_wait_max}
+            for prop_id, prop in self._properties.items()}
+
     def possible_signals(self, state: State) -> Generator[Signal, None, None]:
         """
         Yields all signals, for which spikes may be created if
@@ -529,45 +732,32 @@ class Context(IContext):
     def run_once(self, seconds_passed=1., debug=False) -> None:
         """
         Run a single update for this context, which will ...<br>
-        (0) progress cooled down state weights.<br>
-        (1) reduce redundant candidate activations.<br>
+        (0) advance the context clock, which determines cooled down state weights.<br>
+        (1) remove candidate activations which became redundant since the last update.<br>
         (2) associate new spikes with state activations.<br>
         (3) update state activations.<br>
         (4) forget spikes which have no suitors in their causal groups.<br>
         (5) age spikes.<br>
         (6) invoke garbage collection.<br>
-        (7) update the `core:activity` and `core:pressure` variables.
+        (7) update the `core:activity` and `core:pressure` variables, if their
+         pressured/partially fulfilled activation counts crossed zero.
 
         * `seconds_passed`: Seconds, as floatiing point, since the last update. Will be used
          to determine the number of ticks to add/subtract to/from spike/activation age/cooldown/deathclock.
         """
         with self._lock:
 
-            # ---------- Update weights wrt/ cooldown for all states -----------
-
-            for state in self._activations_per_state:
-                state.update_weight(seconds_passed)
-
-            # ----------- For every state, compress it's activations -----------
-
-            for st, acts in self._activations_per_state.items():
-                assert len(acts) > 0
-                if len(acts) > 1:
-                    # We could do some fancy merge of partially fulfilled activations,
-                    #  but for now let's just remove all completely unfulfilled
-                    #  ones apart from one.
-                    allowed_unfulfilled: Optional[Activation] = None
-                    for act in acts.copy():
-                        if not act.spiky():
-                            if allowed_unfulfilled:
-                                for signal in act.constraint.signals():
-                                    if signal in self._needy_acts_per_state_per_signal and \
-                                            act in self._needy_acts_per_state_per_signal[signal][act.state_to_activate]:
-                                        self._needy_acts_per_state_per_signal[
-                                            signal][act.state_to_activate].remove(act)
-                                acts.remove(act)
-                            else:
-                                allowed_unfulfilled = act
+            # ------ Advance clock, which implicitly cools down state weights ------
+
+            self._clock += seconds_passed
+
+            # ------- Compress activations which lost all of their spikes -------
+
+            with self._act_status_lock:
+                unspiky_acts = self._unspiky_acts
+                self._unspiky_acts = set()
+            for act in unspiky_acts:
+                self._compress_activation(act)
 
             # --------- Acquire new state activations for every spike ----------
 
@@ -622,8 +812,30 @@ class Context(IContext):
         for module_name in modules:
             self.add_module(module_name)
 
+    def _adopt_template(self, template: 'Context'):
+        with template._lock:
+            self._modules = set(template._modules)
+            # Clone properties, such that their values are not shared
+            for prop in template._properties.values():
+                self.add_prop(prop=prop.clone())
+            # Property.clone() does not copy children, so link the cloned children to their cloned parents
+            for prop_id, prop in template._properties.items():
+                for child_name, child in prop.children.items():
+                    if child.id() in self._properties:
+                        self._properties[prop_id].children[child_name] = self._properties[child.id()]
+            # The states' completed constraints were already computed by the template,
+            #  so only the signal index and the initial activations need to be created.
+            with self._lock:
+                for sig, causes in template._signal_causes.items():
+                    self._add_sig(sig)
+                    self._signal_causes[sig] = list(causes)
+                for st in template._activations_per_state:
+                    self._activations_per_state[st] = set()
+                    self._new_state_activation(st)
+
     def _state_activated(self, act: Activation):
         self._activations_per_state[act.state_to_activate].discard(act)
+        self._untrack_activation(act)
 
     def _spike_discarded(self, spike: Spike):
         pass
@@ -665,7 +877,17 @@ class Context(IContext):
 
     def _new_state_activation(self, st: State):
         activation = Activation(st, self)
+        # Activations which wait for `core:activity` to change must not
+        #  keep the activity flag up themselves.
+        activation.counts_for_core_properties = prop_activity.changed() not in st.completed_constraint.signals()
         self._activations_per_state[st].add(activation)
+        # A new activation is only created if the previous catch-all activation
+        #  acquired a spike, but make sure that the invariant holds nevertheless.
+        previous_catch_all = self._catch_all_act_per_state.get(st)
+        if previous_catch_all is not None:
+            with self._act_status_lock:
+                self._unspiky_acts.add(previous_catch_all)
+        self._catch_all_act_per_state[st] = activation
         for signal in st.completed_constraint.signals():
             if signal in self._needy_acts_per_state_per_signal:
                 self._needy_acts_per_state_per_signal[signal][st].add(activation)
@@ -680,6 +902,34 @@ class Context(IContext):
         for act in self._activations_per_state[st].copy():
             act.dereference(spike=None, reacquire=False, reject=True)
             self._activations_per_state[st].remove(act)
+            self._untrack_activation(act)
+        self._catch_all_act_per_state.pop(st, None)
+
+    def _compress_activation(self, act: Activation) -> None:
+        # Keep exactly one catch-all (spike-less) activation per state:
+        #  Either the given activation becomes the new catch-all, or
+        #  it is redundant and removed.
+        st = act.state_to_activate
+        acts = self._activations_per_state.get(st)
+        if not acts or act not in acts or act.spiky():
+            return
+        catch_all = self._catch_all_act_per_state.get(st)
+        if catch_all is act:
+            return
+        if catch_all is None or catch_all not in acts or catch_all.spiky():
+            self._catch_all_act_per_state[st] = act
+            return
+        for signal in act.constraint.signals():
+            if signal in self._needy_acts_per_state_per_signal:
+                self._needy_acts_per_state_per_signal[signal][st].discard(act)
+        acts.remove(act)
+        self._untrack_activation(act)
+
+    def _untrack_activation(self, act: Activation) -> None:
+        # The activation is no longer in _activations_per_state:
+        #  Remove it from the core property counters.
+        act.counts_for_core_properties = False
+        self.activation_changed(act)
 
     def _state_activations(self, *, st: Optional[State]=None) -> Set[Activation]:
         if st:
@@ -751,28 +1001,29 @@ class Context(IContext):
         return result if len(result) else None
 
     def _update_core_properties(self, debug=False):
-        with self._lock:
-            pressured_acts = []
-            partially_fulfilled_acts = []
-            for act in self._state_activations():
-                if prop_activity.changed() not in set(act.constraint.signals()):
-                    if act.is_pressured():
-                        pressured_acts.append(act.id)
-                    if act.spiky(filter_boring=True):
-                        partially_fulfilled_acts.append(act)
-        PropertyWrapper(
-            prop=prop_pressure,
-            ctx=self,
-            allow_write=True,
-            allow_read=True
-        ).set(len(pressured_acts) > 0)
-        PropertyWrapper(
-            prop=prop_activity,
-            ctx=self,
-            allow_write=True,
-            allow_read=True
-        ).set(len(partially_fulfilled_acts) > 0)
+        with self._act_status_lock:
+            pressured = self._num_pressured_acts > 0
+            active = self._num_active_acts > 0
+        # Only create wrappers (which lock the properties) on an actual transition
+        pressure = self._properties[prop_pressure.id()]
+        activity = self._properties[prop_activity.id()]
+        if pressured != pressure.read():
+            with PropertyWrapper(
+                    prop=pressure,
+                    ctx=self,
+                    allow_write=True,
+                    allow_read=True) as pressure_wrapper:
+                pressure_wrapper.set(pressured)
+        if active != activity.read():
+            with PropertyWrapper(
+                    prop=activity,
+                    ctx=self,
+                    allow_write=True,
+                    allow_read=True) as activity_wrapper:
+                activity_wrapper.set(active)
         if debug:
+            with self._lock:
+                partially_fulfilled_acts = [act for act in self._state_activations() if act.counted_as_active]
             partially_fulfilled_info = "; ".join(
                 f"{act} -> {', '.join(repr(spike) for spike in act.spikes())}"
                 for act in partially_fulfilled_acts)
@@ -799,4 +1050,14 @@ class Context(IContext):
                             checked_causal_groups.add(cg)
                             if not cg.check_reference_sanity():
                                 result = False
+            # Check the incrementally maintained core property counters
+            acts = [act for act in self._state_activations() if act.counts_for_core_properties]
+            num_pressured = sum(1 for act in acts if act.is_pressured())
+            num_active = sum(1 for act in acts if act.spiky(filter_boring=True))
+            with self._act_status_lock:
+                if (num_pressured, num_active) != (self._num_pressured_acts, self._num_active_acts):
+                    logger.error(
+                        f"Core counter mismatch: pressured {self._num_pressured_acts} (should be {num_pressured}), "
+                        f"active {self._num_active_acts} (should be {num_active})")
+                    result = False
         return result
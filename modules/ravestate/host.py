@@ -0,0 +1,148 @@
+# Ravestate class which hosts many isolated sessions in a single process
+from threading import Thread, RLock, Event
+from typing import Optional, Any, Tuple, Dict, List, Hashable
+
+from ravestate.context import Context, sig_startup
+
+from reggol import get_logger
+logger = get_logger(__name__)
+
+
+class ContextHost:
+    """
+    Hosts many isolated conversation sessions in a single process.
+    The modules are loaded, and the state constraints are completed only
+    once for a template context, which is never run itself. Every session
+    is a context which is created from this template: It shares the
+    template's states and module-level resources (e.g. NLP models),
+    but has it's own properties, spikes, causal groups and configuration.
+    All sessions are updated by a single signal processing loop.
+
+    _Example:_
+    ```python
+    host = ContextHost("ravestate_conio", "ravestate_hibye")
+    host.run()
+    session = host.add_session("chat-42")
+    ```
+    """
+
+    _template: Context
+    _sessions: Dict[Hashable, Context]
+    _lock: RLock
+    _run_task: Optional[Thread]
+    _shutdown_flag: Event
+
+    def __init__(self, *arguments, runtime_overrides: List[Tuple[str, str, Any]] = None,
+                 template: Optional[Context] = None):
+        """
+        Construct a host and it's template context from command line arguments.
+
+        * `arguments`: A series of command line arguments which can be parsed
+         by the ravestate command line parser (see argparser.py).
+
+        * `runtime_overrides`: A list of config overrides in the form of (modulename, key, value),
+         which will be applied to all sessions.
+
+        * `template`: An existing template context, which is used instead of creating
+         one from `arguments`. It must never be run. See `ContextSpawner`.
+        """
+        self._template = template or Context(*arguments, runtime_overrides=runtime_overrides)
+        self._sessions = dict()
+        self._lock = RLock()
+        self._run_task = None
+        self._shutdown_flag = Event()
+        self.tick_rate = self._template.tick_rate
+
+    def add_session(self, session_id: Hashable, runtime_overrides: List[Tuple[str, str, Any]] = None) -> Optional[Context]:
+        """
+        Create a new session, and emit it's core:startup signal. The session
+         will be updated by the host's signal processing loop.
+
+        * `session_id`: Unique key for the new session, e.g. a chat id.
+
+        * `runtime_overrides`: Config overrides in the form of (modulename, key, value),
+         which only apply to the new session.
+
+        **Returns:** The new session context, or None if a session with the given id already exists.
+        """
+        with self._lock:
+            if session_id in self._sessions:
+                logger.error(f"Attempt to add session {session_id} twice!")
+                return None
+            session = Context(runtime_overrides=runtime_overrides, template=self._template)
+            self._sessions[session_id] = session
+        session.emit(sig_startup)
+        return session
+
+    def remove_session(self, session_id: Hashable) -> None:
+        """
+        Shut down a session, and remove it from the host. The core:shutdown
+         signal will be processed by one final update of the session.
+
+        * `session_id`: Key of the session which should be removed.
+        """
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+        if not session:
+            logger.error(f"Attempt to remove unknown session {session_id}!")
+            return
+        session.shutdown()
+        session.run_once(1. / self.tick_rate)
+
+    def session(self, session_id: Hashable) -> Optional[Context]:
+        """
+        Retrieve a session by it's key.
+
+        **Returns:** The session context, or None, if no session with the given key exists.
+        """
+        with self._lock:
+            return self._sessions.get(session_id)
+
+    def session_ids(self) -> List[Hashable]:
+        """
+        Retrieve the keys of all sessions which are currently hosted.
+        """
+        with self._lock:
+            return list(self._sessions.keys())
+
+    def run(self) -> None:
+        """
+        Creates the signal processing thread for all sessions and starts it.
+        """
+        if self._run_task:
+            logger.error("Attempt to start context host twice!")
+            return
+        self._run_task = Thread(target=self._run_loop)
+        self._run_task.start()
+
+    def run_once(self, seconds_passed=1.) -> None:
+        """
+        Run a single update for every hosted session (see `Context.run_once()`).
+
+        * `seconds_passed`: Seconds, as floating point, since the last update.
+        """
+        with self._lock:
+            sessions = list(self._sessions.values())
+        for session in sessions:
+            session.run_once(seconds_passed)
+
+    def shutting_down(self) -> bool:
+        """
+        Retrieve the shutdown flag value, which indicates whether shutdown() has been called.
+        """
+        return self._shutdown_flag.is_set()
+
+    def shutdown(self) -> None:
+        """
+        Removes all sessions, and waits for the signal processing thread to join.
+        """
+        self._shutdown_flag.set()
+        if self._run_task:
+            self._run_task.join()
+        for session_id in self.session_ids():
+            self.remove_session(session_id)
+
+    def _run_loop(self):
+        tick_interval = 1. / self.tick_rate
+        while not self._shutdown_flag.wait(tick_interval):
+            self.run_once(tick_interval)
@@ -4,7 +4,7 @@
 
 from ravestate import property
 from ravestate import state
-from typing import Set, Any, Generator
+from typing import Set, Any, Generator, Optional
 from ravestate.constraint import Signal
 from ravestate.spike import Spike
 from ravestate.iactivation import IActivation
@@ -111,6 +111,48 @@ class IContext:
         """
         pass
 
+    def property_access_table(self, state: 'State') -> 'PropertyAccessTable':
+        """
+        Obtain the (cached) property access permissions of a state,
+         which are needed to construct a context wrapper for it.
+
+        * `state`: The state whose access table should be returned.
+
+        **Returns:** An access table, which must not be modified.
+        """
+        pass
+
+    def last_activation_time(self, st: 'State') -> Optional[float]:
+        """
+        Called by activation to obtain the time of the context's clock
+         at which the last activation of a state in this context finished.
+
+        * `st`: The state whose last activation time should be returned.
+
+        **Returns:** The clock time, or None if the state was not activated yet.
+        """
+        pass
+
+    def state_activation_finished(self, st: 'State'):
+        """
+        Called by a running activation, once it is about to exit it's dedicated thread.
+
+        * `st`: The state of the activation.
+        """
+        pass
+
+    def consumers(self, item) -> Set['State']:
+        """
+        Obtain the states which consume a property or signal: For a property,
+         these are the states which read it or are constrained on one of it's signals.
+         For a signal, these are the states which are constrained on it.
+
+        * `item`: The property or signal whose consumers should be returned.
+
+        **Returns:** A set of states, which must not be modified.
+        """
+        pass
+
     def conf(self, *, mod, key=None):
         """
         Get a single config value, or all config values for a particular module.
@@ -162,6 +204,16 @@ class IContext:
         """
         pass
 
+    def clock(self) -> float:
+        """
+        Obtain the context's current virtual time in seconds. The clock
+         starts at zero, and is advanced by `seconds_passed` with every
+         call to run_once().
+
+        **Returns:** Seconds which have passed on this context's clock.
+        """
+        pass
+
     def secs_to_ticks(self, seconds: float) -> int:
         """
         Convert seconds to an equivalent integer number of ticks,
@@ -182,3 +234,16 @@ class IContext:
          possibly generated signals (declared signal + property-changed signals).
         """
         pass
+
+    def activation_changed(self, act: IActivation):
+        """
+        Called by activation, whenever it's set of referenced spikes or
+         pressuring causal groups changed. The context will update it's
+         counts of pressured/partially fulfilled activations, which
+         determine the values of `core:pressure` and `core:activity`.
+         Activations which lost all of their spikes are remembered,
+         such that they may be compacted in the next update.
+
+        * `act`: The activation whose status might have changed.
+        """
+        pass
@@ -1,6 +1,6 @@
 # Ravestate module class
 
-from typing import Dict, Any, Union, Iterable, Set
+from typing import Dict, Any, Union, Iterable, Set, Callable, Optional
 import inspect
 from collections import defaultdict
 
@@ -29,7 +29,8 @@ class Module:
     modules_per_python_module: Dict[str, Set['Module']] = defaultdict(set)
     registered_modules: Dict[str, 'Module'] = dict()
 
-    def __init__(self, *, name: str, config: Dict[str, Any]=None, depends: Iterable['Module']=None):
+    def __init__(self, *, name: str, config: Dict[str, Any]=None, depends: Iterable['Module']=None,
+                 preload: Optional[Callable[[], Any]]=None):
         """
         Create a new module with a name and certain config entries.
 
@@ -43,6 +44,10 @@ class Module:
         * `depends`: Collection of modules which must also be added to a context which
          includes this module. __Note:__ A core module dependency (referring to core module objects
         such as `sig_startup`, `prop_intent` etc.) may safely be omitted.
+
+        * `preload`: Function which loads resources of the module (e.g. a model), which
+         are otherwise loaded on first use. It is called by `Context.preload_modules()`,
+         e.g. in the template of a ContextSpawner, such that all sessions share the resources.
         """
         if not config:
             config = {}
@@ -54,6 +59,7 @@ class Module:
         self.name = name
         self.conf = config
         self.depends = depends
+        self.preload = preload
         if name in self.registered_modules:
             logger.warn(f"Redefinition of module `{name}`!")
         module = inspect.getmodule(inspect.stack()[1].frame)
@@ -1,7 +1,8 @@
 # Ravestate property classes
 
 from threading import Lock
-from typing import Dict, List, Generator
+from time import perf_counter
+from typing import Dict, List, Generator, Tuple, Any
 from ravestate.constraint import Signal
 from ravestate.threadlocal import ravestate_thread_local
 
@@ -14,6 +15,12 @@ class Property:
     Base class for context properties. Controls read/write/push/pop/delete permissions,
     property name basic impls. for the property value, parent/child mechanism.
 
+    The value is versioned: Every write publishes a new (version, value) pair
+    with a single atomic assignment. Readers may therefore take a consistent
+    snapshot without acquiring the property's lock, which is only needed
+    to serialize writers. Old versions are freed as soon as no snapshot
+    references them anymore.
+
     _Example (Creating a module containing a property named my_property):_
     ```python
     with Module(name="my_module"):
@@ -39,9 +46,13 @@ class Property:
         self.allow_write = allow_write
         self.allow_push = allow_push
         self.allow_pop = allow_pop
-        self.value = default_value
+        self._versioned_value: Tuple[int, Any] = (0, default_value)
         self.children: Dict[str, Property] = dict()
         self._lock = Lock()
+        # Metrics about the time spent waiting in lock()
+        self.lock_wait_count = 0
+        self.lock_wait_total = .0
+        self.lock_wait_max = .0
         self.parent_path: str = ""
         self.always_signal_changed = always_signal_changed
         self.is_flag_property = is_flag_property
@@ -61,6 +72,29 @@ class Property:
     def id(self):
         return f'{self.parent_path}:{self.name}'
 
+    @property
+    def value(self) -> Any:
+        return self._versioned_value[1]
+
+    @value.setter
+    def value(self, new_value: Any):
+        # Publish a new version with a single (atomic) reference assignment
+        self._versioned_value = (self._versioned_value[0] + 1, new_value)
+
+    def version(self) -> int:
+        """
+        Get the number of the property's current value version,
+         which is incremented with every write.
+        """
+        return self._versioned_value[0]
+
+    def snapshot(self) -> Tuple[int, Any]:
+        """
+        Obtain the current (version, value) pair of this property without locking.
+         The snapshot stays valid, even if writers publish newer versions.
+        """
+        return self._versioned_value
+
     def clone(self):
         result = Property(
             name=self.name,
@@ -71,7 +105,8 @@ class Property:
             default_value=self.value,
             always_signal_changed=self.always_signal_changed,
             is_flag_property=self.is_flag_property,
-            wipe_on_changed=self.wipe_on_changed)
+            wipe_on_changed=self.wipe_on_changed,
+            boring=self.boring)
         result.set_parent_path(self.parent_path)
         return result
 
@@ -107,7 +142,16 @@ class Property:
         return result
 
     def lock(self):
+        """
+        Acquire this property's lock. The time spent waiting for the lock
+         is added to `lock_wait_count`, `lock_wait_total` and `lock_wait_max`.
+        """
+        wait_start = perf_counter()
         self._lock.acquire()
+        wait_time = perf_counter() - wait_start
+        self.lock_wait_count += 1
+        self.lock_wait_total += wait_time
+        self.lock_wait_max = max(self.lock_wait_max, wait_time)
 
     def unlock(self):
         self._lock.release()
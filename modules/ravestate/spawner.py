@@ -0,0 +1,172 @@
+# Ravestate class which forks pre-warmed contexts from a template process
+import os
+import signal
+import multiprocessing as mp
+from multiprocessing.connection import Connection
+from threading import Lock
+from typing import Optional, Any, Tuple, List, Callable
+
+from ravestate.context import Context
+
+from reggol import get_logger
+logger = get_logger(__name__)
+
+
+def create_context(arguments: Tuple[str, ...], runtime_overrides: List[Tuple[str, str, Any]],
+                   template: Optional[Context]) -> Context:
+    """
+    Default context factory for `ContextSpawner`: Creates the template context from
+     the command line arguments, and adopts the template for every session context.
+    """
+    return Context(*arguments, runtime_overrides=runtime_overrides, template=template)
+
+
+class ContextSpawner:
+    """
+    Starts sessions (each a context in it's own process) by forking them from
+     a template process. The template process imports all modules, loads their
+     resources (e.g. NLP models) and creates a template context only once.
+     A new session therefore only needs to create and run it's context, and shares
+     the memory pages of the template's resources until it writes to them.
+
+    The template process is started with the `spawn` method, such that it is
+     single-threaded when it forks, even if the process which owns the spawner
+     is already running a context. Forking requires `os.fork()`.
+
+    _Example:_
+    ```python
+    spawner = ContextSpawner("ravestate_hibye", "ravestate_conio")
+    pid = spawner.spawn()
+    ```
+    """
+
+    _conn: Connection
+    _process: mp.Process
+    _lock: Lock
+    _template_pid: Optional[int]
+
+    def __init__(self, *arguments, runtime_overrides: List[Tuple[str, str, Any]] = None,
+                 context_factory: Callable[[Tuple[str, ...], List[Tuple[str, str, Any]], Optional[Context]], Context] = create_context,
+                 executable: Optional[str] = None):
+        """
+        Start the template process, which creates the template context.
+
+        * `arguments`: A series of command line arguments which can be parsed
+         by the ravestate command line parser (see argparser.py).
+
+        * `runtime_overrides`: A list of config overrides in the form of (modulename, key, value),
+         which will be applied to the template and to all sessions. Must be picklable.
+
+        * `context_factory`: Module-level function `(arguments, runtime_overrides, template)`,
+         which is called with `template=None` to create the template context, and with the
+         template to create each session context. Override to use a `Context` subclass,
+         or to host many sessions in each forked process with a `ContextHost`.
+
+        * `executable`: Path of the python interpreter for the template process. Must be set
+         if `sys.executable` is not a python interpreter, e.g. when running under uwsgi.
+        """
+        self._lock = Lock()
+        self._template_pid = None
+        self._conn, template_conn = mp.Pipe()
+        mp_context = mp.get_context('spawn')
+        if executable:
+            mp_context.set_executable(executable)
+        self._process = mp_context.Process(
+            target=_serve_template,
+            args=(template_conn, arguments, runtime_overrides or [], context_factory),
+            daemon=True)
+        self._process.start()
+        template_conn.close()
+
+    def ready(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for the template context to be created.
+
+        * `timeout`: Seconds to wait at most, or None to wait until the template is ready.
+
+        **Returns:** True if the template process is ready to spawn sessions, false otherwise.
+        """
+        with self._lock:
+            if self._template_pid is None:
+                try:
+                    if not self._conn.poll(timeout):
+                        return False
+                    self._template_pid = self._conn.recv()
+                except (EOFError, OSError):
+                    return False
+            return True
+
+    def spawn(self, runtime_overrides: List[Tuple[str, str, Any]] = None) -> Optional[int]:
+        """
+        Fork a new session from the template process, and run it's context.
+         Blocks until the template context is created.
+
+        * `runtime_overrides`: Config overrides in the form of (modulename, key, value),
+         which only apply to the new session. Values may be `Connection` objects,
+         e.g. to communicate with the session.
+
+        **Returns:** The process id of the new session, or None if the template process is gone.
+        """
+        if not self.ready():
+            logger.error("Attempt to spawn a session, but the template process is gone!")
+            return None
+        with self._lock:
+            try:
+                self._conn.send(runtime_overrides or [])
+                return self._conn.recv()
+            except (EOFError, OSError):
+                logger.error("Attempt to spawn a session, but the template process is gone!")
+                return None
+
+    def shutdown(self) -> None:
+        """
+        Stop the template process. Sessions which were already spawned keep running.
+        """
+        with self._lock:
+            try:
+                self._conn.send(None)
+            except OSError:
+                pass
+            self._conn.close()
+        self._process.join()
+
+
+def _serve_template(conn: Connection, arguments, runtime_overrides, context_factory):
+    # Sessions are not waited for by the template process
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+    template = context_factory(arguments, runtime_overrides, None)
+    # Resources which modules load on first use are shared by all sessions
+    template.preload_modules()
+    conn.send(os.getpid())
+
+    while True:
+        try:
+            session_overrides = conn.recv()
+        except EOFError:
+            break
+        if session_overrides is None:
+            break
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+            conn.close()
+            _run_session(arguments, runtime_overrides + session_overrides, template, context_factory)
+        # The session owns the forked copies of passed connections,
+        #  such that they are closed when the session terminates.
+        for _, _, value in session_overrides:
+            if isinstance(value, Connection):
+                value.close()
+        conn.send(pid)
+
+
+def _run_session(arguments, runtime_overrides, template, context_factory):
+    exit_code = 0
+    try:
+        ctx = context_factory(arguments, runtime_overrides, template)
+        ctx.run()
+        ctx._run_task.join()
+    except Exception as e:
+        logger.error(f"Session {os.getpid()} failed: {e}")
+        exit_code = 1
+    finally:
+        os._exit(exit_code)
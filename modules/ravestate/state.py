@@ -1,7 +1,7 @@
 # Ravestate State-related definitions
 
 from typing import Optional, Tuple, Union, Set
-from threading import Semaphore, Lock
+from threading import Semaphore
 
 from ravestate.property import Property
 from ravestate.threadlocal import ravestate_thread_local
@@ -86,9 +86,7 @@ class State:
 
     module_name: str                  # The module which this state belongs to
     completed_constraint: Constraint  # Updated by context, to add constraint causes to constraint
-    activated: Semaphore              # Semaphore which counts finished activations
-    lock: Lock                        # Mutex to lock access to the current weight/cooldown state
-    current_weight: float             # Current weight, as affected by cooldown
+    activated: Semaphore              # Semaphore which counts finished activations in all contexts
 
     # Dummy resource which allows CausalGroups to track spike acquisitions
     #  for states that don't have any write-props.
@@ -148,10 +146,9 @@ class State:
         self.module_name = ""
         self.emit_detached = emit_detached
         self.activated = Semaphore(0)
-        self.weight = self.current_weight = weight
+        self.weight = weight
         self.cooldown = cooldown
         self.is_receptor = is_receptor
-        self.lock = Lock()
         self.boring = boring
 
         # add state to module in current `with Module(...)` clause
@@ -172,43 +169,35 @@ class State:
     def get_all_props_ids(self) -> Set[str]:
         return self.read_props | self.write_props
 
-    def update_weight(self, seconds_passed: float):
-        """
-        Called once per tick by context, where #seconds_passed is
-         one over the context's tick rate. The state will use this
-         function, to update it's actual weight, given it's cooldown
-         period and last activation
-        """
-        if self.cooldown <= .0 or self.current_weight >= self.weight:
-            return
-        with self.lock:
-            self.current_weight += seconds_passed/self.cooldown * self.weight
-            if self.current_weight > self.weight:
-                self.current_weight = self.weight
-
-    def get_current_weight(self):
+    def get_current_weight(self, now: float, last_activation_time: Optional[float] = None) -> float:
         """
         Called by activation to obtain the weight factor for this
-         state's constraint's specificity.
+         state's constraint's specificity. The weight is reset to zero
+         when an activation finishes, and then rises linearly back to
+         it's original level over the course of the state's cooldown period.
+
+        * `now`: The current time of the context's clock (see `Context.clock()`).
+
+        * `last_activation_time`: The time of the same clock at which the last activation
+         of this state in the context finished, or None if it was never activated there.
+         Tracked by the context, since contexts which share a template share their states.
         """
-        with self.lock:
-            return self.current_weight
+        if self.cooldown <= .0 or last_activation_time is None:
+            return self.weight
+        return min(self.weight, max(.0, now - last_activation_time) / self.cooldown * self.weight)
 
     def activation_finished(self):
         """
-        Called by a running activation for this state, once it is about to
-         exit it's dedicated thread.
+        Called by the context once an activation for this state, in any context,
+         is about to exit it's dedicated thread.
         """
-        with self.lock:
-            self.activated.release()
-            if self.cooldown > .0:
-                # Reset weight, it will be raised to it's original level
-                # over the course of repeated update_weight() calls.
-                self.current_weight = .0
+        self.activated.release()
 
     def wait(self, timeout=5.):
         """
-        Wait for the state's activation function to be run at least once.
+        Wait for the state's activation function to be run at least once, in any
+         context which contains this state. See `Context.wait_for_state()` to wait
+         for an activation in a particular context.
 
         * `timeout`: Timeout after which this function should return False,
          if the activation is not occurring.
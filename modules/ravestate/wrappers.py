@@ -6,7 +6,7 @@ from ravestate.constraint import Signal
 from ravestate.module import get_module
 from ravestate.icontext import IContext
 from ravestate.spike import Spike
-from typing import Any, Generator, Set, Dict, Union
+from typing import Any, Generator, Set, Dict, Union, Tuple, List, Optional
 
 from reggol import get_logger
 logger = get_logger(__name__)
@@ -16,9 +16,10 @@ class PropertyWrapper:
     """
     Encapsulates a property, and annotates it with additional r/w perms and a context.
     The context is used to trigger the proper :changed, :pushed, :popped, :deleted
-    signals when the property is accessed. The wrapper also takes care of locking the property
-    when it is supposed to be written to, and freezing the property's value if it is supposed to
-    be read from.
+    signals when the property is accessed. The wrapper also takes care of freezing a snapshot
+    of the property's value version if it is supposed to be read from, which does not
+    block on writers. If it is supposed to be written to, the property is locked while
+    the wrapper is used in a `with` block.
     """
     def __init__(self, *,
                  spike_parents: Set[Spike] = None,
@@ -26,23 +27,29 @@ class PropertyWrapper:
                  ctx: IContext,
                  allow_read: bool,
                  allow_write: bool,
-                 boring: bool = False):
+                 boring: bool = False,
+                 snapshot: Optional[Tuple[int, Any]] = None):
 
         self.prop = prop
         self.ctx = ctx
         self.allow_read = allow_read and prop.allow_read
         self.allow_write = allow_write and (prop.allow_write | prop.allow_push | prop.allow_pop)
+        self.frozen_version = None
         self.frozen_value = None
         self.spike_parents = spike_parents
         self.boring = boring or prop.boring
 
-        self.prop.lock()
-        if self.allow_read:
-            self.frozen_value = prop.value
-        if not self.allow_write:
-            self.prop.unlock()
+        if self.allow_read and not self.allow_write:
+            if snapshot is None:
+                snapshot = prop.snapshot()
+            self.frozen_version, self.frozen_value = snapshot
+
+    def __enter__(self) -> 'PropertyWrapper':
+        if self.allow_write:
+            self.prop.lock()
+        return self
 
-    def __del__(self):
+    def __exit__(self, exc_type, exc_value, traceback):
         if self.allow_write:
             self.prop.unlock()
 
@@ -151,10 +158,55 @@ class PropertyWrapper:
         return (child.id() for _, child in self.prop.children.items())
 
 
+class PropertyAccessTable:
+    """
+    Precomputed property access permissions of a single state, which
+    cover the state's read/write properties and all of their children.
+    Access tables are cached per state by context (see `Context.property_access_table()`),
+    invalidated whenever properties are added or removed, and shared by all
+    context wrappers for the state. They must therefore not be modified.
+    """
+
+    # (property, allow_read, allow_write) per full property name
+    permissions: Dict[str, Tuple[Property, bool, bool]]
+
+    # Writable properties, sorted by name to obtain a fixed locking order
+    writable_props: List[Property]
+
+    # (full property name, property) of the properties which may only be read
+    readonly_props: List[Tuple[str, Property]]
+
+    def __init__(self, *, ctx: IContext, state: State):
+        self.permissions = dict()
+        read_props = state.get_read_props_ids()
+        write_props = state.get_write_props_ids()
+
+        # Recursively complete permissions dict with children:
+        for prop_parent_id in state.get_all_props_ids():
+            # May have been covered by a parent before
+            if prop_parent_id not in self.permissions:
+                for prop in ctx[prop_parent_id].gather_children():
+                    # Child may have been covered by a parent before
+                    if prop.id() not in self.permissions:
+                        self.permissions[prop.id()] = (
+                            prop, prop_parent_id in read_props, prop_parent_id in write_props)
+
+        self.writable_props = [
+            prop for _, (prop, _, allow_write) in sorted(self.permissions.items())
+            if allow_write and (prop.allow_write | prop.allow_push | prop.allow_pop)]
+        writable_ids = {prop.id() for prop in self.writable_props}
+        self.readonly_props = [
+            (prop_id, prop) for prop_id, (prop, allow_read, _) in self.permissions.items()
+            if allow_read and prop.allow_read and prop_id not in writable_ids]
+
+
 class ContextWrapper:
     """
     Encapsulates a context towards a state, only offering properties with permissions
-    as declared by the state beforehand.
+    as declared by the state beforehand. The writable properties are locked
+    while the wrapper is used in a `with` block. The values of read-only properties
+    are frozen when the wrapper is constructed, but their property wrappers are
+    only created upon first access.
     """
 
     def __init__(self, *, ctx: IContext, state: State, spike_parents: Set[Spike] = None, spike_payloads: Dict[str, Any] = None):
@@ -163,35 +215,62 @@ class ContextWrapper:
         self.properties = dict()
         self.spike_parents = spike_parents
         self.spike_payloads = spike_payloads
-
-        # Recursively complete properties dict with children:
-        for prop_parent_id in state.get_all_props_ids():
-            # May have been covered by a parent before
-            if prop_parent_id not in self.properties:
-                prop_and_children = ctx[prop_parent_id].gather_children()
-                for prop in prop_and_children:
-                    # Child may have been covered by a parent before
-                    if prop.id() not in self.properties:
-                        self.properties[prop.id()] = PropertyWrapper(
-                            prop=prop, ctx=self.ctx,
-                            spike_parents=self.spike_parents,
-                            allow_read=prop_parent_id in state.get_read_props_ids(),
-                            allow_write=prop_parent_id in state.get_write_props_ids(),
-                            boring=self.state.boring)
+        self._access_table = ctx.property_access_table(state)
+        # Shared with the access table, until push()/pop() require a private copy.
+        self._permissions = self._access_table.permissions
+        self._locked_props = []
+        # Lock-free (version, value) snapshots of the read-only properties
+        self._snapshots = {prop_id: prop.snapshot() for prop_id, prop in self._access_table.readonly_props}
+
+    def _property_wrapper(self, key: str) -> Optional[PropertyWrapper]:
+        wrapper = self.properties.get(key)
+        if wrapper is None and key in self._permissions:
+            prop, allow_read, allow_write = self._permissions[key]
+            wrapper = PropertyWrapper(
+                prop=prop, ctx=self.ctx,
+                spike_parents=self.spike_parents,
+                allow_read=allow_read,
+                allow_write=allow_write,
+                boring=self.state.boring,
+                snapshot=self._snapshots.get(key))
+            self.properties[key] = wrapper
+        return wrapper
+
+    def _own_permissions(self) -> Dict[str, Tuple[Property, bool, bool]]:
+        if self._permissions is self._access_table.permissions:
+            self._permissions = dict(self._permissions)
+        return self._permissions
+
+    def __enter__(self) -> 'ContextWrapper':
+        # Lock all writable properties in a fixed order, to rule out
+        #  deadlocks between states with overlapping write-props.
+        self._locked_props = self._access_table.writable_props
+        for prop in self._locked_props:
+            prop.lock()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # Release the locks which were acquired in __enter__, even if
+        #  some of the properties were popped in the meantime.
+        for prop in reversed(self._locked_props):
+            prop.unlock()
+        self._locked_props = []
 
     def __setitem__(self, key: Union[str, Property], value: Any):
         if isinstance(key, Property):
             key = key.id()
-        if key in self.properties:
-            return self.properties[key].set(value)
+        wrapper = self._property_wrapper(key)
+        if wrapper:
+            return wrapper.set(value)
         else:
             logger.error(f"State {self.state.name} attempted to write property {key} without permission!")
 
     def __getitem__(self, key: Union[str, Property, Signal]) -> Any:
         if isinstance(key, Signal) or isinstance(key, Property):
             key = key.id()
-        if key in self.properties:
-            return self.properties[key].get()
+        wrapper = self._property_wrapper(key)
+        if wrapper:
+            return wrapper.get()
         elif key in self.spike_payloads:
             return self.spike_payloads[key]
         else:
@@ -220,6 +299,12 @@ class ContextWrapper:
     def shutting_down(self):
         return self.ctx.shutting_down()
 
+    def consumers(self, item: Union[Property, Signal]) -> Set[State]:
+        """
+        Obtain the states which consume a property or signal, see `Context.consumers()`.
+        """
+        return self.ctx.consumers(item)
+
     def conf(self, *, mod=None, key=None):
         if not mod:
             mod = self.state.module_name
@@ -242,14 +327,11 @@ class ContextWrapper:
             return False
         if isinstance(parent_property_or_path, Property):
             parent_property_or_path = parent_property_or_path.id()
-        if parent_property_or_path in self.properties:
-            if self.properties[parent_property_or_path].push(child):
-                self.properties[child.id()] = PropertyWrapper(
-                    prop=child, ctx=self.ctx,
-                    spike_parents=self.spike_parents,
-                    allow_read=self.properties[parent_property_or_path].allow_read,
-                    allow_write=self.properties[parent_property_or_path].allow_write,
-                    boring=self.state.boring)
+        parent_wrapper = self._property_wrapper(parent_property_or_path)
+        if parent_wrapper:
+            if parent_wrapper.push(child):
+                _, allow_read, allow_write = self._permissions[parent_property_or_path]
+                self._own_permissions()[child.id()] = (child, allow_read, allow_write)
                 self.ctx.add_prop(prop=child)
                 return True
         else:
@@ -272,16 +354,20 @@ class ContextWrapper:
             logger.error(f"State {self.state.name}: Path to pop is not a nested property: {property_or_path}")
             return False
         parentpath = ":".join(path_parts[:-1])
-        if parentpath in self.properties:
-            if self.properties[parentpath].pop(path_parts[-1]):
-                self.ctx.rm_prop(prop=self.properties[property_or_path].prop)
-                # Remove property from own dict
-                del self.properties[property_or_path]
+        parent_wrapper = self._property_wrapper(parentpath)
+        if parent_wrapper:
+            if parent_wrapper.pop(path_parts[-1]):
+                permissions = self._own_permissions()
+                self.ctx.rm_prop(prop=permissions[property_or_path][0])
+                # Remove property from own dicts
+                del permissions[property_or_path]
+                self.properties.pop(property_or_path, None)
                 # Also remove the deleted propertie's children
-                for childpath in list(self.properties.keys()):
+                for childpath in list(permissions.keys()):
                     if childpath.startswith(property_or_path + ":"):
-                        self.ctx.rm_prop(prop=self.properties[childpath].prop)
-                        del self.properties[childpath]
+                        self.ctx.rm_prop(prop=permissions[childpath][0])
+                        del permissions[childpath]
+                        self.properties.pop(childpath, None)
                 return True
             else:
                 logger.error(f'State {self.state.name} attempted to remove non-existent child-property {property_or_path}')
@@ -296,8 +382,9 @@ class ContextWrapper:
         """
         if isinstance(property_or_path, Property):
             property_or_path = property_or_path.id()
-        if property_or_path in self.properties:
-            return self.properties[property_or_path].enum()
+        wrapper = self._property_wrapper(property_or_path)
+        if wrapper:
+            return wrapper.enum()
         else:
             logger.error(f"State {self.state.name} attempted to enumerate property {property_or_path} without permission!")
 
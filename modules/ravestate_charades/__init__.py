@@ -233,7 +233,7 @@ if ROS_AVAILABLE:
         def offer_game(ctx: rs.ContextWrapper):
             if not ctx[prop_game_in_progress]:
                 ctx[rawio.prop_out] = verbaliser.get_random_phrase(
-                    "charades_offer_game")
+                    "charades_offer_game", ctx=ctx)
                 ctx[prop_game_stopped] = False
                 return rs.Emit()
             else:
@@ -252,7 +252,7 @@ if ROS_AVAILABLE:
             if not ctx[prop_game_in_progress]:
                 if ctx[nlp.prop_yesno].yes():
                     ctx[rawio.prop_out] = verbaliser.get_random_phrase(
-                        "charades_positive_expressions") + \
+                        "charades_positive_expressions", ctx=ctx) + \
                         " Do you want to hear the rules?"
                     if ctx.conf(key=USE_EMOTIONS):
                         emo_client(SMILEBLINK_EMOTION)
@@ -261,12 +261,12 @@ if ROS_AVAILABLE:
                     if random.random() < 0.5 and ctx.conf(key=USE_EMOTIONS):
                         emo_client(ROLL_EYES_EMOTION)
                     ctx[rawio.prop_out] = verbaliser.get_random_phrase(
-                        "charades_refuse_offer")
+                        "charades_refuse_offer", ctx=ctx)
                     ctx[prop_stop_game] = True
                 else:
                     ctx[prop_decision_unclear] = True
                     ctx[rawio.prop_out] = verbaliser.get_random_phrase(
-                        "charades_misunderstanding")
+                        "charades_misunderstanding", ctx=ctx)
             else:
                 return rs.Resign()
 
@@ -301,7 +301,7 @@ if ROS_AVAILABLE:
                   emit_detached=True)
         def offer_activity_choice(ctx: rs.ContextWrapper):
             ctx[rawio.prop_out] = verbaliser.get_random_phrase(
-                "charades_offer_activity_choice")
+                "charades_offer_activity_choice", ctx=ctx)
             return rs.Emit(wipe=True)
 
         @rs.state(cond=(sig_activity_choice_prompted.min_age(20).max_age(-1)),
@@ -323,7 +323,7 @@ if ROS_AVAILABLE:
                           ctx.conf(key=USE_EMOTIONS)):
                         emo_client(LOOK_LEFT_EMOTION)
                     ctx[rawio.prop_out] = verbaliser.get_random_phrase(
-                        "charades_ping_activity_choice")
+                        "charades_ping_activity_choice", ctx=ctx)
                     ctx[prop_ping_choice_count] = pinged_times + 1
                     return rs.Emit()
                 else:
@@ -335,7 +335,7 @@ if ROS_AVAILABLE:
                   emit_detached=True)
         def clarify_activity_choice(ctx: rs.ContextWrapper):
             ctx[rawio.prop_out] = verbaliser.get_random_phrase(
-                "charades_misunderstanding") + " " + \
+                "charades_misunderstanding", ctx=ctx) + " " + \
                 "Say 'ready' when you're ready"
             return rs.Emit()
 
@@ -356,7 +356,7 @@ if ROS_AVAILABLE:
                         "meridian" in ctx[nlp.prop_lemmas] or
                         "radio" in ctx[nlp.prop_lemmas]):
                     ctx[rawio.prop_out] = verbaliser.get_random_phrase(
-                        "charades_countdown")
+                        "charades_countdown", ctx=ctx)
                     ctx[prop_ping_choice_count] = 0
                     return rs.Emit()
                 else:
@@ -405,16 +405,16 @@ if ROS_AVAILABLE:
                     label = message.label[ctx[prop_guess_attempt_count]]
                     if confidence < 0.5:
                         conf_expr = verbaliser.get_random_phrase(
-                            "charades_lower_confidence_prediction")
+                            "charades_lower_confidence_prediction", ctx=ctx)
                     elif confidence < 0.9:
                         conf_expr = verbaliser.get_random_phrase(
-                            "charades_higher_confidence_prediction")
+                            "charades_higher_confidence_prediction", ctx=ctx)
                     else:
                         conf_expr = verbaliser.get_random_phrase(
-                            "charades_highest_confidence_prediction")
+                            "charades_highest_confidence_prediction", ctx=ctx)
                     ctx[rawio.prop_out] = conf_expr + " " + str(label) +\
                         " " + verbaliser.get_random_phrase(
-                        "charades_ask_for_feedback")
+                        "charades_ask_for_feedback", ctx=ctx)
                     logger.info(
                         f"Label named {label}, attempt {ctx[prop_guess_attempt_count]}")
                     ctx[prop_waiting_for_label] = False
@@ -444,7 +444,7 @@ if ROS_AVAILABLE:
                 rand = random.random()
                 if ctx[nlp.prop_yesno].yes():
                     ctx[rawio.prop_out] = verbaliser.get_random_phrase(
-                        "charades_winning_exclamations")
+                        "charades_winning_exclamations", ctx=ctx)
                     if rand < 0.5:
                         emotion = SUNGLASSES_ON_EMOTION
                         ctx[prop_sunglasses_on] = True
@@ -457,12 +457,12 @@ if ROS_AVAILABLE:
                 elif ctx[nlp.prop_yesno].no():
                     if ctx[prop_guess_attempt_count] < 3:
                         ctx[rawio.prop_out] = verbaliser.get_random_phrase(
-                            "charades_new_guess_attempt")
+                            "charades_new_guess_attempt", ctx=ctx)
                         ctx[prop_another_attempt] = True
                         logger.info("wrong guess")
                     else:
                         ctx[rawio.prop_out] = verbaliser.get_random_phrase(
-                            "charades_losing_exclamations")
+                            "charades_losing_exclamations", ctx=ctx)
                         if ctx.conf(key=USE_EMOTIONS):
                             emo_client(SHY_EMOTION)
                         ctx[prop_feedback_received] = True
@@ -480,8 +480,8 @@ if ROS_AVAILABLE:
         def clarify_feedback(ctx: rs.ContextWrapper):
             if ctx[prop_game_in_progress] and not ctx[prop_feedback_received]:
                 ctx[rawio.prop_out] = verbaliser.get_random_phrase(
-                    "charades_misunderstanding") + " " + \
-                    verbaliser.get_random_phrase("charades_ask_for_feedback")
+                    "charades_misunderstanding", ctx=ctx) + " " + \
+                    verbaliser.get_random_phrase("charades_ask_for_feedback", ctx=ctx)
                 return rs.Emit()
             else:
                 return rs.Resign()
@@ -507,7 +507,7 @@ if ROS_AVAILABLE:
         def ask_to_continue(ctx: rs.ContextWrapper):
             if ctx[prop_feedback_received]:
                 ctx[rawio.prop_out] = verbaliser.get_random_phrase(
-                    "charades_offer_another_round")
+                    "charades_offer_another_round", ctx=ctx)
                 if ctx[prop_sunglasses_on] and ctx.conf(key=USE_EMOTIONS):
                     emo_client(SUNGLASSES_ON_EMOTION)
                     ctx[prop_sunglasses_on] = False
@@ -528,19 +528,19 @@ if ROS_AVAILABLE:
             rand = random.random()
             if ctx[nlp.prop_yesno].yes():
                 ctx[rawio.prop_out] = verbaliser.get_random_phrase(
-                    "charades_positive_expressions") + " Let's continue then"
+                    "charades_positive_expressions", ctx=ctx) + " Let's continue then"
                 if rand < 0.7 and ctx.conf(key=USE_EMOTIONS):
                     emo_client(LUCKY_EMOTION)
                 return rs.Emit()
             elif ctx[nlp.prop_yesno].no():
                 ctx[rawio.prop_out] = verbaliser.get_random_phrase(
-                    "charades_no_continuation")
+                    "charades_no_continuation", ctx=ctx)
                 if ctx.conf(key=USE_EMOTIONS):
                     emo_client(KISS_EMOTION)
                 ctx[prop_stop_game] = True
             else:
                 ctx[rawio.prop_out] = verbaliser.get_random_phrase(
-                    "charades_misunderstanding")
+                    "charades_misunderstanding", ctx=ctx)
                 ctx[prop_continuation_unclear] = True
 
 
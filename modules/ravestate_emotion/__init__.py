@@ -19,6 +19,8 @@ CONFIG = {
 }
 
 AFFECTIONATE_LIST = ["cute", "nice", "cool", "awesome", "funny"]
+AFFECTIONATE_INTENT = "emotion:affectionate"
+nlp.intent_index.add_keywords(AFFECTIONATE_INTENT, AFFECTIONATE_LIST)
 
 with rs.Module(name="emotion", config=CONFIG, depends=(rawio.mod, nlp.mod)) as mod:
 
@@ -48,9 +50,9 @@ with rs.Module(name="emotion", config=CONFIG, depends=(rawio.mod, nlp.mod)) as m
             return rs.Emit()
         return rs.Resign()
 
-    @rs.state(cond=nlp.sig_contains_roboy, signal=sig_affectionate, read=nlp.prop_lemmas)
+    @rs.state(cond=nlp.sig_contains_roboy, signal=sig_affectionate, read=nlp.prop_intents)
     def is_affectionate(ctx: rs.ContextWrapper):
-        if any(l in ctx[nlp.prop_lemmas] for l in AFFECTIONATE_LIST) and \
+        if AFFECTIONATE_INTENT in ctx[nlp.prop_intents] and \
                 random.random() < ctx.conf(key=AFFECTIONATE_PROB_KEY):
             logger.debug(f"Emitting {sig_affectionate.name}")
             return rs.Emit()
@@ -31,7 +31,7 @@ with rs.Module(name="genqa", config=CONFIG, depends=(rawio.mod, idle.mod, nlp.mo
 
     @rs.state(cond=idle.sig_bored_by_user, write=rawio.prop_out, weight=1.15, cooldown=30.)
     def prompt(ctx):
-        ctx[rawio.prop_out] = verbaliser.get_random_phrase("question-answering-prompt")
+        ctx[rawio.prop_out] = verbaliser.get_random_phrase("question-answering-prompt", ctx=ctx)
 
     @rs.state(cond=nlp.sig_is_question, read=rawio.prop_in, write=rawio.prop_out)
     def drqa_module(ctx):
@@ -50,11 +50,11 @@ with rs.Module(name="genqa", config=CONFIG, depends=(rawio.mod, idle.mod, nlp.mo
         certainty = response_json["answers"][0]["span_score"]
         # sane answer
         if certainty > ctx.conf(key=ROBOY_ANSWER_SANITY):
-            ctx[rawio.prop_out] = verbaliser.get_random_phrase("question-answering-starting-phrases") + " " + \
+            ctx[rawio.prop_out] = verbaliser.get_random_phrase("question-answering-starting-phrases", ctx=ctx) + " " + \
                                response_json["answers"][0]["span"]
         # insane/unsure answer
         else:
-            ctx[rawio.prop_out] = verbaliser.get_random_phrase("unsure-question-answering-phrases") \
+            ctx[rawio.prop_out] = verbaliser.get_random_phrase("unsure-question-answering-phrases", ctx=ctx) \
                                % response_json["answers"][0]["span"] \
                                + "\n" + "Maybe I can find out more if your rephrase the question for me."
 
@@ -18,10 +18,10 @@ with rs.Module(name="hibye", depends=(interloc.mod, rawio.mod, verbaliser.mod))
         pushed_node_path: str = ctx[interloc.prop_all.pushed()]
         interloc_node: Node = ctx[pushed_node_path]
         if interloc_node and interloc_node.get_id() >= 0:
-            phrase = verbaliser.get_random_phrase('greeting-with-name')
+            phrase = verbaliser.get_random_phrase('greeting-with-name', ctx=ctx)
             ctx[rawio.prop_out] = phrase.format(name=interloc_node.get_name())
         else:
-            ctx[rawio.prop_out] = verbaliser.get_random_phrase(lang.intent_greeting)
+            ctx[rawio.prop_out] = verbaliser.get_random_phrase(lang.intent_greeting, ctx=ctx)
 
     @rs.state(cond=interloc.prop_all.popped(), write=verbaliser.prop_intent)
     def farewell(ctx: rs.ContextWrapper):
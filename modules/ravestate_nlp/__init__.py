@@ -1,3 +1,5 @@
+from concurrent.futures import TimeoutError
+
 import ravestate as rs
 
 import ravestate_rawio as rawio
@@ -8,13 +10,17 @@ from .question_word import QuestionWord
 from .triple import Triple
 from .extract_triples import extract_triples
 from .yes_no import yes_no, YesNoWrapper
+from .parse import ParseResult, ParsedToken, parse_doc, disabled_pipes, detect_yesno_question, ABOUT_ROBOY, FEATURES
+from .parse_cache import ParseCache, get_parse_cache, normalize_text
+from .nlp_pool import NlpPool, get_nlp_pool
+from .intent_index import IntentIndex, intent_index
+from .spacy_model import SpacyModel
 
 from reggol import get_logger
 logger = get_logger(__name__)
 
 
 def init_spacy():
-    # TODO: Create nlp instance in core:startup state, save in context instead of global var
     global empty_token
     try:
         import en_core_web_sm as spacy_en
@@ -25,24 +31,50 @@ def init_spacy():
     spacy_nlp_en = spacy_en.load()
     empty_token = spacy_nlp_en(u" ")[0]
 
-    # TODO: Make agent id configurable, rename nlp:contains-roboy to nlp:agent-mentioned
-    about_roboy = ('you', 'roboy', 'robot', 'roboboy', 'your')
-
     def roboy_getter(doc) -> bool:
-        return any(roboy in doc.text.lower() for roboy in about_roboy)
+        return any(roboy in doc.text.lower() for roboy in ABOUT_ROBOY)
 
     from spacy.tokens import Doc
-    Doc.set_extension('about_roboy', getter=roboy_getter)
-    Doc.set_extension('empty_token', getter=lambda doc: empty_token)
-    Doc.set_extension('triples', getter=extract_triples)
-    Doc.set_extension('yesno', getter=yes_no)
+    Doc.set_extension('about_roboy', getter=roboy_getter, force=True)
+    Doc.set_extension('empty_token', getter=lambda doc: empty_token, force=True)
+    Doc.set_extension('triples', getter=extract_triples, force=True)
+    Doc.set_extension('yesno', getter=yes_no, force=True)
     return spacy_nlp_en
 
 
-spacy_nlp_en = init_spacy()
-
-
-with rs.Module(name="nlp", depends=(rawio.mod,)) as mod:
+# Loaded on first use, or in the background by nlp_load_model, and shared by all contexts of this process
+spacy_nlp_en = SpacyModel(loader=init_spacy)
+
+# Inputs which match a greeting or farewell as a whole are recognized as nlp:intent-hi/intent-bye
+intent_index.add_phrases(lang.intent_greeting, verbaliser.get_phrase_list(lang.intent_greeting) or ())
+intent_index.add_phrases(lang.intent_farewells, verbaliser.get_phrase_list(lang.intent_farewells) or ())
+
+# Shared by all contexts of this process, if nlp:pool_size is greater than 0
+parse_pool = None
+
+POOL_SIZE_CONFIG_KEY = "pool_size"
+BATCH_WINDOW_CONFIG_KEY = "batch_window"
+MAX_BATCH_SIZE_CONFIG_KEY = "max_batch_size"
+PARSE_TIMEOUT_CONFIG_KEY = "parse_timeout"
+PARSE_CACHE_SIZE_CONFIG_KEY = "parse_cache_size"
+SHARE_PARSE_CACHE_CONFIG_KEY = "share_parse_cache"
+CONFIG = {
+    # Number of worker processes which parse the inputs. If 0, inputs are parsed by the nlp_preprocess state.
+    POOL_SIZE_CONFIG_KEY: 0,
+    # Seconds which the worker pool waits for further inputs, which are then parsed together
+    BATCH_WINDOW_CONFIG_KEY: .005,
+    # Maximum number of inputs which are parsed together by a worker
+    MAX_BATCH_SIZE_CONFIG_KEY: 64,
+    # Seconds to wait for the worker pool, before an input is parsed by the nlp_preprocess state instead
+    PARSE_TIMEOUT_CONFIG_KEY: 5.,
+    # Number of parse results which are cached by input text. If 0, every input is parsed.
+    PARSE_CACHE_SIZE_CONFIG_KEY: 1024,
+    # Whether all contexts of this process share one parse cache, or each context has it's own
+    SHARE_PARSE_CACHE_CONFIG_KEY: True
+}
+
+
+with rs.Module(name="nlp", config=CONFIG, depends=(rawio.mod,), preload=spacy_nlp_en.load) as mod:
 
     prop_tokens = rs.Property(name="tokens", default_value="", always_signal_changed=True, allow_pop=False, allow_push=False)
     prop_postags = rs.Property(name="postags", default_value="", always_signal_changed=True, allow_pop=False, allow_push=False)
@@ -52,6 +84,8 @@ with rs.Module(name="nlp", depends=(rawio.mod,)) as mod:
     prop_triples = rs.Property(name="triples", default_value="", always_signal_changed=True, allow_pop=False, allow_push=False)
     prop_roboy = rs.Property(name="roboy", default_value="", always_signal_changed=True, allow_pop=False, allow_push=False)
     prop_yesno = rs.Property(name="yesno", default_value=YesNoWrapper(""), always_signal_changed=True, allow_pop=False, allow_push=False)
+    prop_intents = rs.Property(name="intents", default_value=frozenset(), always_signal_changed=True, allow_pop=False, allow_push=False)
+    prop_ready = rs.Property(name="ready", default_value=False, allow_pop=False, allow_push=False)
 
     sig_contains_roboy = rs.Signal(name="contains-roboy")
     sig_is_question = rs.Signal(name="is-question")
@@ -59,46 +93,138 @@ with rs.Module(name="nlp", depends=(rawio.mod,)) as mod:
     sig_intent_hi = rs.Signal(name="intent-hi")
     sig_intent_bye = rs.Signal(name="intent-bye")
 
-    @rs.state(read=rawio.prop_in, write=(prop_tokens, prop_postags, prop_lemmas, prop_tags, prop_ner, prop_triples, prop_roboy, prop_yesno))
-    def nlp_preprocess(ctx):
-        text = ctx[rawio.prop_in]
-        if not text:
-            return False
-        text = text.lower()
-        nlp_doc = spacy_nlp_en(text)
-
-        nlp_tokens = tuple(str(token) for token in nlp_doc)
-        ctx[prop_tokens] = nlp_tokens
-        logger.info(f"[NLP:tokens]: {nlp_tokens}")
-
-        nlp_postags = tuple(str(token.pos_) for token in nlp_doc)
-        ctx[prop_postags] = nlp_postags
-        logger.info(f"[NLP:postags]: {nlp_postags}")
-
-        nlp_lemmas = tuple(str(token.lemma_) for token in nlp_doc)
-        ctx[prop_lemmas] = nlp_lemmas
-        logger.info(f"[NLP:lemmas]: {nlp_lemmas}")
+    @rs.state(cond=rs.sig_startup, write=prop_ready)
+    def nlp_load_model(ctx):
+        """
+        Loads the spaCy model in the background, and sets nlp:ready once it is loaded.
+         Inputs which arrive earlier wait for the model in nlp_preprocess.
+        """
+        @rs.receptor(ctx_wrap=ctx, write=prop_ready)
+        def model_ready(ctx_input):
+            ctx_input[prop_ready] = True
 
-        nlp_tags = tuple(str(token.tag_) for token in nlp_doc)
-        ctx[prop_tags] = nlp_tags
-        logger.info(f"[NLP:tags]: {nlp_tags}")
+        spacy_nlp_en.load_async(on_ready=model_ready)
 
-        nlp_ner = tuple((str(ents.text), str(ents.label_)) for ents in nlp_doc.ents)
-        ctx[prop_ner] = nlp_ner
-        logger.info(f"[NLP:ner]: {nlp_ner}")
+    @rs.state(cond=rs.sig_startup)
+    def nlp_start_pool(ctx):
+        """
+        Starts the shared worker pool for parsing, if it is configured
+        """
+        global parse_pool
+        pool_size = ctx.conf(key=POOL_SIZE_CONFIG_KEY)
+        if pool_size > 0:
+            parse_pool = get_nlp_pool(
+                pool_size=pool_size,
+                batch_window=ctx.conf(key=BATCH_WINDOW_CONFIG_KEY),
+                max_batch_size=ctx.conf(key=MAX_BATCH_SIZE_CONFIG_KEY))
+
+    # The property which each nlp feature is written to
+    feature_props = {
+        "tokens": prop_tokens,
+        "postags": prop_postags,
+        "lemmas": prop_lemmas,
+        "tags": prop_tags,
+        "ner": prop_ner,
+        "triples": prop_triples,
+        "roboy": prop_roboy,
+        "yesno": prop_yesno,
+        "intents": prop_intents
+    }
+
+    def consumed_features(ctx):
+        """
+        Determine the features whose properties are read by states in the running context,
+         or whose signals they wait for. The recognizer states of this module only count
+         if their own signal is consumed.
+        """
+        if not isinstance(ctx, rs.ContextWrapper):
+            # e.g. a dictionary in unit tests
+            return FEATURES
 
-        nlp_triples = nlp_doc._.triples
-        nlp_triples[0].set_yesno_question(detect_yesno_question(nlp_postags))
-        ctx[prop_triples] = nlp_triples
-        logger.info(f"[NLP:triples]: {nlp_triples}")
+        def is_consumer(st):
+            return st.module_name != mod.name or (st.signal is not None and bool(ctx.consumers(st.signal)))
 
-        nlp_roboy = nlp_doc._.about_roboy
-        ctx[prop_roboy] = nlp_roboy
-        logger.info(f"[NLP:roboy]: {nlp_roboy}")
+        return frozenset(
+            feature for feature, prop in feature_props.items()
+            if any(is_consumer(st) for st in ctx.consumers(prop)))
 
-        nlp_yesno = nlp_doc._.yesno
-        ctx[prop_yesno] = nlp_yesno
-        logger.info(f"[NLP:yesno]: {nlp_yesno}")
+    @rs.state(read=rawio.prop_in, write=(prop_tokens, prop_postags, prop_lemmas, prop_tags, prop_ner, prop_triples, prop_roboy, prop_yesno, prop_intents))
+    def nlp_preprocess(ctx):
+        text = ctx[rawio.prop_in]
+        if not text:
+            return False
+        features = consumed_features(ctx)
+        if not features:
+            return False
+        text = normalize_text(text)
+        cache = None
+        if isinstance(ctx, rs.ContextWrapper) and ctx.conf(key=PARSE_CACHE_SIZE_CONFIG_KEY) > 0:
+            cache = get_parse_cache(
+                ctx.conf(key=PARSE_CACHE_SIZE_CONFIG_KEY),
+                None if ctx.conf(key=SHARE_PARSE_CACHE_CONFIG_KEY) else ctx.ctx)
+        result = cache.get(text, features) if cache is not None else None
+        if result is None:
+            if parse_pool:
+                try:
+                    result = parse_pool.parse(text, timeout=ctx.conf(key=PARSE_TIMEOUT_CONFIG_KEY), features=features)
+                except TimeoutError:
+                    logger.error(f"The nlp worker pool did not parse `{text}` in time, parsing it locally.")
+                except Exception as e:
+                    logger.error(f"The nlp worker pool failed to parse `{text}`: {e}, parsing it locally.")
+            if result is None:
+                if not spacy_nlp_en.is_ready():
+                    logger.info(f"Waiting for the spaCy model to parse `{text}`.")
+                result = parse_doc(
+                    spacy_nlp_en(text, disable=disabled_pipes(spacy_nlp_en.pipe_names, features)), features)
+            if cache is not None:
+                cache.put(text, features, result)
+
+        # only the consumed features are written, to spare the spikes of the others
+        if "tokens" in features:
+            nlp_tokens = result.tokens
+            ctx[prop_tokens] = nlp_tokens
+            logger.info(f"[NLP:tokens]: {nlp_tokens}")
+
+        if "postags" in features:
+            nlp_postags = result.postags
+            ctx[prop_postags] = nlp_postags
+            logger.info(f"[NLP:postags]: {nlp_postags}")
+
+        if "lemmas" in features:
+            nlp_lemmas = result.lemmas
+            ctx[prop_lemmas] = nlp_lemmas
+            logger.info(f"[NLP:lemmas]: {nlp_lemmas}")
+
+        if "tags" in features:
+            nlp_tags = result.tags
+            ctx[prop_tags] = nlp_tags
+            logger.info(f"[NLP:tags]: {nlp_tags}")
+
+        if "ner" in features:
+            nlp_ner = result.ner
+            ctx[prop_ner] = nlp_ner
+            logger.info(f"[NLP:ner]: {nlp_ner}")
+
+        if "triples" in features:
+            nlp_triples = list(result.triples)
+            ctx[prop_triples] = nlp_triples
+            logger.info(f"[NLP:triples]: {nlp_triples}")
+
+        if "roboy" in features:
+            nlp_roboy = result.roboy
+            ctx[prop_roboy] = nlp_roboy
+            logger.info(f"[NLP:roboy]: {nlp_roboy}")
+
+        if "yesno" in features:
+            nlp_yesno = result.yesno
+            ctx[prop_yesno] = nlp_yesno
+            logger.info(f"[NLP:yesno]: {nlp_yesno}")
+
+        if "intents" in features:
+            # matched once for all intents which modules registered in the intent index
+            nlp_intents = intent_index.match(text, result.lemmas)
+            ctx[prop_intents] = nlp_intents
+            logger.info(f"[NLP:intents]: {set(nlp_intents)}")
 
     @rs.state(signal=sig_contains_roboy, read=prop_roboy)
     def recognize_roboy(ctx):
@@ -116,21 +242,12 @@ with rs.Module(name="nlp", depends=(rawio.mod,)) as mod:
         if nlp_triples[0].match_either_lemma(pred={"play"}, obj={"game"}):
             return rs.Emit()
 
-    @rs.state(signal=sig_intent_hi, read=rawio.prop_in)
+    @rs.state(signal=sig_intent_hi, read=prop_intents)
     def recognize_intent_hi(ctx):
-        input_value = (ctx[rawio.prop_in] or "").strip().lower()
-        if input_value in verbaliser.get_phrase_list(lang.intent_greeting):
+        if lang.intent_greeting in ctx[prop_intents]:
             return rs.Emit()
 
-    @rs.state(signal=sig_intent_bye, read=rawio.prop_in)
+    @rs.state(signal=sig_intent_bye, read=prop_intents)
     def recognize_intent_bye(ctx):
-        input_value = (ctx[rawio.prop_in] or "").strip().lower()
-        if input_value in verbaliser.get_phrase_list(lang.intent_farewells):
+        if lang.intent_farewells in ctx[prop_intents]:
             return rs.Emit()
-
-    def detect_yesno_question(tags):
-        """
-        tests whether the prop_tags indicate that a yesno-question was asked
-        """
-        return tags[0] in {'VBP', 'VBD', 'VBZ', 'MD'} and tags[1] in {'PRP', 'DT'} or \
-            tags[0] in {'VBP', 'VBD', 'VBZ', 'MD'} and tags[1] == 'RB' and tags[2] in {'PRP', 'DT'}
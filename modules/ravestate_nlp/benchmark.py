@@ -0,0 +1,173 @@
+"""
+Throughput and latency benchmark for the nlp module, which runs outside of a Context
+and without network access (once `en_core_web_sm` is installed):
+
+* Throughput: Parses the bundled dialog corpus (see dialog_corpus.txt) one input
+ at a time in this process, in batches with `nlp.pipe()`, and with worker pools
+ of different sizes, and reports inputs per second.
+
+* Latency per stage: Splits the time per input between spaCy, the conversion to
+ ParsedTokens, triple extraction, yes/no detection and intent matching. To show how
+ the stages scale with the input length, the corpus inputs are joined into long
+ multi-clause inputs, e.g. 10 corpus inputs per input for `--clauses 10`.
+
+* Memory: Reports the peak of the python heap while the corpus is parsed
+ (measured with tracemalloc in a separate pass), and the peak RSS of this process.
+
+Usage:
+```
+python3 -m ravestate_nlp.benchmark --repeat 10 --batch-size 64 --pool-sizes 1 2 4 --clauses 1 10 50
+```
+"""
+import sys
+import time
+import argparse
+import tracemalloc
+from os.path import realpath, dirname, join
+from typing import List
+
+CORPUS_PATH = join(dirname(realpath(__file__)), "dialog_corpus.txt")
+
+# Stages of parsing an input, see benchmark_stages()
+STAGES = ("spacy", "tokens", "triples", "yesno", "intents")
+
+
+def load_corpus(path: str = CORPUS_PATH) -> List[str]:
+    """
+    Load a corpus file with one dialog input per line. Empty lines and comments are skipped.
+    """
+    with open(path, encoding="utf-8") as corpus_file:
+        return [line.strip().lower() for line in corpus_file if line.strip() and not line.startswith("#")]
+
+
+def long_inputs(texts: List[str], clauses: int) -> List[str]:
+    """
+    Join consecutive inputs into multi-clause inputs, like paragraphs pasted by telegram users.
+    """
+    return [", and ".join(texts[i:i + clauses]) for i in range(0, len(texts) - clauses + 1, clauses)]
+
+
+def report(name: str, num_inputs: int, seconds: float):
+    print(f"{name:<24} {num_inputs / seconds:>10.1f} inputs/s  ({seconds * 1000 / num_inputs:.2f}ms per input)")
+
+
+def benchmark_single(texts: List[str]):
+    from ravestate_nlp import spacy_nlp_en, parse_doc
+    start = time.perf_counter()
+    for text in texts:
+        parse_doc(spacy_nlp_en(text))
+    report("single", len(texts), time.perf_counter() - start)
+
+
+def benchmark_batched(texts: List[str], batch_size: int):
+    from ravestate_nlp import spacy_nlp_en, parse_doc
+    start = time.perf_counter()
+    for doc in spacy_nlp_en.pipe(texts, batch_size=batch_size):
+        parse_doc(doc)
+    report(f"batches of {batch_size}", len(texts), time.perf_counter() - start)
+
+
+def benchmark_pool(texts: List[str], pool_size: int, batch_window: float, max_batch_size: int):
+    from ravestate_nlp import NlpPool
+    pool = NlpPool(pool_size=pool_size, batch_window=batch_window, max_batch_size=max_batch_size)
+    # wait for every worker to load it's model
+    pool.warm_up()
+    start = time.perf_counter()
+    pool.parse_all(texts)
+    report(f"pool of {pool_size}", len(texts), time.perf_counter() - start)
+    pool.shutdown()
+
+
+def benchmark_stages(texts: List[str], name: str):
+    """
+    Measure the time per input of every stage in STAGES, parsing one input at a time.
+    """
+    if not texts:
+        print(f"{name:<24} no inputs")
+        return
+    from ravestate_nlp import spacy_nlp_en, intent_index
+    from ravestate_nlp.parse import parsed_tokens, EMPTY_TOKEN
+    from ravestate_nlp.extract_triples import extract_triples_from_tokens
+    from ravestate_nlp.yes_no import YesNoWrapper
+    seconds = [.0] * len(STAGES)
+    num_tokens = 0
+    for text in texts:
+        times = [time.perf_counter()]
+        doc = spacy_nlp_en(text)
+        times.append(time.perf_counter())
+        tokens = parsed_tokens(doc)
+        times.append(time.perf_counter())
+        extract_triples_from_tokens(tokens, EMPTY_TOKEN)
+        times.append(time.perf_counter())
+        YesNoWrapper(tokens)
+        times.append(time.perf_counter())
+        intent_index.match(text, tuple(token.lemma_ for token in tokens))
+        times.append(time.perf_counter())
+        for stage in range(len(STAGES)):
+            seconds[stage] += times[stage + 1] - times[stage]
+        num_tokens += len(tokens)
+    total = sum(seconds)
+    stages = "  ".join(
+        f"{stage} {stage_seconds * 1000 / len(texts):.3f}ms ({stage_seconds * 100 / total:.0f}%)"
+        for stage, stage_seconds in zip(STAGES, seconds))
+    print(f"{name:<24} {num_tokens / len(texts):>6.0f} tokens  {total * 1000 / len(texts):.3f}ms per input:  {stages}")
+
+
+def benchmark_memory(texts: List[str]):
+    """
+    Measure the peak of the python heap while the texts are parsed one at a time.
+     Tracing slows down parsing, so this is done apart from the time measurements.
+    """
+    from ravestate_nlp import spacy_nlp_en, parse_doc
+    tracemalloc.start()
+    for text in texts:
+        parse_doc(spacy_nlp_en(text))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{'python heap peak':<24} {peak / 2**20:>10.1f} MB")
+    try:
+        import resource
+    except ImportError:
+        # e.g. on windows
+        return
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on mac os, kilobytes elsewhere
+    max_rss = max_rss / 2**20 if sys.platform == "darwin" else max_rss / 2**10
+    print(f"{'process rss peak':<24} {max_rss:>10.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput and latency benchmark for the nlp module.")
+    parser.add_argument("--corpus", default=CORPUS_PATH, help="Corpus file with one input per line.")
+    parser.add_argument("--repeat", type=int, default=10, help="Number of passes over the corpus.")
+    parser.add_argument("--batch-size", type=int, default=64, help="Number of inputs per nlp.pipe() batch.")
+    parser.add_argument("--pool-sizes", type=int, nargs="*", default=[1, 2, 4])
+    parser.add_argument("--batch-window", type=float, default=.005)
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument("--clauses", type=int, nargs="*", default=[1, 10, 50],
+                        help="Numbers of corpus inputs which are joined into one input for the stage timing.")
+    args = parser.parse_args()
+
+    from ravestate_nlp import spacy_nlp_en
+    start = time.perf_counter()
+    spacy_nlp_en.load()
+    print(f"{'model loaded in':<24} {time.perf_counter() - start:>10.2f} s\n")
+
+    corpus = load_corpus(args.corpus)
+    texts = corpus * args.repeat
+    print(f"Parsing {len(texts)} inputs:")
+    benchmark_single(texts)
+    benchmark_batched(texts, args.batch_size)
+    for pool_size in args.pool_sizes:
+        benchmark_pool(texts, pool_size, args.batch_window, args.max_batch_size)
+
+    print("\nTime per stage:")
+    for clauses in args.clauses:
+        benchmark_stages(long_inputs(corpus, clauses) * args.repeat, f"{clauses} clauses")
+
+    print("\nMemory:")
+    benchmark_memory(corpus)
+
+
+if __name__ == "__main__":
+    main()
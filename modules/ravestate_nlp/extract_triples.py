@@ -1,12 +1,9 @@
 from ravestate_nlp.question_word import QuestionWord
-from ravestate_nlp.triple import Triple
-from spacy.tokens import Token
+from ravestate_nlp.triple import Triple, PREDICATE_AUX_SET, VERB_AUX_SET
 
 SUBJECT_SET = {"nsubj"}
 OBJECT_SET = {"dobj", "attr", "advmod", "pobj"}
 PREDICATE_SET = {"ROOT", "conj"}
-PREDICATE_AUX_SET = {"acomp", "aux", "xcomp"}
-VERB_AUX_SET = {"VERB", "ADJ"}
 RECURSION_BLACKLIST = {"cc", "conj"}
 
 
@@ -38,33 +35,56 @@ def extract_triples(doc):
                             -> relation to "father": attribute (attr) => object of this sentence
                                     ->relation to "your": possession modifier (poss)
     """
+    return extract_triples_from_tokens(doc, doc._.empty_token)
+
+
+def extract_triples_from_tokens(tokens, empty_token):
+    """
+    Extract the triples from a sequence of tokens (spaCy tokens or ParsedTokens),
+    see extract_triples(). Missing triple values are set to empty_token.
+    The searches of the predicates do not overlap, since they stop at conjunctions,
+    so every token is visited at most twice (conjuncts as child and as predicate).
+    """
     triples = []
-    for token in doc:
+    for token in tokens:
         if token.dep_ in PREDICATE_SET:
             triple = triple_search(Triple(predicate=token), token)
-            triple.ensure_notnull(doc._.empty_token)
+            triple.ensure_notnull(empty_token)
             triples.append(triple)
     return triples
 
 
-def triple_search(triple: Triple, token: Token):
+def triple_search(triple: Triple, token):
     """
-    Recursive search through the dependency tree
-    looks for triple values in each of the children and calls itself with the children nodes
+    Depth-first search through the dependency tree below the token for the values of the triple.
+    Later subjects and objects replace earlier ones, and a question word becomes the subject
+    if there is none after its siblings were searched. The search does not descend into question
+    words and conjunctions (see RECURSION_BLACKLIST). The tree is walked iteratively, so deep trees
+    do not hit the recursion limit, and only the final subject and object are stored in the triple.
     """
-    question_word = None
-    for word in token.children:
+    subject = triple.get_subject()
+    object = triple.get_object()
+    # remaining children of each visited token, and the last question word among them
+    stack = [[iter(token.children), None]]
+    while stack:
+        frame = stack[-1]
+        word = next(frame[0], None)
+        if word is None:
+            stack.pop()
+            if not subject and frame[1]:
+                subject = frame[1]
+            continue
         if word.text.lower() in QuestionWord.question_words:
-            question_word = QuestionWord(word)
             word = QuestionWord(word)
-            if not triple.get_object():
-                triple.set_object(question_word)
+            frame[1] = word
+            if not object:
+                object = word
         elif word.dep_ in OBJECT_SET:
-            triple.set_object(word)
+            object = word
         if word.dep_ in SUBJECT_SET:
-            triple.set_subject(word)
-        if isinstance(word, Token) and word.dep_ not in RECURSION_BLACKLIST:
-            triple = triple_search(triple, word)
-    if not triple.get_subject() and question_word:
-        triple.set_subject(question_word)
+            subject = word
+        if not isinstance(word, QuestionWord) and word.dep_ not in RECURSION_BLACKLIST:
+            stack.append([iter(word.children), None])
+    triple.set_subject(subject)
+    triple.set_object(object)
     return triple
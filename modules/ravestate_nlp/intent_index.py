@@ -0,0 +1,86 @@
+from collections import defaultdict
+from threading import Lock
+from typing import Dict, Set, Iterable, Sequence, FrozenSet
+
+from ravestate_nlp.parse_cache import normalize_text
+
+# Key of the intents which end at a node of the keyword trie
+_INTENTS = None
+
+
+class IntentIndex:
+    """
+    Matches inputs against the patterns which modules registered for their intents,
+     in one pass per input instead of one scan per intent:
+
+    * Phrases must match the whole (normalized) input, e.g. the greetings of hibye.
+     They are looked up in a hash table.
+
+    * Keywords are sequences of lemmas which may occur anywhere in the input.
+     They are stored in a trie, which is walked from every lemma of the input.
+
+    _Example:_
+    ```python
+    index = IntentIndex()
+    index.add_phrases("greeting", ["hi", "hello"])
+    index.add_keywords("food", ["pizza", "ice cream"])
+    index.match("i like ice cream", ("i", "like", "ice", "cream"))  # {"food"}
+    ```
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._phrases: Dict[str, Set[str]] = defaultdict(set)
+        self._trie: Dict = dict()
+
+    def add_phrases(self, intent: str, phrases: Iterable[str]):
+        """
+        Register phrases, which indicate an intent if they match the whole input.
+
+        * `intent`: Name of the intent, e.g. the verbaliser intent of the phrases.
+
+        * `phrases`: The phrases, which are normalized with `normalize_text()`.
+        """
+        with self._lock:
+            for phrase in phrases:
+                self._phrases[normalize_text(phrase)].add(intent)
+
+    def add_keywords(self, intent: str, keywords: Iterable[str]):
+        """
+        Register keywords, which indicate an intent if their lemmas occur anywhere in the input.
+
+        * `intent`: Name of the intent.
+
+        * `keywords`: Lemmas, or sequences of lemmas separated by spaces (e.g. "ice cream").
+        """
+        with self._lock:
+            for keyword in keywords:
+                node = self._trie
+                for lemma in normalize_text(keyword).split():
+                    node = node.setdefault(lemma, dict())
+                node.setdefault(_INTENTS, set()).add(intent)
+
+    def match(self, text: str, lemmas: Sequence[str]) -> FrozenSet[str]:
+        """
+        Find the intents of an input.
+
+        * `text`: The input, which is matched against the registered phrases.
+
+        * `lemmas`: The lemmas of the input, which are matched against the registered keywords.
+
+        **Returns:** The names of all matched intents.
+        """
+        intents = set(self._phrases.get(normalize_text(text), ()))
+        trie = self._trie
+        for start in range(len(lemmas)):
+            node = trie
+            for lemma in lemmas[start:]:
+                node = node.get(lemma)
+                if node is None:
+                    break
+                intents.update(node.get(_INTENTS, ()))
+        return frozenset(intents)
+
+
+# Index of the intents which all modules registered, see ravestate_nlp.prop_intents
+intent_index = IntentIndex()
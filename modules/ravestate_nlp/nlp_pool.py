@@ -0,0 +1,198 @@
+import os
+import time
+import multiprocessing as mp
+from concurrent.futures import Future
+from functools import partial
+from threading import Thread, Condition, Lock
+from typing import List, Tuple, Optional, Iterable, FrozenSet
+
+from ravestate_nlp.parse import ParseResult, parse_doc, disabled_pipes, FEATURES
+
+from reggol import get_logger
+logger = get_logger(__name__)
+
+# spaCy model of a pool worker process, see _init_worker()
+_worker_nlp = None
+
+
+def _init_worker():
+    global _worker_nlp
+    from ravestate_nlp import spacy_nlp_en
+    _worker_nlp = spacy_nlp_en.load()
+
+
+def _worker_ready(hold: float) -> int:
+    # Keep the worker busy for a moment, such that concurrent calls reach other workers
+    time.sleep(hold)
+    return os.getpid()
+
+
+def _parse_batch(texts: List[str], features: FrozenSet[str]) -> List[ParseResult]:
+    disable = disabled_pipes(_worker_nlp.pipe_names, features)
+    return [parse_doc(doc, features) for doc in _worker_nlp.pipe(texts, disable=disable)]
+
+
+def _resolve(batch: List[Tuple[str, FrozenSet[str], Future]], results: List[ParseResult]):
+    for (_, _, future), result in zip(batch, results):
+        future.set_result(result)
+
+
+def _fail(batch: List[Tuple[str, FrozenSet[str], Future]], error: BaseException):
+    logger.error(f"Failed to parse a batch of {len(batch)} texts: {error}")
+    for _, _, future in batch:
+        future.set_exception(error)
+
+
+class NlpPool:
+    """
+    Parses texts in a pool of worker processes, such that parsing neither blocks
+     the calling thread on the GIL, nor serializes the inputs of concurrent sessions.
+     Texts which are submitted within `batch_window` seconds of each other are
+     parsed together by one worker with `nlp.pipe()`, which is considerably faster
+     than parsing them one by one. Only texts which request the same features
+     are parsed in the same batch.
+
+    _Example:_
+    ```python
+    pool = NlpPool(pool_size=2)
+    result = pool.parse("how are you")
+    ```
+    """
+
+    def __init__(self, pool_size: int = 2, batch_window: float = .005, max_batch_size: int = 64):
+        """
+        Start the worker processes, each of which loads it's own spaCy model.
+
+        * `pool_size`: Number of worker processes.
+
+        * `batch_window`: Seconds to wait for further texts after a text is submitted,
+         before the batch is passed to a worker.
+
+        * `max_batch_size`: Maximum number of texts in a batch. Full batches are passed
+         to a worker immediately.
+        """
+        self._pool_size = pool_size
+        self._batch_window = batch_window
+        self._max_batch_size = max(max_batch_size, 1)
+        self._cond = Condition()
+        self._pending: List[Tuple[str, FrozenSet[str], Future]] = []
+        self._shutdown = False
+        # Workers are spawned, since forking a process which runs threads is unsafe
+        self._pool = mp.get_context('spawn').Pool(pool_size, initializer=_init_worker)
+        self._thread = Thread(target=self._dispatch_loop, daemon=True)
+        self._thread.start()
+
+    def submit(self, text: str, features: Iterable[str] = FEATURES) -> Future:
+        """
+        Queue a text for parsing. Returns immediately.
+
+        * `text`: The text to parse.
+
+        * `features`: Names of the features which should be extracted, see `parse_doc()`.
+         spaCy pipeline components which none of the features need are disabled.
+
+        **Returns:** A future for the `ParseResult` of the text.
+        """
+        future = Future()
+        with self._cond:
+            if self._shutdown:
+                future.set_exception(RuntimeError("NlpPool was shut down."))
+                return future
+            self._pending.append((text, frozenset(features), future))
+            self._cond.notify()
+        return future
+
+    def parse(self, text: str, timeout: Optional[float] = None, features: Iterable[str] = FEATURES) -> ParseResult:
+        """
+        Parse a text, and wait for the result.
+        """
+        return self.submit(text, features).result(timeout)
+
+    def parse_all(self, texts: Iterable[str], timeout: Optional[float] = None,
+                  features: Iterable[str] = FEATURES) -> List[ParseResult]:
+        """
+        Parse many texts at once, and wait for all results.
+        """
+        futures = [self.submit(text, features) for text in texts]
+        return [future.result(timeout) for future in futures]
+
+    def warm_up(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every worker process has loaded it's spaCy model. Workers load their
+         model before they accept their first task, so this function passes one task to
+         every worker, and repeats this until every worker returned a task.
+
+        * `timeout`: Seconds to wait at most, or None to wait until all workers are ready.
+
+        **Returns:** True if all workers are ready, False if the timeout expired.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        ready_pids = set()
+        while len(ready_pids) < self._pool_size:
+            results = [self._pool.apply_async(_worker_ready, (.05,)) for _ in range(self._pool_size)]
+            for result in results:
+                remaining = None if deadline is None else max(.0, deadline - time.monotonic())
+                try:
+                    ready_pids.add(result.get(remaining))
+                except mp.TimeoutError:
+                    return False
+        return True
+
+    def shutdown(self):
+        """
+        Stop the dispatcher thread and the worker processes. Texts which
+         were not parsed yet fail with a RuntimeError.
+        """
+        with self._cond:
+            self._shutdown = True
+            pending, self._pending = self._pending, []
+            self._cond.notify()
+        self._thread.join()
+        if pending:
+            _fail(pending, RuntimeError("NlpPool was shut down."))
+        self._pool.terminate()
+
+    def _dispatch_loop(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._shutdown:
+                    self._cond.wait()
+                # collect further texts for the batch window, unless the batch is full
+                deadline = time.monotonic() + self._batch_window
+                while len(self._pending) < self._max_batch_size and not self._shutdown:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                if self._shutdown:
+                    return
+                # the batch consists of the oldest texts which request the same features
+                features = self._pending[0][1]
+                batch, rest = [], []
+                for entry in self._pending:
+                    if entry[1] == features and len(batch) < self._max_batch_size:
+                        batch.append(entry)
+                    else:
+                        rest.append(entry)
+                self._pending = rest
+            self._pool.apply_async(
+                _parse_batch, ([text for text, _, _ in batch], features),
+                callback=partial(_resolve, batch),
+                error_callback=partial(_fail, batch))
+
+
+# Pool which is shared by all contexts of this process, see get_nlp_pool()
+nlp_pool: Optional[NlpPool] = None
+nlp_pool_lock = Lock()
+
+
+def get_nlp_pool(pool_size: int, batch_window: float, max_batch_size: int) -> NlpPool:
+    """
+    Retrieve the nlp pool of this process. It is created on first use,
+     with the given configuration.
+    """
+    global nlp_pool
+    with nlp_pool_lock:
+        if nlp_pool is None:
+            nlp_pool = NlpPool(pool_size=pool_size, batch_window=batch_window, max_batch_size=max_batch_size)
+        return nlp_pool
@@ -0,0 +1,142 @@
+from typing import List, Tuple, NamedTuple, Any, Iterable
+
+from ravestate_nlp.triple import Triple
+from ravestate_nlp.extract_triples import extract_triples_from_tokens
+from ravestate_nlp.yes_no import YesNoWrapper
+
+# TODO: Make agent id configurable, rename nlp:contains-roboy to nlp:agent-mentioned
+ABOUT_ROBOY = ('you', 'roboy', 'robot', 'roboboy', 'your')
+
+# Features which the nlp module can extract. Each one is written to the nlp property of the same name.
+# Intents are matched from the lemmas by nlp_preprocess, see IntentIndex, and ignored by parse_doc().
+FEATURES = frozenset(("tokens", "postags", "lemmas", "tags", "ner", "triples", "roboy", "yesno", "intents"))
+
+# spaCy pipeline components which are needed to extract each feature
+FEATURE_PIPES = {
+    "tokens": (),
+    "postags": ("tagger",),
+    "lemmas": ("tagger",),
+    "tags": ("tagger",),
+    "ner": ("ner",),
+    "triples": ("tagger", "parser"),
+    "roboy": (),
+    "yesno": (),
+    "intents": ("tagger",)
+}
+
+
+class ParsedToken:
+    """
+    Lightweight, picklable stand-in for a spaCy token, which offers the token
+    attributes that are used by triple extraction and matching. Unlike a spaCy
+    token, it does not keep the parsed document alive.
+    """
+
+    __slots__ = ("i", "text", "lemma_", "pos_", "tag_", "dep_", "is_space", "children")
+
+    def __init__(self, i: int = 0, text: str = "", lemma_: str = "", pos_: str = "", tag_: str = "",
+                 dep_: str = "", is_space: bool = False):
+        self.i = i
+        self.text = text
+        self.lemma_ = lemma_
+        self.pos_ = pos_
+        self.tag_ = tag_
+        self.dep_ = dep_
+        self.is_space = is_space
+        self.children: List['ParsedToken'] = []
+
+    def __getstate__(self):
+        return tuple(getattr(self, slot) for slot in self.__slots__)
+
+    def __setstate__(self, state):
+        for slot, value in zip(self.__slots__, state):
+            setattr(self, slot, value)
+
+    def __str__(self):
+        return self.text
+
+    def __repr__(self):
+        return self.text
+
+
+# Placeholder for missing subjects, predicates or objects of triples, like the parsed " "
+EMPTY_TOKEN = ParsedToken(text=" ", lemma_=" ", pos_="SPACE", tag_="_SP", is_space=True)
+
+
+class ParseResult(NamedTuple):
+    """
+    Everything the nlp module extracts from one input. Parse results do not reference
+    spaCy objects, such that they can be passed between processes.
+    """
+    tokens: Tuple[str, ...] = ()
+    postags: Tuple[str, ...] = ()
+    lemmas: Tuple[str, ...] = ()
+    tags: Tuple[str, ...] = ()
+    deps: Tuple[str, ...] = ()
+    # Index of the head of every token, which is the index of the token itself for roots
+    heads: Tuple[int, ...] = ()
+    ner: Tuple[Tuple[str, str], ...] = ()
+    triples: Tuple[Triple, ...] = ()
+    roboy: bool = False
+    yesno: Any = None
+
+
+def parsed_tokens(doc) -> List[ParsedToken]:
+    """
+    Convert the tokens of a spaCy doc to ParsedTokens, with the same dependency tree.
+    """
+    tokens = [
+        ParsedToken(i=token.i, text=token.text, lemma_=token.lemma_, pos_=token.pos_, tag_=token.tag_,
+                    dep_=token.dep_, is_space=token.is_space)
+        for token in doc]
+    for token in doc:
+        if token.head.i != token.i:
+            tokens[token.head.i].children.append(tokens[token.i])
+    return tokens
+
+
+def detect_yesno_question(tags) -> bool:
+    """
+    tests whether the prop_tags indicate that a yesno-question was asked
+    """
+    return tags[0] in {'VBP', 'VBD', 'VBZ', 'MD'} and tags[1] in {'PRP', 'DT'} or \
+        tags[0] in {'VBP', 'VBD', 'VBZ', 'MD'} and tags[1] == 'RB' and tags[2] in {'PRP', 'DT'}
+
+
+def disabled_pipes(pipe_names: Iterable[str], features: Iterable[str]) -> List[str]:
+    """
+    Determine the spaCy pipeline components which are not needed to extract the given features.
+
+    * `pipe_names`: Names of the components of the spaCy pipeline, e.g. `nlp.pipe_names`.
+
+    * `features`: Names of the features which should be extracted, see `FEATURES`.
+
+    **Returns:** Names of the components which can be disabled, e.g. `nlp(text, disable=...)`.
+    """
+    needed = {pipe for feature in features for pipe in FEATURE_PIPES[feature]}
+    return [name for name in pipe_names if name not in needed]
+
+
+def parse_doc(doc, features: Iterable[str] = FEATURES) -> ParseResult:
+    """
+    Extract a ParseResult from a spaCy doc. Token attributes are always extracted,
+     named entities, triples, the roboy flag and the yes/no answer only if they are
+     among the requested features, and keep their defaults otherwise.
+    """
+    tokens = parsed_tokens(doc)
+    postags = tuple(token.pos_ for token in tokens)
+    triples = ()
+    if "triples" in features:
+        triples = tuple(extract_triples_from_tokens(tokens, EMPTY_TOKEN))
+        triples[0].set_yesno_question(detect_yesno_question(postags))
+    return ParseResult(
+        tokens=tuple(token.text for token in tokens),
+        postags=postags,
+        lemmas=tuple(token.lemma_ for token in tokens),
+        tags=tuple(token.tag_ for token in tokens),
+        deps=tuple(token.dep_ for token in tokens),
+        heads=tuple(token.head.i for token in doc),
+        ner=tuple((str(ents.text), str(ents.label_)) for ents in doc.ents) if "ner" in features else (),
+        triples=triples,
+        roboy=any(roboy in doc.text.lower() for roboy in ABOUT_ROBOY) if "roboy" in features else False,
+        yesno=YesNoWrapper(tokens) if "yesno" in features else None)
@@ -0,0 +1,115 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Optional, Dict, Iterable, Any
+from weakref import WeakKeyDictionary
+
+from ravestate_nlp.parse import ParseResult
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize an input for parsing and caching: Lowercase, without surrounding
+     whitespace, and with single spaces between words.
+    """
+    return " ".join(text.lower().split())
+
+
+class ParseCache:
+    """
+    Bounded LRU cache of ParseResults, keyed by the normalized input text and the
+     requested features. Parse results do not reference spaCy objects, so cached
+     inputs do not keep any spaCy docs alive. Cached results are shared by all
+     readers, and must not be modified.
+
+    _Example:_
+    ```python
+    cache = ParseCache(max_size=1024)
+    result = cache.get("hi", FEATURES)
+    if result is None:
+        result = parse_doc(spacy_nlp_en("hi"))
+        cache.put("hi", FEATURES, result)
+    ```
+    """
+
+    def __init__(self, max_size: int = 1024):
+        self._max_size = max(max_size, 1)
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, text: str, features: Iterable[str]) -> Optional[ParseResult]:
+        """
+        Retrieve the cached parse result of a text, or None if it is not cached.
+
+        * `text`: The input, which is normalized with `normalize_text()`.
+
+        * `features`: The features which the result was extracted with.
+        """
+        key = (normalize_text(text), frozenset(features))
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            return result
+
+    def put(self, text: str, features: Iterable[str], result: ParseResult):
+        """
+        Cache the parse result of a text. The least recently used result
+         is dropped if the cache is full.
+        """
+        key = (normalize_text(text), frozenset(features))
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def metrics(self) -> Dict[str, float]:
+        """
+        **Returns:** A dictionary with the number of `hits`, `misses`,
+         cached results (`size`) and the `hit_rate` of this cache.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "hit_rate": self.hits / lookups if lookups else .0}
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+# Cache which is shared by all contexts of this process, see get_parse_cache()
+shared_parse_cache: Optional[ParseCache] = None
+# Caches of contexts which do not share their cache, by context
+parse_cache_per_owner: 'WeakKeyDictionary[Any, ParseCache]' = WeakKeyDictionary()
+parse_cache_lock = Lock()
+
+
+def get_parse_cache(max_size: int, owner: Any = None) -> ParseCache:
+    """
+    Retrieve a parse cache, which is created on first use with the given size.
+
+    * `max_size`: Maximum number of cached parse results.
+
+    * `owner`: The context which the cache belongs to, or None to retrieve
+     the cache which is shared by all contexts of this process.
+    """
+    global shared_parse_cache
+    with parse_cache_lock:
+        if owner is None:
+            if shared_parse_cache is None:
+                shared_parse_cache = ParseCache(max_size=max_size)
+            return shared_parse_cache
+        cache = parse_cache_per_owner.get(owner)
+        if cache is None:
+            cache = ParseCache(max_size=max_size)
+            parse_cache_per_owner[owner] = cache
+        return cache
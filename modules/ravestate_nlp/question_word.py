@@ -1,4 +1,7 @@
-from spacy.tokens import Token
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from spacy.tokens import Token
 
 
 class QuestionWord:
@@ -21,10 +24,13 @@ class QuestionWord:
         'how': FORM
     }
 
-    def __init__(self, token: Token):
+    def __init__(self, token: 'Token'):
         self.text = self.question_words[token.text.lower()]
         self.lemma_ = self.question_words[token.text.lower()]
         self.pos_ = self.question_pos
         self.dep_ = token.dep_
         self.is_space = False
         self.children = list()
+        # question words are matched without children, see Triple.match_either_lemma()
+        self.child_lemmas = frozenset()
+        self.aux_child_lemmas = frozenset()
@@ -0,0 +1,73 @@
+from threading import Lock, Thread
+from typing import Callable, Any, Optional
+
+from reggol import get_logger
+logger = get_logger(__name__)
+
+
+class SpacyModel:
+    """
+    A spaCy model, which is loaded once per process on first use, or in the background
+     with `load_async()`, instead of when its module is imported. It can be called like
+     the loaded model, and forwards all other attributes to it (e.g. `pipe_names`).
+     Callers which use the model while it is still loading wait for it.
+
+    _Example:_
+    ```python
+    spacy_nlp_en = SpacyModel(loader=en_core_web_sm.load)
+    spacy_nlp_en.load_async()
+    doc = spacy_nlp_en("hello")  # waits until the model is loaded
+    ```
+    """
+
+    def __init__(self, loader: Callable[[], Any]):
+        """
+        * `loader`: Function which loads and returns the model.
+        """
+        self._loader = loader
+        self._model = None
+        self._lock = Lock()
+
+    def load(self) -> Any:
+        """
+        Load the model, or wait until it is loaded by another thread.
+
+        **Returns:** The loaded model.
+        """
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    logger.info("Loading spaCy model...")
+                    self._model = self._loader()
+        return self._model
+
+    def load_async(self, on_ready: Optional[Callable[[], Any]] = None):
+        """
+        Load the model in a background thread, unless it is already loaded.
+
+        * `on_ready`: Function which is called once the model is loaded.
+        """
+        def load():
+            try:
+                self.load()
+            except Exception as e:
+                logger.error(f"Failed to load spaCy model: {e}")
+                return
+            if on_ready:
+                on_ready()
+        Thread(target=load, daemon=True).start()
+
+    def is_ready(self) -> bool:
+        """
+        **Returns:** True if the model is loaded, such that using it does not block.
+        """
+        return self._model is not None
+
+    def __call__(self, *args, **kwargs):
+        return self.load()(*args, **kwargs)
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            # e.g. while unpickling, before __init__ set the private attributes
+            raise AttributeError(name)
+        return getattr(self.load(), name)
@@ -1,40 +1,103 @@
-from spacy.tokens import Token
-from typing import Optional, Set, Union, Tuple
+import sys
+from typing import Optional, Set, Union, Tuple, FrozenSet, Any
 from ravestate_nlp.question_word import QuestionWord
 from ravestate_nlp.triple_match_result import TripleMatchResult
 
+# Dependencies and word types of the children of a predicate, which are matched with it
+PREDICATE_AUX_SET = {"acomp", "aux", "xcomp"}
+VERB_AUX_SET = {"VERB", "ADJ"}
+
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+
+class TripleToken:
+    """
+    Compact copy of a token (spaCy token or ParsedToken) in a triple. It only keeps
+     the attributes which triples use, and the lemmas of the token's children instead
+     of the children themselves, such that a triple does not keep the parsed document alive.
+    """
+
+    __slots__ = ("text", "lemma_", "pos_", "tag_", "dep_", "is_space", "child_lemmas", "aux_child_lemmas")
+
+    def __init__(self, token):
+        self.text = _intern(token.text)
+        self.lemma_ = _intern(token.lemma_)
+        self.pos_ = token.pos_
+        self.tag_ = getattr(token, "tag_", "")
+        self.dep_ = token.dep_
+        self.is_space = token.is_space
+        children = tuple(token.children)
+        # lemmas of all children, which are matched with subjects and objects
+        self.child_lemmas: FrozenSet[str] = frozenset(_intern(child.lemma_) for child in children)
+        # lemmas of the auxiliary children, which are matched with predicates
+        self.aux_child_lemmas: FrozenSet[str] = frozenset(
+            _intern(child.lemma_) for child in children
+            if child.dep_ in PREDICATE_AUX_SET and child.pos_ in VERB_AUX_SET)
+
+    def __getstate__(self):
+        return tuple(getattr(self, slot) for slot in self.__slots__)
+
+    def __setstate__(self, state):
+        for slot, value in zip(self.__slots__, state):
+            setattr(self, slot, value)
+
+    def __str__(self):
+        return self.text
+
+    def __repr__(self):
+        return self.text
+
+
+def compact_token(token) -> Optional[Union[TripleToken, QuestionWord]]:
+    """
+    Convert a token to the compact representation which is stored by triples.
+     Question words and tokens which are already compact are kept as they are.
+    """
+    if token is None or isinstance(token, (TripleToken, QuestionWord)):
+        return token
+    return TripleToken(token)
+
 
 class Triple:
+    """
+    Subject, predicate and object of a sentence. Tokens are stored as `TripleToken`s,
+     so triples can be kept, cached and passed between processes without their document.
+    """
 
-    _subject: Union[Token, QuestionWord]
-    _predicate: Token
-    _object: Union[Token, QuestionWord]
+    __slots__ = ("_subject", "_predicate", "_object", "_yesno_question")
+
+    _subject: Union[TripleToken, QuestionWord]
+    _predicate: TripleToken
+    _object: Union[TripleToken, QuestionWord]
     _yesno_question: bool
 
-    def __init__(self, subject: Token = None, predicate: Token = None, object: Token = None):
+    def __init__(self, subject: Any = None, predicate: Any = None, object: Any = None):
         self.set_subject(subject)
         self.set_predicate(predicate)
         self.set_object(object)
+        self._yesno_question = False
 
-    def set_subject(self, subject: Union[Token, QuestionWord]):
-        self._subject = subject
+    def set_subject(self, subject: Any):
+        self._subject = compact_token(subject)
 
-    def set_predicate(self, predicate: Token):
-        self._predicate = predicate
+    def set_predicate(self, predicate: Any):
+        self._predicate = compact_token(predicate)
 
-    def set_object(self, object: Union[Token, QuestionWord]):
-        self._object = object
+    def set_object(self, object: Any):
+        self._object = compact_token(object)
 
     def set_yesno_question(self, is_yesno: bool):
         self._yesno_question = is_yesno
 
-    def get_subject(self) -> Union[Token, QuestionWord]:
+    def get_subject(self) -> Union[TripleToken, QuestionWord]:
         return self._subject
 
-    def get_predicate(self) -> Token:
+    def get_predicate(self) -> TripleToken:
         return self._predicate
 
-    def get_object(self) -> Union[Token, QuestionWord]:
+    def get_object(self) -> Union[TripleToken, QuestionWord]:
         return self._object
 
     def get_yesno_question(self) -> bool:
@@ -70,23 +133,16 @@ class Triple:
 
         result = TripleMatchResult()
 
-        def add_common_set(phrases: Optional[Set[str]], token, dep_relationship_whitelist=None, pos_relationship_whitelist=None):
-            matches = ()
-            if phrases:
-                if token.lemma_ in phrases:
-                    matches += (token.lemma_,)
-                for child in token.children:
-                    if child.lemma_ in phrases and \
-                            (not dep_relationship_whitelist or child.dep_ in dep_relationship_whitelist) and \
-                            (not pos_relationship_whitelist or child.pos_ in pos_relationship_whitelist):
-                        matches += (child,)
-            return matches
-
-        from ravestate_nlp.extract_triples import PREDICATE_AUX_SET, VERB_AUX_SET
+        def add_common_set(phrases: Optional[Set[str]], token, child_lemmas: FrozenSet[str]):
+            if not phrases or token is None:
+                return ()
+            matches = (token.lemma_,) if token.lemma_ in phrases else ()
+            return matches + tuple(sorted(child_lemmas.intersection(phrases)))
 
-        result.preds += add_common_set(pred, self._predicate, dep_relationship_whitelist=PREDICATE_AUX_SET, pos_relationship_whitelist=VERB_AUX_SET)
-        result.subs += add_common_set(subj, self._subject)
-        result.objs += add_common_set(obj, self._object)
+        predicate, subject, object = self._predicate, self._subject, self._object
+        result.preds += add_common_set(pred, predicate, predicate.aux_child_lemmas if predicate else frozenset())
+        result.subs += add_common_set(subj, subject, subject.child_lemmas if subject else frozenset())
+        result.objs += add_common_set(obj, object, object.child_lemmas if object else frozenset())
 
         return result
 
@@ -101,11 +157,18 @@ class Triple:
     def ensure_notnull(self, empty_token):
         # do not allow empty entries in triple
         if not self._subject:
-            self._subject = empty_token
+            self.set_subject(empty_token)
         if not self._predicate:
-            self._predicate = empty_token
+            self.set_predicate(empty_token)
         if not self._object:
-            self._object = empty_token
+            self.set_object(empty_token)
+
+    def __getstate__(self):
+        return tuple(getattr(self, slot) for slot in self.__slots__)
+
+    def __setstate__(self, state):
+        for slot, value in zip(self.__slots__, state):
+            setattr(self, slot, value)
 
     def __eq__(self, other) -> bool:
         if isinstance(other, Triple):
@@ -120,7 +120,7 @@ with rs.Module(name="persqa", depends=(verbaliser.mod, mem.mod, nlp.mod, idle.mo
                 if pred:
                     logger.info(f"Personal question: intent={pred}")
                     ctx[prop_predicate] = pred
-                    ctx[rawio.prop_out] = verbaliser.get_random_question(pred)
+                    ctx[rawio.prop_out] = verbaliser.get_random_question(pred, ctx=ctx)
                 else:
                     unused_fup_preds = PREDICATE_SET.difference(used_follow_up_preds)
                     if not unused_fup_preds:
@@ -134,7 +134,7 @@ with rs.Module(name="persqa", depends=(verbaliser.mod, mem.mod, nlp.mod, idle.mo
                     if len(relationship_ids) > 0:  # Just to be safe ...
                         object_node_list = sess.retrieve(node_id=list(relationship_ids)[0])
                         if len(object_node_list) > 0:
-                            ctx[rawio.prop_out] = verbaliser.get_random_followup_question(pred).format(
+                            ctx[rawio.prop_out] = verbaliser.get_random_followup_question(pred, ctx=ctx).format(
                                 name=interloc.get_name(),
                                 obj=object_node_list[0].get_name())
                             logger.info(f"Follow-up: intent={pred}")
@@ -143,7 +143,7 @@ with rs.Module(name="persqa", depends=(verbaliser.mod, mem.mod, nlp.mod, idle.mo
             else:
                 # While the predicate is set, repeat the question. Once the predicate is answered,
                 #  it will be set to None, such that a new predicate is entered.
-                ctx[rawio.prop_out] = verbaliser.get_random_question(ctx[prop_predicate])
+                ctx[rawio.prop_out] = verbaliser.get_random_question(ctx[prop_predicate], ctx=ctx)
 
         @rs.state(
             cond=sig_follow_up.max_age(-1.) & nlp.prop_triples.changed(),
@@ -158,7 +158,7 @@ with rs.Module(name="persqa", depends=(verbaliser.mod, mem.mod, nlp.mod, idle.mo
             if len(relationship_ids) > 0:
                 object_node_list = sess.retrieve(node_id=list(relationship_ids)[0])
             if len(object_node_list) > 0:
-                ctx[rawio.prop_out] = verbaliser.get_random_followup_answer(pred).format(
+                ctx[rawio.prop_out] = verbaliser.get_random_followup_answer(pred, ctx=ctx).format(
                     name=subject_node.get_name(),
                     obj=object_node_list[0].get_name())
             else:
@@ -264,7 +264,7 @@ with rs.Module(name="persqa", depends=(verbaliser.mod, mem.mod, nlp.mod, idle.mo
                 subject_node.add_relationships({pred: {relationship_node.get_id()}})
                 sess.update(subject_node)
 
-        ctx[rawio.prop_out] = verbaliser.get_random_successful_answer(pred).format(
+        ctx[rawio.prop_out] = verbaliser.get_random_successful_answer(pred, ctx=ctx).format(
             name=subject_node.get_name(),
             obj=inferred_answer)
         ctx[prop_predicate] = None
@@ -1,5 +1,15 @@
+import os
+from io import BytesIO
+from contextlib import contextmanager
+from tempfile import NamedTemporaryFile
+from typing import Union, BinaryIO, Iterator
+
 import ravestate as rs
 
+# A picture in rawio:pic_in is either the path of an image file,
+#  or the encoded image itself (e.g. the bytes of a jpeg).
+Picture = Union[str, bytes, bytearray, memoryview]
+
 with rs.Module(name="rawio") as mod:
 
     prop_in = rs.Property(
@@ -17,6 +27,7 @@ with rs.Module(name="rawio") as mod:
         always_signal_changed=True,
         wipe_on_changed=False)
 
+    # Holds a `Picture`, use `open_pic()` or `pic_file()` to read it
     prop_pic_in = rs.Property(
         name="pic_in",
         default_value=None,
@@ -34,3 +45,47 @@ def say(ctx, what: str) -> None:
     def write_input(ctx_input, value: str):
         ctx_input[prop_in] = value
     write_input(what)
+
+
+def open_pic(pic: Picture) -> BinaryIO:
+    """
+    Open a picture from `rawio.prop_pic_in` for reading. In-memory `bytes` are
+     shared with the returned buffer until it is written to, while `bytearray`
+     and `memoryview` pictures are copied into it.
+
+    * `pic`: Path of an image file, or the encoded image.
+
+    **Returns:** A binary file object, which should be closed by the caller.
+    """
+    if isinstance(pic, str):
+        return open(pic, "rb")
+    return BytesIO(pic)
+
+
+@contextmanager
+def pic_file(pic: Picture, suffix: str = "") -> Iterator[str]:
+    """
+    Provide a picture from `rawio.prop_pic_in` as a file path, for consumers
+     which can only read files. In-memory pictures are written to a temporary
+     file, which is deleted when the context is left.
+
+    * `pic`: Path of an image file, or the encoded image.
+
+    * `suffix`: Suffix of the temporary file, e.g. ".jpg".
+
+    _Example:_
+    ```python
+    with pic_file(ctx[rawio.prop_pic_in]) as path:
+        image = load_image(path)
+    ```
+    """
+    if isinstance(pic, str):
+        yield pic
+        return
+    file = NamedTemporaryFile(suffix=suffix, delete=False)
+    try:
+        with file:
+            file.write(pic)
+        yield file.name
+    finally:
+        os.remove(file.name)
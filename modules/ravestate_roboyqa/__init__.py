@@ -12,6 +12,7 @@ from scientio.ontology.node import Node
 from os.path import realpath, dirname, join
 import random
 import datetime
+from typing import Optional
 
 from reggol import get_logger
 logger = get_logger(__name__)
@@ -21,6 +22,66 @@ verbaliser.add_folder(join(dirname(realpath(__file__)), "answering_phrases"))
 ROBOY_NODE_PROP_CONF_KEY = "roboy_node_properties"
 
 
+def _question(question_word: str):
+    # a triple is a question with this question word, see Triple.is_question()
+    return dict(obj={question_word}, subj={question_word})
+
+
+# The categories of questions about roboy, in the order of their precedence.
+#  The patterns of the first condition which the question triple matches
+#  are tried in order, and the first matching pattern determines the category.
+#  Conditions and patterns are keyword arguments of Triple.match_either_lemma(),
+#  where an empty pattern matches every triple.
+QUESTION_CATEGORIES = (
+    # question word: What?
+    (_question(nlp.QuestionWord.OBJECT), (
+        (dict(pred={"like"}, subj={"hobby"}), "HAS_HOBBY"),
+        (dict(pred={"learn"}, subj={"skill"}), "skills"),
+        (dict(pred={"can"}, subj={"ability"}), "abilities"),
+        (dict(subj={"age"}), "age"),
+        (dict(subj={"name"}), "full_name"),
+        (dict(pred={"become"}), "future"))),
+    # question word: Where?
+    (_question(nlp.QuestionWord.PLACE), (
+        (dict(pred={"be"}), "FROM"),
+        (dict(pred={"live"}), "LIVE_IN"))),
+    # question word: Who?
+    (_question(nlp.QuestionWord.PERSON), (
+        (dict(obj={"father", "dad"}), "CHILD_OF"),
+        (dict(obj={"brother", "sibling"}), "SIBLING_OF"),
+        (dict(obj={"friend", "girlfriend"}), "FRIEND_OF"),
+        (dict(), "full_name"))),
+    (dict(obj={"part", "member"}), (
+        (dict(), "MEMBER_OF"),)),
+    # question word: How?
+    (_question(nlp.QuestionWord.FORM), (
+        (dict(pred={"old"}), "age"),
+        (dict(pred={"be"}), "well_being"))),
+    (dict(obj={"skill"}), (
+        (dict(), "skills"),)),
+    (dict(obj={"ability"}), (
+        (dict(), "abilities"),))
+)
+
+
+def question_category(triple: nlp.Triple) -> Optional[str]:
+    """
+    Determine the category of a question about roboy, see QUESTION_CATEGORIES.
+
+    * `triple`: The first triple of the question.
+
+    **Returns:** The relationship (uppercase) or property (lowercase) of the roboy node
+     which answers the question, `well_being`, or None if the question can not be answered.
+    """
+    for condition, patterns in QUESTION_CATEGORIES:
+        if triple.match_either_lemma(**condition):
+            for pattern, category in patterns:
+                if not pattern or triple.match_either_lemma(**pattern):
+                    return category
+            return None
+    return None
+
+
 with rs.Module(
         name="roboyqa",
         config={ROBOY_NODE_PROP_CONF_KEY: {"name": "roboy two"}},
@@ -28,7 +89,7 @@ with rs.Module(
 
     @rs.state(cond=idle.sig_bored_by_user, write=rawio.prop_out, weight=1.01, cooldown=30.)
     def hello_world_roboyqa(ctx):
-       ctx[rawio.prop_out] = verbaliser.get_random_phrase("roboyqa-prompt")
+       ctx[rawio.prop_out] = verbaliser.get_random_phrase("roboyqa-prompt", ctx=ctx)
 
     @rs.state(cond=nlp.sig_contains_roboy & nlp.sig_is_question, read=nlp.prop_triples, write=rawio.prop_out)
     def roboyqa(ctx):
@@ -59,6 +120,11 @@ with rs.Module(
         - what have you learned?
         - what are your abilities?
         """
+        category = question_category(ctx[nlp.prop_triples][0])
+        if not category:
+            # spares the memory lookup for questions which can not be answered
+            return rs.Resign()
+
         sess: Session = ravestate_ontology.get_session()
         onto: Ontology = ravestate_ontology.get_ontology()
 
@@ -76,61 +142,12 @@ with rs.Module(
                 logger.error(f"Seems like you do not have my memory running, or no node with properties"
                              f"{ctx.conf(key=ROBOY_NODE_PROP_CONF_KEY)} exists!")
                 return rs.Resign()
-        
-        triple = ctx[nlp.prop_triples][0]
 
-        category = None
         memory_info = None
-
-        # question word: What?
-        if triple.is_question(nlp.QuestionWord.OBJECT):
-            if triple.match_either_lemma(pred={"like"}, subj={"hobby"}):
-                category = "HAS_HOBBY"
-            elif triple.match_either_lemma(pred={"learn"}, subj={"skill"}):
-                category = "skills"
-            elif triple.match_either_lemma(pred={"can"}, subj={"ability"}):
-                category = "abilities"
-            elif triple.match_either_lemma(subj={"age"}):
-                category = "age"
-                memory_info = roboy_age(roboy.get_properties(key="birthdate"))
-            elif triple.match_either_lemma(subj={"name"}):
-                category = "full_name"
-                memory_info = roboy.get_properties(key=category)
-            elif triple.match_either_lemma(pred={"become"}):
-                category = "future"
-
-        # question word: Where?
-        elif triple.is_question(nlp.QuestionWord.PLACE):
-            if triple.match_either_lemma(pred={"be"}):
-                category = "FROM"
-            elif triple.match_either_lemma(pred={"live"}):
-                category = "LIVE_IN"
-
-        # question word: Who?
-        elif triple.is_question(nlp.QuestionWord.PERSON):
-            if triple.match_either_lemma(obj={"father", "dad"}):
-                category = "CHILD_OF"
-            elif triple.match_either_lemma(obj={"brother", "sibling"}):
-                category = "SIBLING_OF"
-            elif triple.match_either_lemma(obj={"friend", "girlfriend"}):
-                category = "FRIEND_OF"
-            else:
-                category = "full_name"
-                memory_info = roboy.get_properties(key=category)
-        elif triple.match_either_lemma(obj={"part", "member"}):
-            category = "MEMBER_OF"
-
-        # question word: How?
-        elif triple.is_question(nlp.QuestionWord.FORM):
-            if triple.match_either_lemma(pred={"old"}):
-                category = "age"
-                memory_info = roboy_age(roboy.get_properties(key="birthdate"))
-            elif triple.match_either_lemma(pred={"be"}):
-                category = "well_being"
-        elif triple.match_either_lemma(obj={"skill"}):
-            category = "skills"
-        elif triple.match_either_lemma(obj={"ability"}):
-            category = "abilities"
+        if category == "age":
+            memory_info = roboy_age(roboy.get_properties(key="birthdate"))
+        elif category == "full_name":
+            memory_info = roboy.get_properties(key=category)
 
         if category and category.isupper() and not isinstance(roboy.get_relationships(key=category), dict):
             node_id = random.sample(roboy.get_relationships(key=category), 1)[0]
@@ -141,9 +158,9 @@ with rs.Module(
             memory_info = random.sample(property_list, 1)[0]
 
         if memory_info:
-            ctx[rawio.prop_out] = verbaliser.get_random_successful_answer("roboy_"+category) % memory_info
+            ctx[rawio.prop_out] = verbaliser.get_random_successful_answer("roboy_"+category, ctx=ctx) % memory_info
         elif category == "well_being":
-            ctx[rawio.prop_out] = verbaliser.get_random_successful_answer("roboy_"+category)
+            ctx[rawio.prop_out] = verbaliser.get_random_successful_answer("roboy_"+category, ctx=ctx)
         else:
             return rs.Resign()
 
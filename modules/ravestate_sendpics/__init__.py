@@ -12,7 +12,7 @@ from scientio.ontology.node import Node
 from scientio.session import Session
 from scientio.ontology.ontology import Ontology
 
-from ravestate_sendpics.face_recognition import recognize_face_from_image_file
+from ravestate_sendpics.face_recognition import recognize_face_from_image
 
 from reggol import get_logger
 logger = get_logger(__name__)
@@ -39,7 +39,7 @@ with rs.Module(name="sendpics", config=CONFIG, depends=(rawio.mod, nlp.mod, idle
 
     @rs.state(cond=idle.sig_bored_by_user, write=rawio.prop_out, weight=0.8, cooldown=30.)
     def prompt_send(ctx):
-        ctx[rawio.prop_out] = verbaliser.get_random_phrase("sendpics-prompt")
+        ctx[rawio.prop_out] = verbaliser.get_random_phrase("sendpics-prompt", ctx=ctx)
 
     @rs.state(
         read=rawio.prop_pic_in,
@@ -47,7 +47,7 @@ with rs.Module(name="sendpics", config=CONFIG, depends=(rawio.mod, nlp.mod, idle
         emit_detached=True)
     def prompt_name(ctx):
         # Get face ancoding
-        face = recognize_face_from_image_file(ctx[rawio.prop_pic_in])
+        face = recognize_face_from_image(ctx[rawio.prop_pic_in])
         # Prompt name
         if face is not None:
             ctx[rawio.prop_out] = "Nice picture! Who is that person?"
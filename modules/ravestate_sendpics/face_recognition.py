@@ -1,6 +1,7 @@
 from typing import Optional
 from reggol import get_logger
 from numpy import ndarray
+from ravestate_rawio import Picture, open_pic, pic_file
 logger = get_logger(__name__)
 
 PYROBOY_AVAILABLE = False
@@ -11,14 +12,19 @@ except ImportError as e:
     import face_recognition as fr
 
 
-def recognize_face_from_image_file(image_file: str) -> Optional[ndarray]:
+def recognize_face_from_image(image: Picture) -> Optional[ndarray]:
 
     if PYROBOY_AVAILABLE:
-        return FaceRec.get_biggest_face_encoding(image_file)
+        # pyroboy only reads image files
+        with pic_file(image) as image_file:
+            return FaceRec.get_biggest_face_encoding(image_file)
     else:
         logger.warning("Falling back to basic Face Recognition functions, since Pyroboy is unavailable!")
-        image = fr.load_image_file(image_file)
+        # in-memory images are decoded directly from the buffer
+        with open_pic(image) as image_stream:
+            image = fr.load_image_file(image_stream)
         faces = fr.face_encodings(image)
         if faces:
             return faces[0]
         return None
+
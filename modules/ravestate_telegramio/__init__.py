@@ -9,6 +9,9 @@ import ravestate_ontology as ontology
 CONFIG = {
     # Token for the Telegram Bot
     telegram_bot.TOKEN_CONFIG_KEY: "",
+    # URL of the Telegram Bot API server. If empty, the official server is used.
+    # Can be set to the URL of a FakeTelegramServer (see fake_api.py) for load tests.
+    telegram_bot.API_URL_CONFIG_KEY: "",
     # Not to be set in a config file or via the command line. Will be set by master process as a runtime_override.
     telegram_bot.CHILD_CONN_CONFIG_KEY: None,
     # The config-paths listed here will be used for each new telegram chat (if they don't share the same context).
@@ -17,7 +20,15 @@ CONFIG = {
     # Whether all telegram chats should share the same context or not
     telegram_bot.ALL_IN_ONE_CONTEXT_CONFIG_KEY: False,
     # The timespan in minutes in which a chat will be kept active after the last message
-    telegram_bot.CHAT_LIFETIME: 5
+    telegram_bot.CHAT_LIFETIME: 5,
+    # Number of worker processes which host the contexts of the telegram chats (if they don't share the same
+    # context). Chats are distributed over the workers. If 0, one worker per CPU is started.
+    telegram_bot.CHAT_WORKERS_CONFIG_KEY: 0,
+    # Number of telegram users whose scientio node ids are cached in memory by each process
+    telegram_bot.USER_CACHE_SIZE_CONFIG_KEY: 1024,
+    # Path of an sqlite file which caches the node ids of all telegram users, and is shared by all processes.
+    # If empty, node ids are only cached in memory.
+    telegram_bot.USER_CACHE_PATH_CONFIG_KEY: ""
 }
 
 with Module(
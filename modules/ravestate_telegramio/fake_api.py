@@ -0,0 +1,172 @@
+import json
+import time
+import base64
+import urllib.parse
+from collections import defaultdict
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from socketserver import ThreadingMixIn
+from threading import Thread, Condition
+from typing import Dict, List, Optional, Callable, Any
+
+from reggol import get_logger
+logger = get_logger(__name__)
+
+
+# A 1x1 pixel PNG, which is served for every photo
+FAKE_PHOTO: bytes = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAIAAACQd1PeAAAADElEQVR4nGP4z8AAAAMBAQDJ/pLvAAAAAElFTkSuQmCC")
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class FakeTelegramServer:
+    """
+    Local stand-in for the subset of the Telegram Bot API which is used by telegramio
+    (getUpdates, sendMessage, sendChatAction, getFile and file downloads), to measure
+    telegramio with many chats without the real Telegram service. Point telegramio
+    to it with the `telegram-api-url` config entry.
+
+    Messages of simulated users are created with `send_user_message()`, and every
+    message which is sent by the bot is passed to `on_reply(chat_id, text)`.
+    Other API methods are acknowledged without effect.
+    """
+
+    def __init__(self, host: str = "localhost", port: int = 0):
+        self.on_reply: Optional[Callable[[int, str], None]] = None
+        self.num_requests: Dict[str, int] = defaultdict(int)
+        self._cond = Condition()
+        self._updates: List[Dict[str, Any]] = []
+        self._next_update_id = 1
+        self._next_message_id = 1
+        self._server = _ThreadingHTTPServer((host, port), _handler_for(self))
+        self._thread = Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread.start()
+
+    def shutdown(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def send_user_message(self, chat_id: int, user_id: int, text: str = "", photo: bool = False) -> int:
+        """
+        Simulate a message of a user in a private chat, which is returned by the next getUpdates.
+
+        * `chat_id`: Id of the chat.
+
+        * `user_id`: Id of the user who sends the message.
+
+        * `text`: The message text.
+
+        * `photo`: Whether the message is a photo.
+
+        **Returns:** The update id of the message.
+        """
+        with self._cond:
+            message = {
+                "message_id": self._new_message_id(),
+                "date": int(time.time()),
+                "chat": {"id": chat_id, "type": "private"},
+                "from": {"id": user_id, "is_bot": False, "first_name": f"User {user_id}", "username": f"user{user_id}"}}
+            if photo:
+                message["photo"] = [{"file_id": f"photo-{message['message_id']}", "width": 1, "height": 1}]
+            else:
+                message["text"] = text
+            update_id = self._next_update_id
+            self._next_update_id += 1
+            self._updates.append({"update_id": update_id, "message": message})
+            self._cond.notify_all()
+            return update_id
+
+    def _new_message_id(self) -> int:
+        message_id = self._next_message_id
+        self._next_message_id += 1
+        return message_id
+
+    def _get_updates(self, offset: int, limit: int, timeout: float) -> List[Dict[str, Any]]:
+        deadline = time.time() + timeout
+        with self._cond:
+            # updates before the offset are confirmed
+            self._updates = [update for update in self._updates if update["update_id"] >= offset]
+            while not self._updates and time.time() < deadline:
+                self._cond.wait(deadline - time.time())
+            return self._updates[:limit]
+
+    def _count(self, request: str):
+        with self._cond:
+            self.num_requests[request] += 1
+
+    def _call(self, method: str, params: Dict[str, Any]) -> Any:
+        self._count(method)
+        if method == "getUpdates":
+            return self._get_updates(
+                int(params.get("offset", 0)), int(params.get("limit", 100)), float(params.get("timeout", 0)))
+        elif method == "sendMessage":
+            chat_id, text = int(params["chat_id"]), params.get("text", "")
+            if self.on_reply:
+                self.on_reply(chat_id, text)
+            with self._cond:
+                message_id = self._new_message_id()
+            return {
+                "message_id": message_id,
+                "date": int(time.time()),
+                "chat": {"id": chat_id, "type": "private"},
+                "text": text}
+        elif method == "getFile":
+            file_id = params["file_id"]
+            return {"file_id": file_id, "file_size": len(FAKE_PHOTO), "file_path": f"photos/{file_id}.png"}
+        elif method == "getMe":
+            return {"id": 1, "is_bot": True, "first_name": "Fake Bot", "username": "fake_bot"}
+        return True
+
+
+def _handler_for(server: FakeTelegramServer):
+
+    class FakeTelegramRequestHandler(BaseHTTPRequestHandler):
+
+        # keep connections alive, such that pooled connections of the bot are reused
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            path = urllib.parse.urlparse(self.path)
+            if path.path.startswith("/file/"):
+                server._count("file")
+                self._respond(200, FAKE_PHOTO, "image/png")
+            else:
+                self._call(path.path, dict(urllib.parse.parse_qsl(path.query)))
+
+        def do_POST(self):
+            path = urllib.parse.urlparse(self.path)
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            if self.headers.get("Content-Type", "").startswith("application/json"):
+                params = json.loads(body or b"{}")
+            else:
+                params = dict(urllib.parse.parse_qsl(body.decode()))
+            params.update(urllib.parse.parse_qsl(path.query))
+            self._call(path.path, params)
+
+        def log_message(self, format, *args):
+            # requests are counted instead of logged
+            pass
+
+        def _call(self, path: str, params: Dict[str, Any]):
+            # path is /bot<token>/<method>
+            method = path.rsplit("/", 1)[-1]
+            result = server._call(method, params)
+            self._respond(200, json.dumps({"ok": True, "result": result}).encode(), "application/json")
+
+        def _respond(self, status: int, body: bytes, content_type: str):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    return FakeTelegramRequestHandler
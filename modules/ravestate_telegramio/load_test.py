@@ -0,0 +1,206 @@
+"""
+Load test for telegramio: Runs ravestate against a FakeTelegramServer, simulates many users
+which send messages at a configurable rate, and reports message throughput, reply latency
+percentiles, process count and memory of the ravestate process tree.
+
+Usage:
+```
+python3 -m ravestate_telegramio.load_test --mode multiprocess --users 100 --rate .2 --duration 60 \\
+    -f config/roboy_telegram_bot_child.yml
+```
+The config files passed with `-f` determine the modules of the chat contexts. In multiprocess mode,
+they are used as child config files, in all-in-one mode, they are passed to the single context.
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+from collections import deque, defaultdict
+from threading import Lock
+from typing import Dict, Deque, List
+
+import psutil
+import yaml
+
+from ravestate_telegramio.fake_api import FakeTelegramServer
+
+MODE_ALL_IN_ONE = "all-in-one"
+MODE_MULTIPROCESS = "multiprocess"
+
+USER_MESSAGES = ("hi", "how are you?", "what is your name?", "where are you from?", "tell me a joke", "bye")
+
+
+class ReplyTracker:
+    """
+    Matches replies of the bot to the oldest unanswered message of the chat, to measure reply latency.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._unanswered: Dict[int, Deque[float]] = defaultdict(deque)
+        self.latencies: List[float] = []
+        self.num_sent = 0
+        self.num_replies = 0
+
+    def message_sent(self, chat_id: int):
+        with self._lock:
+            self._unanswered[chat_id].append(time.time())
+            self.num_sent += 1
+
+    def reply_received(self, chat_id: int, text: str):
+        with self._lock:
+            self.num_replies += 1
+            unanswered = self._unanswered[chat_id]
+            # further replies to an already answered message do not count for latency
+            if unanswered:
+                self.latencies.append(time.time() - unanswered.popleft())
+
+
+def percentile(values: List[float], p: float) -> float:
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p / 100. * len(values)))]
+
+
+def session_processes(process: psutil.Process) -> List[psutil.Process]:
+    """
+    Collect all processes in the session which is led by the given process. This includes
+    the chat workers in multiprocess mode: They are forked from the template process, and
+    reparented once the template process exits, so they are not children of the ravestate process.
+    """
+    result = []
+    for proc in psutil.process_iter():
+        try:
+            if os.getsid(proc.pid) == process.pid and proc.status() != psutil.STATUS_ZOMBIE:
+                result.append(proc)
+        except (OSError, psutil.NoSuchProcess):
+            continue
+    return result
+
+
+def process_tree_usage(process: psutil.Process):
+    """
+    **Returns:** Number of processes in the session of the given process,
+     sum of their rss and sum of their uss in bytes.
+    """
+    num_processes, rss, uss = 0, 0, 0
+    for proc in session_processes(process):
+        try:
+            memory = proc.memory_full_info()
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+        num_processes += 1
+        rss += memory.rss
+        uss += memory.uss
+    return num_processes, rss, uss
+
+
+def write_config(args, api_url: str) -> str:
+    """
+    Write the telegramio config for the ravestate process under test to a temporary file.
+    """
+    telegramio_config = {
+        "telegram-token": "load-test",
+        "telegram-api-url": api_url,
+        "all_in_one_context": args.mode == MODE_ALL_IN_ONE}
+    config = [{"module": "core", "config": {"import": ["ravestate_telegramio"]}}]
+    if args.mode == MODE_MULTIPROCESS:
+        telegramio_config["child_config_files"] = [os.path.abspath(path) for path in args.config_files]
+        if args.workers:
+            telegramio_config["chat_workers"] = args.workers
+    config.append({"module": "telegramio", "config": telegramio_config})
+    fd, path = tempfile.mkstemp(suffix=".yml")
+    with os.fdopen(fd, "w") as file:
+        yaml.safe_dump_all(config, file)
+    return path
+
+
+def run(args):
+    server = FakeTelegramServer()
+    tracker = ReplyTracker()
+    server.on_reply = tracker.reply_received
+    server.start()
+
+    config_path = write_config(args, server.url)
+    command = [sys.executable, "-m", "ravestate"]
+    if args.mode == MODE_ALL_IN_ONE:
+        for path in args.config_files:
+            command += ["-f", path]
+    command += ["-f", config_path]
+    # ravestate leads it's own session, such that all of it's processes can be found and killed
+    ravestate_process = psutil.Popen(command, start_new_session=True)
+
+    try:
+        # wait until the bot is polling
+        startup = time.time()
+        while not server.num_requests["getUpdates"]:
+            if time.time() - startup > args.startup_timeout:
+                print("Ravestate did not start polling for updates in time!")
+                return
+            time.sleep(.1)
+        print(f"Ravestate is polling after {time.time() - startup:.1f}s, starting {args.users} users.")
+
+        # every user sends messages in their own private chat, at random times with the given rate
+        next_message_per_user = {user_id: time.time() + random.expovariate(args.rate)
+                                 for user_id in range(1, args.users + 1)}
+        peak_processes, peak_rss, peak_uss = 0, 0, 0
+        next_sample = time.time()
+        start = time.time()
+        while time.time() - start < args.duration:
+            now = time.time()
+            for user_id, next_message in next_message_per_user.items():
+                if next_message <= now:
+                    photo = random.random() < args.photo_ratio
+                    tracker.message_sent(user_id)
+                    server.send_user_message(user_id, user_id, text=random.choice(USER_MESSAGES), photo=photo)
+                    next_message_per_user[user_id] = now + random.expovariate(args.rate)
+            if now >= next_sample:
+                num_processes, rss, uss = process_tree_usage(ravestate_process)
+                peak_processes = max(peak_processes, num_processes)
+                peak_rss, peak_uss = max(peak_rss, rss), max(peak_uss, uss)
+                next_sample = now + 1.
+            time.sleep(.01)
+
+        # wait for outstanding replies
+        time.sleep(args.grace)
+        elapsed = time.time() - start
+
+        print(f"Mode:           {args.mode}")
+        print(f"Users:          {args.users}, {args.rate} msgs/s each")
+        print(f"Messages:       {tracker.num_sent} sent, {tracker.num_replies} replies, "
+              f"{len(tracker.latencies)} answered")
+        print(f"Throughput:     {tracker.num_replies / elapsed:.1f} replies/s")
+        print("Reply latency:  " + ", ".join(
+            f"p{p} {percentile(tracker.latencies, p) * 1000:.0f}ms" for p in (50, 90, 99)))
+        print(f"Processes:      {peak_processes} (peak)")
+        print(f"Memory:         {peak_rss / 2**20:.0f}MB rss, {peak_uss / 2**20:.0f}MB uss (peak)")
+    finally:
+        for process in session_processes(ravestate_process) + [ravestate_process]:
+            try:
+                process.kill()
+            except psutil.NoSuchProcess:
+                pass
+        server.shutdown()
+        os.remove(config_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test for telegramio against a fake Telegram Bot API.")
+    parser.add_argument("--mode", choices=(MODE_ALL_IN_ONE, MODE_MULTIPROCESS), default=MODE_MULTIPROCESS)
+    parser.add_argument("--users", type=int, default=10, help="Number of simulated users.")
+    parser.add_argument("--rate", type=float, default=.2, help="Messages per second of every user.")
+    parser.add_argument("--photo-ratio", type=float, default=.0, help="Fraction of messages which are photos.")
+    parser.add_argument("--duration", type=float, default=30., help="Seconds during which users send messages.")
+    parser.add_argument("--grace", type=float, default=5., help="Seconds to wait for replies after the run.")
+    parser.add_argument("--workers", type=int, default=0, help="Number of chat workers in multiprocess mode.")
+    parser.add_argument("--startup-timeout", type=float, default=120.)
+    parser.add_argument("-f", dest="config_files", action="append", default=[],
+                        help="Ravestate config file for the chat contexts.")
+    run(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
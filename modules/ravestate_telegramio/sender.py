@@ -0,0 +1,120 @@
+import time
+from collections import deque
+from heapq import heappush, heappop
+from threading import Thread, Condition
+from typing import Dict, Deque, List, Tuple, Optional
+
+from telegram import Bot
+from telegram.error import TelegramError, RetryAfter
+
+from reggol import get_logger
+logger = get_logger(__name__)
+
+
+class TelegramSender:
+    """
+    Sends telegram messages with a long-lived bot from a background thread, such that
+    callers never block on the network. Messages are queued per chat, and sent in order with
+    at most `messages_per_second` messages in total and at least `chat_interval` seconds
+    between two messages to the same chat, to respect the flood limits of telegram.
+    Group chats (negative chat ids) are limited to about 20 messages per minute by telegram,
+    so they are sent at most one message per `group_chat_interval` seconds instead.
+    """
+
+    def __init__(self, bot: Bot, messages_per_second: float = 30., chat_interval: float = 1.,
+                 group_chat_interval: float = 3.):
+        self._bot = bot
+        self._send_interval = 1. / messages_per_second
+        self._chat_interval = chat_interval
+        self._group_chat_interval = group_chat_interval
+        self._cond = Condition()
+        # Pending messages for every chat which has any
+        self._queue_per_chat: Dict[int, Deque[str]] = dict()
+        # Heap of (earliest send time, chat_id) for every chat in _queue_per_chat
+        self._chat_heap: List[Tuple[float, int]] = []
+        # Earliest send time for chats without pending messages, that were sent a message recently
+        self._next_send_per_chat: Dict[int, float] = dict()
+        self._next_send = .0
+        self._shutdown = False
+        self._thread = Thread(target=self._send_loop, daemon=True)
+        self._thread.start()
+
+    def send(self, chat_id: int, text: str):
+        """
+        Queue a message. Returns immediately.
+        """
+        with self._cond:
+            queue = self._queue_per_chat.get(chat_id)
+            if queue is None:
+                queue = self._queue_per_chat[chat_id] = deque()
+                heappush(self._chat_heap, (self._next_send_per_chat.pop(chat_id, .0), chat_id))
+                self._cond.notify()
+            queue.append(text)
+
+    def pending(self) -> int:
+        """
+        Number of queued messages which were not sent yet.
+        """
+        with self._cond:
+            return sum(len(queue) for queue in self._queue_per_chat.values())
+
+    def shutdown(self):
+        """
+        Stop the sender thread. Messages which were not sent yet are discarded.
+        """
+        with self._cond:
+            self._shutdown = True
+            self._cond.notify()
+        self._thread.join()
+
+    def _next_message(self) -> Tuple[Optional[int], Optional[str]]:
+        # must be called with self._cond, returns (None, None) on shutdown
+        while not self._shutdown:
+            now = time.monotonic()
+            if not self._chat_heap:
+                self._cond.wait()
+                continue
+            send_time = max(self._chat_heap[0][0], self._next_send)
+            if send_time > now:
+                self._cond.wait(send_time - now)
+                continue
+            _, chat_id = heappop(self._chat_heap)
+            queue = self._queue_per_chat[chat_id]
+            text = queue.popleft()
+            self._next_send = now + self._send_interval
+            chat_interval = self._group_chat_interval if chat_id < 0 else self._chat_interval
+            if queue:
+                heappush(self._chat_heap, (now + chat_interval, chat_id))
+            else:
+                del self._queue_per_chat[chat_id]
+                self._next_send_per_chat[chat_id] = now + chat_interval
+            # forget send times which have passed
+            if len(self._next_send_per_chat) > 1024:
+                self._next_send_per_chat = {
+                    chat: send_time for chat, send_time in self._next_send_per_chat.items() if send_time > now}
+            return chat_id, text
+        return None, None
+
+    def _send_loop(self):
+        while True:
+            with self._cond:
+                chat_id, text = self._next_message()
+            if chat_id is None:
+                return
+            try:
+                self._bot.send_message(chat_id=chat_id, text=text)
+            except RetryAfter as e:
+                # flood limit was hit anyways: retry first, but pause all sending
+                logger.warning(f"Telegram flood limit hit, pausing for {e.retry_after}s.")
+                with self._cond:
+                    self._next_send = time.monotonic() + e.retry_after
+                    if chat_id in self._queue_per_chat:
+                        self._queue_per_chat[chat_id].appendleft(text)
+                    else:
+                        self._queue_per_chat[chat_id] = deque((text,))
+                        heappush(self._chat_heap, (self._next_send_per_chat.pop(chat_id, .0), chat_id))
+            except TelegramError as e:
+                logger.error(f"Failed to send message to chat {chat_id}: {e.message}")
+            except Exception as e:
+                # e.g. a network error: the message is dropped, but the sender must keep running
+                logger.error(f"Failed to send message to chat {chat_id}: {e}")
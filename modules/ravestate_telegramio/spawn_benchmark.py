@@ -0,0 +1,159 @@
+"""
+Measures the cost of starting chat sessions by spawning a fresh interpreter per session,
+compared to forking them from a pre-warmed `ContextSpawner` template, as telegramio and
+raveboard do. Reports the time to first output and the rss/uss of every session.
+
+A synthetic module stands in for expensive modules (e.g. spaCy models): It sleeps
+`--import-time` seconds and allocates `--resident-mb` MB of memory when it is imported,
+and writes a marker file from a state on `core:startup`, which counts as the first output.
+
+Usage:
+```
+python3 -m ravestate_telegramio.spawn_benchmark --sessions 5 --import-time 2 --resident-mb 150
+```
+"""
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import statistics
+import multiprocessing as mp
+from typing import List, Tuple, Any
+
+import psutil
+
+HEAVY_MODULE_NAME = "spawn_benchmark_heavy"
+HEAVY_MODULE_SOURCE = """
+import os
+import time
+import ravestate as rs
+
+time.sleep({import_time})
+BALLAST = bytearray(b"\\x01") * ({resident_mb} * 2**20)
+
+with rs.Module(name="{name}", config={{"marker_dir": ""}}):
+
+    @rs.state(cond=rs.sig_startup)
+    def first_output(ctx):
+        with open(os.path.join(ctx.conf(key="marker_dir"), str(os.getpid())), "w") as file:
+            file.write(str(time.time()))
+"""
+
+MODE_SPAWN = "spawn"
+MODE_FORK = "fork"
+
+
+def write_heavy_module(directory: str, import_time: float, resident_mb: int):
+    with open(os.path.join(directory, HEAVY_MODULE_NAME + ".py"), "w") as file:
+        file.write(HEAVY_MODULE_SOURCE.format(name=HEAVY_MODULE_NAME, import_time=import_time, resident_mb=resident_mb))
+
+
+def run_context(arguments: Tuple[str, ...], runtime_overrides: List[Tuple[str, str, Any]]):
+    from ravestate.context import Context
+    ctx = Context(*arguments, runtime_overrides=runtime_overrides)
+    ctx.run()
+    ctx._run_task.join()
+
+
+def wait_for_markers(marker_dir: str, pids: List[int], timeout: float) -> List[float]:
+    """
+    **Returns:** The first output time of every session, in the order of `pids`.
+    """
+    deadline = time.time() + timeout
+    times = dict()
+    while len(times) < len(pids) and time.time() < deadline:
+        for pid in pids:
+            path = os.path.join(marker_dir, str(pid))
+            if pid not in times and os.path.exists(path):
+                with open(path) as file:
+                    content = file.read()
+                if content:
+                    times[pid] = float(content)
+        time.sleep(.01)
+    if len(times) < len(pids):
+        raise TimeoutError(f"Only {len(times)} of {len(pids)} sessions produced output in time!")
+    return [times[pid] for pid in pids]
+
+
+def session_memory(pids: List[int]) -> List[Tuple[int, int]]:
+    """
+    **Returns:** rss and uss in bytes of every session.
+    """
+    result = []
+    for pid in pids:
+        memory = psutil.Process(pid).memory_full_info()
+        result.append((memory.rss, memory.uss))
+    return result
+
+
+def run(args, mode: str, marker_dir: str):
+    arguments = (HEAVY_MODULE_NAME,)
+    overrides = [(HEAVY_MODULE_NAME, "marker_dir", marker_dir)]
+    pids = []
+    spawner = None
+    template_pid = None
+    first_outputs = []
+    try:
+        if mode == MODE_FORK:
+            from ravestate.spawner import ContextSpawner
+            startup = time.time()
+            spawner = ContextSpawner(*arguments)
+            spawner.ready()
+            print(f"[{mode}] template ready after {time.time() - startup:.2f}s")
+        for _ in range(args.sessions):
+            start = time.time()
+            if mode == MODE_FORK:
+                pid = spawner.spawn(overrides)
+            else:
+                process = mp.get_context('spawn').Process(target=run_context, args=(arguments, overrides), daemon=True)
+                process.start()
+                pid = process.pid
+            pids.append(pid)
+            first_outputs.append(wait_for_markers(marker_dir, [pid], args.timeout)[0] - start)
+        if spawner:
+            template_pid = spawner._template_pid
+        memory = session_memory(pids)
+
+        print(f"[{mode}] time to first output: median {statistics.median(first_outputs):.2f}s, "
+              f"max {max(first_outputs):.2f}s")
+        print(f"[{mode}] per-session rss: median {statistics.median(rss for rss, _ in memory) / 2**20:.1f}MB, "
+              f"uss: median {statistics.median(uss for _, uss in memory) / 2**20:.1f}MB")
+        if template_pid:
+            template_rss = psutil.Process(template_pid).memory_info().rss
+            print(f"[{mode}] template rss: {template_rss / 2**20:.1f}MB")
+    finally:
+        for pid in pids:
+            try:
+                psutil.Process(pid).kill()
+            except psutil.NoSuchProcess:
+                pass
+        if spawner:
+            spawner.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare spawned and forked ravestate session startup.")
+    parser.add_argument("--sessions", type=int, default=5, help="Number of sessions to start in each mode.")
+    parser.add_argument("--import-time", type=float, default=2., help="Seconds which the synthetic module takes to import.")
+    parser.add_argument("--resident-mb", type=int, default=150, help="MB which the synthetic module allocates.")
+    parser.add_argument("--mode", choices=(MODE_SPAWN, MODE_FORK), action="append",
+                        help="Mode to measure, may be passed twice. Both modes by default.")
+    parser.add_argument("--timeout", type=float, default=120., help="Seconds to wait for a session's first output.")
+    args = parser.parse_args()
+
+    module_dir = tempfile.mkdtemp()
+    write_heavy_module(module_dir, args.import_time, args.resident_mb)
+    # spawned processes inherit sys.path from this process
+    sys.path.insert(0, module_dir)
+    try:
+        for mode in args.mode or (MODE_SPAWN, MODE_FORK):
+            marker_dir = tempfile.mkdtemp(dir=module_dir)
+            run(args, mode, marker_dir)
+    finally:
+        shutil.rmtree(module_dir)
+
+
+if __name__ == "__main__":
+    main()
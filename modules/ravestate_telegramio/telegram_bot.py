@@ -1,16 +1,23 @@
 import os
 import multiprocessing as mp
 import random
-from multiprocessing.connection import Connection
+from multiprocessing.connection import Connection, wait
 import time
-from typing import Set, Dict, Optional, Tuple
-from tempfile import mkstemp
+import zlib
+import struct
+from bisect import bisect, insort
+from heapq import heappush, heappop
+from queue import Queue
+from threading import Thread, Lock
+from typing import Set, Dict, Optional, Tuple, List, Any, NamedTuple, Callable
 import requests
+from requests.adapters import HTTPAdapter
 
 import ravestate as rs
 
 from telegram import Bot, Update, TelegramError, ChatAction
 from telegram.ext import Updater, MessageHandler, Filters, Dispatcher
+from telegram.utils.request import Request
 
 from scientio.ontology.node import Node
 from scientio.session import Session
@@ -25,6 +32,9 @@ import ravestate_ontology as ontology
 import ravestate_emotion as emotion
 import ravestate_verbaliser as verbaliser
 
+from ravestate_telegramio.sender import TelegramSender
+from ravestate_telegramio.user_cache import UserNodeCache, CachedUser
+
 
 MODULE_NAME: str = 'telegramio'
 TOKEN_CONFIG_KEY: str = "telegram-token"
@@ -32,6 +42,10 @@ CHILD_CONN_CONFIG_KEY: str = "child_conn"
 CHILD_FILES_CONFIG_KEY: str = "child_config_files"
 ALL_IN_ONE_CONTEXT_CONFIG_KEY: str = 'all_in_one_context'
 CHAT_LIFETIME: str = 'chat_lifetime'
+CHAT_WORKERS_CONFIG_KEY: str = 'chat_workers'
+API_URL_CONFIG_KEY: str = 'telegram-api-url'
+USER_CACHE_SIZE_CONFIG_KEY: str = 'user_cache_size'
+USER_CACHE_PATH_CONFIG_KEY: str = 'user_cache_path'
 
 
 class Timestamp:
@@ -47,16 +61,332 @@ class Timestamp:
         return time.time() - self.value
 
 
+class ChatMessage(NamedTuple):
+    """
+    Compact message from the master process to a chat context. Contains only the
+    fields of a telegram Update which are used by the chat, instead of the whole (Bot, Update).
+    """
+    chat_id: int
+    user_id: int = 0
+    username: str = ""
+    full_name: str = ""
+    text: str = ""
+    # Download URL of the photo on the telegram servers, if the message is a photo
+    photo_url: str = ""
+
+
+# Kinds of frames from the master process to a chat worker
+CHAT_INPUT: int = 0
+CHAT_REMOVE: int = 1
+
+# kind, chat_id, user_id, byte lengths of username, full_name, text and photo_url
+_CHAT_MESSAGE_HEADER = struct.Struct("<Bqq4I")
+# chat_id, byte length of the text
+_CHAT_REPLY_HEADER = struct.Struct("<qI")
+
+
+def encode_chat_message(message: ChatMessage, kind: int = CHAT_INPUT) -> bytes:
+    """
+    Serialize a ChatMessage into a binary frame for Connection.send_bytes().
+    """
+    strings = [value.encode() for value in (message.username, message.full_name, message.text, message.photo_url)]
+    return _CHAT_MESSAGE_HEADER.pack(
+        kind, message.chat_id, message.user_id, *(len(value) for value in strings)) + b"".join(strings)
+
+
+def decode_chat_message(data: bytes) -> Tuple[int, ChatMessage]:
+    """
+    Deserialize a binary frame which was created by encode_chat_message().
+    :return: The kind of the frame and the message.
+    """
+    kind, chat_id, user_id, *lengths = _CHAT_MESSAGE_HEADER.unpack_from(data)
+    strings = []
+    offset = _CHAT_MESSAGE_HEADER.size
+    for length in lengths:
+        strings.append(data[offset:offset + length].decode())
+        offset += length
+    return kind, ChatMessage(chat_id, user_id, *strings)
+
+
+def encode_chat_replies(replies: List[Tuple[int, str]]) -> bytes:
+    """
+    Serialize a batch of (chat_id, text) replies into a binary frame for Connection.send_bytes().
+    """
+    frame = bytearray()
+    for chat_id, text in replies:
+        text = text.encode()
+        frame += _CHAT_REPLY_HEADER.pack(chat_id, len(text))
+        frame += text
+    return bytes(frame)
+
+
+def decode_chat_replies(data: bytes) -> List[Tuple[int, str]]:
+    """
+    Deserialize a binary frame which was created by encode_chat_replies().
+    """
+    replies = []
+    offset = 0
+    while offset < len(data):
+        chat_id, length = _CHAT_REPLY_HEADER.unpack_from(data, offset)
+        offset += _CHAT_REPLY_HEADER.size
+        replies.append((chat_id, data[offset:offset + length].decode()))
+        offset += length
+    return replies
+
+
+def chat_message_from_update(bot: Bot, update: Update) -> Optional[ChatMessage]:
+    """
+    Extract a ChatMessage from a telegram Update. For photos, the download URL is retrieved from the bot.
+    """
+    photo_url = ""
+    if update.effective_message.photo:
+        photo_index = 2  # Seems like a good size index. TODO: Make configurable
+        while photo_index >= len(update.effective_message.photo):
+            photo_index -= 1
+        photo_url = bot.get_file(update.effective_message.photo[photo_index].file_id).file_path
+    elif not update.effective_message.text:
+        logger.error(f"{MODULE_NAME} received an update it cannot handle.")
+        return None
+    user = update.effective_user
+    return ChatMessage(
+        chat_id=update.effective_chat.id,
+        user_id=user.id if user else 0,
+        username=(user.username or "") if user else "",
+        full_name=(user.full_name or "") if user else "",
+        text=update.effective_message.text or "",
+        photo_url=photo_url)
+
+
+class ChatConnection:
+    """
+    Stands in for the Pipe of a telegram child process, for a chat context which is hosted by a ChatWorker:
+    Messages are received from the worker, replies are collected by the worker and sent to the master in batches.
+    """
+
+    def __init__(self, chat_id: int, send_reply: Callable[[int, str], None]):
+        self.chat_id = chat_id
+        self._send_reply = send_reply
+        self._messages = Queue()
+
+    def put(self, message: ChatMessage):
+        self._messages.put(message)
+
+    def recv(self) -> ChatMessage:
+        message = self._messages.get()
+        if message is None:
+            raise EOFError
+        return message
+
+    def send(self, text: str):
+        self._send_reply(self.chat_id, text)
+
+    def close(self):
+        self._messages.put(None)
+
+
+class ChatWorker(rs.ContextHost):
+    """
+    Worker process, which hosts the contexts of many telegram chats.
+    Receives ChatMessage frames from the master process, creates a context for every new chat,
+    and removes the context of a chat for CHAT_REMOVE frames. The replies of all chats
+    are sent to the master as one batch of (chat_id, text) after every update.
+    """
+
+    def __init__(self, *, template: rs.Context, master_conn: Connection):
+        super().__init__(template=template)
+        self._master_conn = master_conn
+        self._replies_lock = Lock()
+        self._replies: List[Tuple[int, str]] = []
+        self._chats: Dict[int, ChatConnection] = dict()
+
+    def run(self):
+        super().run()
+        Thread(target=self._receive_messages).start()
+
+    def run_once(self, seconds_passed=1.):
+        super().run_once(seconds_passed)
+        with self._replies_lock:
+            replies, self._replies = self._replies, []
+        if replies:
+            try:
+                self._master_conn.send_bytes(encode_chat_replies(replies))
+            except OSError:
+                # Pipe was closed, which is handled by _receive_messages
+                pass
+
+    def shutdown(self):
+        for chat_id in list(self._chats.keys()):
+            self._remove_chat(chat_id)
+        super().shutdown()
+
+    def _add_reply(self, chat_id: int, text: str):
+        with self._replies_lock:
+            self._replies.append((chat_id, text))
+
+    def _add_chat(self, chat_id: int) -> ChatConnection:
+        chat = ChatConnection(chat_id, self._add_reply)
+        self._chats[chat_id] = chat
+        self.add_session(chat_id, runtime_overrides=[(MODULE_NAME, CHILD_CONN_CONFIG_KEY, chat)])
+        return chat
+
+    def _remove_chat(self, chat_id: int):
+        chat = self._chats.pop(chat_id, None)
+        if chat:
+            chat.close()
+            self.remove_session(chat_id)
+
+    def _receive_messages(self):
+        try:
+            while not self.shutting_down():
+                kind, message = decode_chat_message(self._master_conn.recv_bytes())  # blocking
+                chat_id = message.chat_id
+                if kind == CHAT_REMOVE:
+                    self._remove_chat(chat_id)
+                    continue
+                # a chat context shuts down by itself after farewells, the chat restarts with a new context
+                if chat_id in self._chats and self.session(chat_id).shutting_down():
+                    self._remove_chat(chat_id)
+                chat = self._chats.get(chat_id) or self._add_chat(chat_id)
+                chat.put(message)
+        except EOFError:
+            # Pipe was closed -> Parent was killed or parent has closed the pipe
+            logger.info("Pipe was closed, therefore the chat worker will shut down.")
+        self.shutdown()
+
+
+def create_chat_worker(arguments, runtime_overrides: List[Tuple[str, str, Any]], template: Optional[rs.Context]):
+    """
+    Context factory to fork chat workers with a ContextSpawner. The worker's pipe
+    to the master process is passed as the child_conn runtime override.
+    """
+    if template is None:
+        return rs.Context(*arguments, runtime_overrides=runtime_overrides)
+    master_conn = None
+    for module_name, key, value in runtime_overrides:
+        if (module_name, key) == (MODULE_NAME, CHILD_CONN_CONFIG_KEY):
+            master_conn = value
+    return ChatWorker(template=template, master_conn=master_conn)
+
+
+class ChatRing:
+    """
+    Consistently hashes chat ids to workers, such that only the chats
+    of a removed worker are moved to other workers.
+    """
+
+    def __init__(self, replicas: int = 64):
+        self._replicas = replicas
+        self._hashes: List[int] = []
+        self._workers: Dict[int, Any] = dict()
+
+    def add(self, worker: Any):
+        for replica in range(self._replicas):
+            point = zlib.crc32(f"{worker}:{replica}".encode())
+            insort(self._hashes, point)
+            self._workers[point] = worker
+
+    def remove(self, worker: Any):
+        self._hashes = [point for point in self._hashes if self._workers[point] != worker]
+        self._workers = {point: self._workers[point] for point in self._hashes}
+
+    def get(self, chat_id: int) -> Optional[Any]:
+        if not self._hashes:
+            return None
+        index = bisect(self._hashes, zlib.crc32(str(chat_id).encode())) % len(self._hashes)
+        return self._workers[self._hashes[index]]
+
+
 # active_chats contains all active "Chats".
-# Maps chat_id to a tuple consisting of the timestamp of the last message in this chat and a Pipe.
-# If all chats run in one process, the pipe-field is set to None
+# Maps chat_id to a tuple consisting of the timestamp of the last message in this chat and the Pipe
+# of the chat worker which hosts the chat. If all chats run in one process, the pipe-field is set to None
 active_chats: Dict[int, Tuple[Timestamp, Optional[mp.connection.Connection]]] = dict()
 # active_users contains user_ids of all Users that currently engage with the bot.
 # At the same time a User can talk to the bot in personal and group chats but only is in active_users once.
 # A user_id is mapped to a set containing the chat_id of every Chat that the User is involved in
 active_users: Dict[int, Set[int]] = dict()
+# Reverse index of active_users: Maps chat_id to the set of user_ids which are involved in the chat
+active_chat_users: Dict[int, Set[int]] = dict()
+# Heap of (expiry time, chat_id) for the chats in active_chats of the master process.
+# The expiry time of an entry is an earliest bound, since the chat may have received messages since the entry was pushed
+chat_expiry_heap: List[Tuple[float, int]] = []
+# Protects active_chats, active_users, active_chat_users and chat_expiry_heap in the master process
+active_chats_lock = Lock()
+
+# Sends all outgoing telegram messages of this process, see get_sender()
+sender: Optional[TelegramSender] = None
+sender_lock = Lock()
+SENDER_CONNECTION_POOL_SIZE: int = 8
+
+# Downloads incoming photos of this process with pooled HTTP connections, see download_photo()
+download_session: Optional[requests.Session] = None
+download_session_pid: int = 0
+download_session_lock = Lock()
+DOWNLOAD_CONNECTION_POOL_SIZE: int = 8
+DOWNLOAD_CHUNK_SIZE: int = 64 * 1024
+DOWNLOAD_TIMEOUT: float = 30.
+
+# Maps telegram user ids to scientio node ids for all contexts of this process, see get_user_cache()
+user_cache: Optional[UserNodeCache] = None
+user_cache_lock = Lock()
+
+
+def create_bot(token: str, api_url: str, con_pool_size: int) -> Bot:
+    """
+    Create a bot with a pool of HTTP connections. If api_url is set, the bot connects to it
+    instead of the Telegram Bot API, e.g. to a FakeTelegramServer for load tests.
+    """
+    base_url, base_file_url = (f"{api_url}/bot", f"{api_url}/file/bot") if api_url else (None, None)
+    return Bot(token, base_url=base_url, base_file_url=base_file_url, request=Request(con_pool_size=con_pool_size))
 
 
+def get_sender(token: str, api_url: str = "") -> TelegramSender:
+    """
+    Retrieve the sender for outgoing telegram messages. It is created on first use,
+    and keeps one bot with pooled HTTP connections for the lifetime of the process.
+    """
+    global sender
+    with sender_lock:
+        if sender is None:
+            sender = TelegramSender(create_bot(token, api_url, SENDER_CONNECTION_POOL_SIZE))
+        return sender
+
+
+def get_user_cache(max_size: int, path: str = "") -> UserNodeCache:
+    """
+    Retrieve the cache of telegram user nodes, which is shared by all contexts of this process.
+    It is created on first use. If path is set, the cache is also shared with other processes.
+    """
+    global user_cache
+    with user_cache_lock:
+        if user_cache is None:
+            user_cache = UserNodeCache(max_size=max_size, path=path)
+        return user_cache
+
+
+def download_photo(url: str) -> Optional[bytes]:
+    """
+    Download a photo into memory, streaming it in chunks over a pooled HTTP connection.
+    The session is created on first use in every process, since forked processes
+    must not share the connections of their parent.
+    """
+    global download_session, download_session_pid
+    with download_session_lock:
+        if download_session is None or download_session_pid != os.getpid():
+            download_session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=DOWNLOAD_CONNECTION_POOL_SIZE)
+            download_session.mount("http://", adapter)
+            download_session.mount("https://", adapter)
+            download_session_pid = os.getpid()
+        session = download_session
+    try:
+        with session.get(url, stream=True, timeout=DOWNLOAD_TIMEOUT) as response:
+            response.raise_for_status()
+            # joining the chunks yields bytes, which BytesIO can decode without another copy
+            return b"".join(response.iter_content(DOWNLOAD_CHUNK_SIZE))
+    except requests.RequestException as e:
+        logger.error(f"Failed to download photo: {e}")
+        return None
+
 
 @rs.state(cond=rs.sig_startup)
 def telegram_run(ctx: rs.ContextWrapper):
@@ -72,11 +402,11 @@ def telegram_run(ctx: rs.ContextWrapper):
         ctx[rawio.prop_in] = message_text
 
     @rs.receptor(ctx_wrap=ctx, write=rawio.prop_pic_in)
-    def photo_receptor(ctx: rs.ContextWrapper, photo_path):
+    def photo_receptor(ctx: rs.ContextWrapper, photo: bytes):
         """
-        Handles photo messages, write to rawio:pic_in
+        Handles photo messages, write the encoded photo to rawio:pic_in
         """
-        ctx[rawio.prop_pic_in] = photo_path
+        ctx[rawio.prop_pic_in] = photo
 
     @rs.receptor(ctx_wrap=ctx, write=interloc.prop_all)
     def push_telegram_interloc(ctx: rs.ContextWrapper, telegram_node: Node, name: str):
@@ -86,104 +416,171 @@ def telegram_run(ctx: rs.ContextWrapper):
         if ctx.push(parent_property_or_path=interloc.prop_all, child=rs.Property(name=name, default_value=telegram_node)):
             logger.debug(f"Pushed {telegram_node} to interloc:all")
 
-    def make_sure_effective_user_exists(update: Update):
+    # Pipes to the chat worker processes, and the ring which assigns chats to them. Only used by the master process
+    workers: Dict[int, Connection] = dict()
+    workers_ring = ChatRing()
+    workers_send_lock = Lock()
+
+    # Users whose scientio node was pushed to interloc:all of this context, mapped to their chats.
+    #  Tracked per context, since a chat worker process hosts the contexts of many chats.
+    context_users: Dict[int, Set[int]] = dict()
+
+    def make_sure_effective_user_exists(message: ChatMessage):
         """
         Retrieves scientio Node of User if it exists, otherwise creates it in the scientio session
         Calls the push_telegram_interloc receptor to push the scientio node into interloc:all
-        Adds the User to the set of active_users and the chat to the set of active_chats
+        Adds the User to the users of this context and the chat to the set of active_chats
         """
-        active_chats[update.effective_chat.id] = (Timestamp(), None)
-        if update.effective_user.id in active_users:
-            active_users[update.effective_user.id].add(update.effective_chat.id)
+        if ctx.conf(key=ALL_IN_ONE_CONTEXT_CONFIG_KEY):
+            active_chats[message.chat_id] = (Timestamp(), None)
+        if message.user_id in context_users:
+            context_users[message.user_id].add(message.chat_id)
         else:
             # set up scientio
             if ontology.initialized.wait():
                 sess: Session = ontology.get_session()
                 onto: Ontology = ontology.get_ontology()
 
-                # create scientio Node of type TelegramPerson
-                query = Node(metatype=onto.get_type("TelegramPerson"))
-                prop_dict = {'telegram_id': update.effective_user.id}
-                if update.effective_user.username:
-                    prop_dict['name'] = update.effective_user.username
-                if update.effective_user.full_name:
-                    prop_dict['full_name'] = update.effective_user.full_name
-                query.set_properties(prop_dict)
-
-                node_list = sess.retrieve(query)
-                if not node_list:
-                    telegram_node = sess.create(query)
-                    logger.info(f"Created new Node in scientio session: {telegram_node}")
-                elif len(node_list) == 1:
-                    telegram_node = node_list[0]
-                else:
-                    logger.error(f'Found multiple TelegramPersons that matched query: {update.message.chat_id} '
-                                 f'in scientio session. Cannot push node to interloc:all!')
-                    return
+                cache = get_user_cache(ctx.conf(key=USER_CACHE_SIZE_CONFIG_KEY), ctx.conf(key=USER_CACHE_PATH_CONFIG_KEY))
+                # returning users are taken from the cache, unless their profile was updated
+                telegram_node = cache.get_node(message.user_id, message.username, message.full_name, sess)
+
+                if telegram_node is None:
+                    # create scientio Node of type TelegramPerson
+                    query = Node(metatype=onto.get_type("TelegramPerson"))
+                    prop_dict = {'telegram_id': message.user_id}
+                    if message.username:
+                        prop_dict['name'] = message.username
+                    if message.full_name:
+                        prop_dict['full_name'] = message.full_name
+                    query.set_properties(prop_dict)
+
+                    node_list = sess.retrieve(query)
+                    if not node_list:
+                        telegram_node = sess.create(query)
+                        logger.info(f"Created new Node in scientio session: {telegram_node}")
+                    elif len(node_list) == 1:
+                        telegram_node = node_list[0]
+                    else:
+                        logger.error(f'Found multiple TelegramPersons that matched query: {message.chat_id} '
+                                     f'in scientio session. Cannot push node to interloc:all!')
+                        return
+                    # nodes of the dummy session are not persistent
+                    if telegram_node and telegram_node.get_id() >= 0:
+                        cache.put(message.user_id, CachedUser(
+                            node_id=telegram_node.get_id(), username=message.username, full_name=message.full_name,
+                            node=telegram_node, retrieved_at=time.time()))
 
                 # push chat-Node
-                push_telegram_interloc(telegram_node, update.effective_chat.id)
-                active_users[update.effective_user.id] = {update.effective_chat.id}
+                push_telegram_interloc(telegram_node, message.chat_id)
+                context_users[message.user_id] = {message.chat_id}
 
-    def handle_text(bot: Bot, update: Update):
+    def handle_text(message: ChatMessage):
         """
         Handle incoming text messages
         """
-        make_sure_effective_user_exists(update)
-        text_receptor(update.effective_message.text)
+        make_sure_effective_user_exists(message)
+        text_receptor(message.text)
 
-    def handle_photo(bot: Bot, update: Update):
+    def handle_photo(message: ChatMessage):
         """
         Handle incoming photo messages.
         """
-        make_sure_effective_user_exists(update)
-        photo_index = 2  # Seems like a good size index. TODO: Make configurable
-        while photo_index >= len(update.effective_message.photo):
-            photo_index -= 1
-            if photo_index < 0:
-                logger.error("Telegram photo handler was called, but no photo received!")
-                return
-        file_descr = bot.get_file(update.effective_message.photo[photo_index].file_id)
-        photo = requests.get(file_descr.file_path)
-        file_path = mkstemp()[1]
-        with open(file_path, 'wb') as file:
-            file.write(photo.content)
-        photo_receptor(file_path)
+        make_sure_effective_user_exists(message)
+        photo = download_photo(message.photo_url)
+        if photo is not None:
+            photo_receptor(photo)
+
+    def handle_input(bot: Bot, update: Update):
+        """
+        Handle incoming messages if all chats share this context
+        """
+        message = chat_message_from_update(bot, update)
+        if not message:
+            return
+        if message.photo_url:
+            handle_photo(message)
+        else:
+            handle_text(message)
 
     def handle_input_multiprocess(bot: Bot, update: Update):
         """
         Handle incoming messages
         """
-        if update.effective_chat.id not in active_chats:
-            add_new_child_process(update.effective_chat.id)
-        # write (bot, update) to Pipe
-        active_chats[update.effective_chat.id][0].update()
-        logger.info(f"INPUT: {update.effective_message.text}")
-        active_chats[update.effective_chat.id][1].send((bot, update))
+        message = chat_message_from_update(bot, update)
+        if not message:
+            return
+        chat_id = message.chat_id
+        with active_chats_lock:
+            if chat_id not in active_chats:
+                if not add_chat_to_worker(chat_id):
+                    return
+            last_msg_timestamp, worker_conn = active_chats[chat_id]
+            last_msg_timestamp.update()
+            if message.user_id:
+                add_user_to_chat(message.user_id, chat_id)
+        # write the message to the Pipe of the chat's worker
+        logger.info(f"INPUT: {message.text}")
+        with workers_send_lock:
+            worker_conn.send_bytes(encode_chat_message(message))
         # send typing symbol
-        bot.send_chat_action(chat_id=update.effective_chat.id, action=ChatAction.TYPING)
+        bot.send_chat_action(chat_id=chat_id, action=ChatAction.TYPING)
 
-    def add_new_child_process(chat_id):
+    def add_chat_to_worker(chat_id) -> bool:
         """
-        Adds the chat of the incoming message to the set of active_chats
-        Creates new Ravestate Context in new Process for the new chat and
-        sets up a bidirectional Pipe for communication between Master and Child Processes
+        Adds the chat of the incoming message to the set of active_chats.
+        The chat is assigned to a chat worker by consistent hashing,
+        the worker will create a new Ravestate Context for the chat.
+        Must be called with the active_chats_lock.
         """
-        # start method has to be 'spawn'
-        mp_context = mp.get_context('spawn')
-        # Pipe to communicate between Master Process and all children
-        parent_conn, child_conn = mp.Pipe()
-        # create commandline args for child config file
-        args = []
-        child_config_paths_list = ctx.conf(key=CHILD_FILES_CONFIG_KEY)
-        for child_config_path in child_config_paths_list:
-            args += ['-f', child_config_path]
-        # set up new Process and override child_conn with the Pipe-Connection
-        p = mp_context.Process(target=rs.create_and_run_context,
-                               args=(*args,),
-                               kwargs={'runtime_overrides': [(MODULE_NAME, CHILD_CONN_CONFIG_KEY, child_conn)]})
-        p.start()
-        active_chats[chat_id] = (Timestamp(), parent_conn)
+        worker = workers_ring.get(chat_id)
+        if worker is None:
+            logger.error(f"No chat worker is available for chat {chat_id}!")
+            return False
+        active_chats[chat_id] = (Timestamp(), workers[worker])
+        heappush(chat_expiry_heap, (time.time() + chat_lifetime(), chat_id))
+        return True
+
+    def add_user_to_chat(user_id, chat_id):
+        """
+        Records that the user is involved in the chat, in active_users and it's reverse index.
+        Must be called with the active_chats_lock.
+        """
+        active_users.setdefault(user_id, set()).add(chat_id)
+        active_chat_users.setdefault(chat_id, set()).add(user_id)
+
+    def remove_chat(chat_id):
+        """
+        Removes the chat from active_chats, and the users from active_users
+        which are no longer part of any active chats. Must be called with the active_chats_lock.
+        """
+        active_chats.pop(chat_id, None)
+        for user_id in active_chat_users.pop(chat_id, ()):
+            chat_ids = active_users[user_id]
+            chat_ids.discard(chat_id)
+            if not chat_ids:
+                active_users.pop(user_id)
+
+    def chat_lifetime() -> float:
+        return ctx.conf(key=CHAT_LIFETIME) * 60  # conversion from minutes to seconds
+
+    def start_workers(spawner: rs.ContextSpawner, num_workers: int):
+        """
+        Forks the chat worker processes from the pre-warmed template process, and
+        sets up a bidirectional Pipe for communication between Master and each worker
+        """
+        for worker in range(num_workers):
+            parent_conn, child_conn = mp.Pipe()
+            # override child_conn with the Pipe-Connection
+            pid = spawner.spawn(runtime_overrides=[(MODULE_NAME, CHILD_CONN_CONFIG_KEY, child_conn)])
+            # the worker process owns it's end of the Pipe
+            child_conn.close()
+            if pid is None:
+                logger.error(f"Failed to start chat worker {worker}!")
+                parent_conn.close()
+                continue
+            workers[worker] = parent_conn
+            workers_ring.add(worker)
 
     def error(bot: Bot, update: Update, error: TelegramError):
         """
@@ -191,48 +588,69 @@ def telegram_run(ctx: rs.ContextWrapper):
         """
         logger.warning(f'Update {update.effective_message} caused error {error.message}')
 
-    def _manage_children(updater):
+    def _manage_children(telegram_sender: TelegramSender):
         """
-        Receive messages from children via Pipe and then send them to corresponding Telegram Chat.
+        Wait for messages from chat workers via Pipe and then send them to corresponding Telegram Chat.
         Remove chats when they get older than the chat lifetime.
-        :param updater: The Updater of the telegram-Bot
+        :param telegram_sender: The sender for outgoing telegram messages
         """
-        chat_lifetime = ctx.conf(key=CHAT_LIFETIME) * 60  # conversion from minutes to seconds
+        tick_interval = 1. / ctx.conf(mod=rs.CORE_MODULE_NAME, key=rs.TICK_RATE_CONFIG_KEY)
         while not ctx.shutting_down():
-            removable_chats = set()
-            removable_users = set()
-            # wait for children to write to Pipe and then send message to chat
-            tick_interval = 1. / ctx.conf(mod=rs.CORE_MODULE_NAME, key=rs.TICK_RATE_CONFIG_KEY)
-            time.sleep(tick_interval)
-            for chat_id, (last_msg_timestamp, parent_pipe) in active_chats.items():
-                if parent_pipe.poll():
-                    try:
-                        msg = parent_pipe.recv()
-                        if isinstance(msg, str):
+            # wait until a worker writes to it's Pipe or the next chat may expire,
+            #  but at most for one tick to check for shutdown
+            timeout = tick_interval
+            with active_chats_lock:
+                if chat_expiry_heap:
+                    timeout = min(timeout, max(.0, chat_expiry_heap[0][0] - time.time()))
+            worker_per_conn = {worker_conn: worker for worker, worker_conn in workers.items()}
+            for worker_conn in wait(list(worker_per_conn.keys()), timeout):
+                try:
+                    while worker_conn.poll():
+                        for chat_id, msg in decode_chat_replies(worker_conn.recv_bytes()):
                             logger.info(f"OUTPUT: {msg}")
-                            updater.bot.send_message(chat_id=chat_id, text=msg)
-                        else:
-                            logger.error(f'Tried sending non-str object as telegram message: {str(msg)}')
-                    except EOFError:
-                        # Child pipe was closed
-                        parent_pipe.close()
-                        removable_chats.add(chat_id)
-                        continue
-                # remove chat from active_chats if inactive for too long
-                if last_msg_timestamp.age() > chat_lifetime:
-                    parent_pipe.close()
-                    removable_chats.add(chat_id)
-
-            for chat_id in removable_chats:
-                active_chats.pop(chat_id)
-                for user_id, chat_ids in active_users.items():
-                    # remove chat from chats that the user is part of
-                    chat_ids.discard(chat_id)
-                    if len(chat_ids) == 0:
-                        # user is no longer part of any active chats
-                        removable_users.add(user_id)
-            for user_id in removable_users:
-                active_users.pop(user_id)
+                            telegram_sender.send(chat_id, msg)
+                except EOFError:
+                    # Worker pipe was closed, the worker's chats are moved to the remaining workers
+                    worker = worker_per_conn[worker_conn]
+                    logger.error(f"Chat worker {worker} was terminated!")
+                    worker_conn.close()
+                    workers.pop(worker)
+                    workers_ring.remove(worker)
+                    with active_chats_lock:
+                        for chat_id in [chat_id for chat_id, (_, chat_conn) in active_chats.items()
+                                        if chat_conn is worker_conn]:
+                            remove_chat(chat_id)
+            _remove_expired_chats()
+
+        # closing the pipes shuts the workers down
+        for worker_conn in workers.values():
+            worker_conn.close()
+
+    def _remove_expired_chats():
+        """
+        Remove chats from active_chats if inactive for too long, and tell their workers to remove them.
+        """
+        lifetime = chat_lifetime()
+        now = time.time()
+        with active_chats_lock:
+            while chat_expiry_heap and chat_expiry_heap[0][0] <= now:
+                _, chat_id = heappop(chat_expiry_heap)
+                if chat_id not in active_chats:
+                    # chat was already removed
+                    continue
+                last_msg_timestamp, worker_conn = active_chats[chat_id]
+                expiry = last_msg_timestamp.value + lifetime
+                if expiry > now:
+                    # chat received messages since the entry was pushed
+                    heappush(chat_expiry_heap, (expiry, chat_id))
+                    continue
+                try:
+                    with workers_send_lock:
+                        worker_conn.send_bytes(encode_chat_message(ChatMessage(chat_id), kind=CHAT_REMOVE))
+                except OSError:
+                    # worker was terminated, which is handled once it's Pipe is closed
+                    pass
+                remove_chat(chat_id)
 
     def _bootstrap_telegram_master():
         """
@@ -250,13 +668,22 @@ def telegram_run(ctx: rs.ContextWrapper):
             logger.error(f'{CHILD_FILES_CONFIG_KEY} is not set (correctly). Shutting down telegramio')
             return rs.Delete()
 
-        updater: Updater = Updater(token)
+        if not ctx.conf(key=ALL_IN_ONE_CONTEXT_CONFIG_KEY):
+            # create the template process, which loads the child config and modules once for all workers
+            args = []
+            for child_config_path in child_config_paths_list:
+                args += ['-f', child_config_path]
+            spawner = rs.ContextSpawner(*args, context_factory=create_chat_worker)
+            start_workers(spawner, ctx.conf(key=CHAT_WORKERS_CONFIG_KEY) or os.cpu_count())
+            spawner.shutdown()
+
+        # the updater needs connections for it's 4 dispatcher workers, polling and the job queue
+        updater: Updater = Updater(bot=create_bot(token, ctx.conf(key=API_URL_CONFIG_KEY), con_pool_size=8))
         # Get the dispatcher to register handlers
         dispatcher: Dispatcher = updater.dispatcher
         if ctx.conf(key=ALL_IN_ONE_CONTEXT_CONFIG_KEY):
             # handle noncommand-messages with the matching handler
-            dispatcher.add_handler(MessageHandler(Filters.text, handle_text))
-            dispatcher.add_handler(MessageHandler(Filters.photo, handle_photo))
+            dispatcher.add_handler(MessageHandler(Filters.text | Filters.photo, handle_input))
         else:
             dispatcher.add_handler(MessageHandler(Filters.text | Filters.photo, handle_input_multiprocess))
         # log all errors
@@ -265,7 +692,7 @@ def telegram_run(ctx: rs.ContextWrapper):
         updater.start_polling()  # non blocking
 
         if not ctx.conf(key=ALL_IN_ONE_CONTEXT_CONFIG_KEY):
-            _manage_children(updater)
+            _manage_children(get_sender(token, ctx.conf(key=API_URL_CONFIG_KEY)))
 
     def _bootstrap_telegram_child():
         """
@@ -274,18 +701,18 @@ def telegram_run(ctx: rs.ContextWrapper):
         """
         try:
             while not ctx.shutting_down():
-                # receive Bot,Update for telegram chat
-                bot, update = child_conn.recv()  # blocking
-                if update.effective_message.photo:
-                    handle_photo(bot, update)
-                elif update.effective_message.text:
-                    if update.effective_message.text.strip().lower() in verbaliser.get_phrase_list("farewells"):
-                        send_on_telegram(ctx, verbaliser.get_random_phrase("farewells"))
+                # receive ChatMessage for telegram chat
+                message = child_conn.recv()  # blocking
+                if message.photo_url:
+                    handle_photo(message)
+                elif message.text:
+                    if message.text.strip().lower() in verbaliser.get_phrase_list("farewells"):
+                        send_on_telegram(ctx, verbaliser.get_random_phrase("farewells", ctx=ctx))
                         logger.info("Shutting down child process")
                         ctx.shutdown()
-                    handle_text(bot, update)
+                    handle_text(message)
                 else:
-                    logger.error(f"{MODULE_NAME} received an update it cannot handle.")
+                    logger.error(f"{MODULE_NAME} received a message it cannot handle.")
         except EOFError:
             # Pipe was closed -> Parent was killed or parent has closed the pipe
             logger.info("Pipe was closed, therefore the telegram-child will shut down.")
@@ -308,14 +735,14 @@ def send_on_telegram(ctx: rs.ContextWrapper, text: str):
         return rs.Resign()
 
     if ctx.conf(key=ALL_IN_ONE_CONTEXT_CONFIG_KEY):
-        # TODO don't instantiate the updater every time
         token = ctx.conf(key=TOKEN_CONFIG_KEY)
         if not token:
             logger.error('telegram-token is not set. Shutting down telegramio')
             return rs.Delete()
-        updater: Updater = Updater(token)
-        for chat_id in active_chats.keys():
-            updater.bot.send_message(chat_id=chat_id, text=text)
+        # messages are sent in the background, such that the state does not block on the network
+        telegram_sender = get_sender(token, ctx.conf(key=API_URL_CONFIG_KEY))
+        for chat_id in list(active_chats.keys()):
+            telegram_sender.send(chat_id, text)
     else:
         child_conn = ctx.conf(key=CHILD_CONN_CONFIG_KEY)
         if child_conn:
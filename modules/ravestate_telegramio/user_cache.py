@@ -0,0 +1,182 @@
+import os
+import time
+import sqlite3
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Optional, NamedTuple, Any
+
+from reggol import get_logger
+logger = get_logger(__name__)
+
+
+class CachedUser(NamedTuple):
+    # Id of the TelegramPerson node in the scientio session
+    node_id: int
+    # Telegram profile which the node was retrieved or created for
+    username: str = ""
+    full_name: str = ""
+    # The scientio node itself, which is only kept in memory
+    node: Any = None
+    # time.time() at which the node was retrieved or created
+    retrieved_at: float = .0
+
+
+class UserNodeCache:
+    """
+    Bounded LRU cache which maps telegram user ids to their scientio nodes, such that
+    the nodes of returning users do not need to be retrieved from the scientio session.
+    Nodes which are older than `max_node_age` seconds are refreshed in the background.
+
+    If a path is given, entries are also kept in an sqlite file at that path, which is
+    shared by all processes that use the same path (e.g. the chat workers), and survives
+    the expiry of chats and restarts of the bot.
+    """
+
+    def __init__(self, max_size: int = 1024, path: str = "", max_node_age: float = 60.):
+        self._max_size = max(max_size, 1)
+        self._max_node_age = max_node_age
+        self._refresh_executor: Optional[ThreadPoolExecutor] = None
+        self._refresh_executor_pid = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = Lock()
+        self._path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_pid = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: int) -> Optional[CachedUser]:
+        """
+        Retrieve the cached node of a telegram user, or None if the user is not cached.
+        """
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None:
+                self._entries.move_to_end(user_id)
+            else:
+                entry = self._disk_get(user_id)
+                if entry is not None:
+                    self._memory_put(user_id, entry)
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return entry
+
+    def get_node(self, user_id: int, username: str, full_name: str, sess) -> Optional[Any]:
+        """
+        Retrieve the scientio node of a returning telegram user. Nodes in memory are returned
+        without querying the session. Users which are only cached on disk are retrieved by node id.
+        Returns None and invalidates the user if they are not cached anymore, or their profile changed.
+        """
+        cached = self.get(user_id)
+        if cached is None:
+            return None
+        if (cached.username, cached.full_name) != (username, full_name):
+            self.invalidate(user_id)
+            return None
+        if cached.node is None:
+            node = self._retrieve(sess, cached.node_id)
+            if node is None:
+                self.invalidate(user_id)
+                return None
+            with self._lock:
+                self._memory_put(user_id, cached._replace(node=node, retrieved_at=time.time()))
+            return node
+        if time.time() - cached.retrieved_at > self._max_node_age:
+            # Refresh the node once, e.g. to pick up relationships which were added by other processes
+            with self._lock:
+                self._memory_put(user_id, cached._replace(retrieved_at=time.time()))
+            self._refresher().submit(self._refresh, user_id, cached.node_id, sess)
+        return cached.node
+
+    def put(self, user_id: int, entry: CachedUser):
+        """
+        Cache the node of a telegram user, after it was retrieved or created.
+        """
+        with self._lock:
+            self._memory_put(user_id, entry)
+            self._disk_execute(
+                "insert or replace into users (user_id, node_id, username, full_name) values (?, ?, ?, ?)",
+                (user_id, entry.node_id, entry.username, entry.full_name))
+
+    def invalidate(self, user_id: int):
+        """
+        Remove a telegram user from the cache, e.g. because their profile or node changed.
+        """
+        with self._lock:
+            self._entries.pop(user_id, None)
+            self._disk_execute("delete from users where user_id = ?", (user_id,))
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def _memory_put(self, user_id: int, entry: CachedUser):
+        self._entries[user_id] = entry
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    def _retrieve(self, sess, node_id: int) -> Optional[Any]:
+        node_list = sess.retrieve(node_id=node_id)
+        return node_list[0] if node_list else None
+
+    def _refresh(self, user_id: int, node_id: int, sess):
+        node = self._retrieve(sess, node_id)
+        with self._lock:
+            cached = self._entries.get(user_id)
+            if cached is None or cached.node_id != node_id:
+                return
+            if node is None:
+                self._entries.pop(user_id)
+            else:
+                self._entries[user_id] = cached._replace(node=node, retrieved_at=time.time())
+
+    def _refresher(self) -> ThreadPoolExecutor:
+        # threads do not survive a fork
+        with self._lock:
+            if self._refresh_executor_pid != os.getpid():
+                self._refresh_executor_pid = os.getpid()
+                self._refresh_executor = ThreadPoolExecutor(max_workers=1)
+            return self._refresh_executor
+
+    def _disk(self) -> Optional[sqlite3.Connection]:
+        # sqlite connections must not be shared with forked processes
+        if self._path and self._conn_pid != os.getpid():
+            self._conn_pid = os.getpid()
+            try:
+                self._conn = sqlite3.connect(self._path, timeout=5., check_same_thread=False)
+                self._conn.execute("""
+                create table if not exists users (
+                    user_id integer primary key, node_id integer, username text, full_name text
+                )
+                """)
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.error(f"Failed to open user cache at {self._path}: {e}")
+                self._conn = None
+        return self._conn
+
+    def _disk_get(self, user_id: int) -> Optional[CachedUser]:
+        conn = self._disk()
+        if conn is None:
+            return None
+        try:
+            row = conn.execute(
+                "select node_id, username, full_name from users where user_id = ?", (user_id,)).fetchone()
+        except sqlite3.Error as e:
+            logger.error(f"Failed to read user cache: {e}")
+            return None
+        return CachedUser(*row) if row else None
+
+    def _disk_execute(self, statement: str, parameters: tuple):
+        conn = self._disk()
+        if conn is None:
+            return
+        try:
+            conn.execute(statement, parameters)
+            conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Failed to write user cache: {e}")
@@ -31,4 +31,4 @@ class UIContext(Context):
 
     def _state_activated(self, act: Activation):
         service.activate(act.state_to_activate.name)
-        self._activations_per_state[act.state_to_activate].discard(act)
+        super()._state_activated(act)
@@ -22,7 +22,7 @@ with rs.Module(name="verbaliser", depends=(rawio.mod,)) as mod:
         writes a random phrase for that intent to rawio:out
         """
         intent = ctx[prop_intent.changed()]
-        phrase = verbaliser.get_random_phrase(intent)
+        phrase = verbaliser.get_random_phrase(intent, ctx=ctx)
         if phrase:
             ctx[rawio.prop_out] = phrase
         else:
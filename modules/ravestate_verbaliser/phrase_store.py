@@ -0,0 +1,146 @@
+import os
+import pickle
+import hashlib
+from typing import List, Tuple, Any, Optional, Callable
+
+import yaml
+
+from ravestate_verbaliser.qa_phrases import QAPhrases
+from reggol import get_logger
+logger = get_logger(__name__)
+
+"""
+Compiles phrase files (YAML) into pickled files, such that processes which add the same
+phrase files do not parse the YAML again. The sections of a file are only unpickled
+when their intent is first used.
+"""
+
+TYPE_PHRASES: str = "phrases"
+TYPE_QA: str = "qa"
+
+# Version of the compiled file format. Compiled files of other versions are ignored.
+FORMAT_VERSION: int = 1
+
+# Directory of the compiled phrase files. If empty, phrase files are parsed every time they are added.
+#  The compiled files are unpickled, so this must not be a shared or world-writable directory.
+cache_dir: str = os.environ.get(
+    "RAVESTATE_PHRASE_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "ravestate", "phrases"))
+
+# Sections of a phrase file: (type, name, pickled section data)
+Sections = List[Tuple[str, str, bytes]]
+
+
+class CompiledSection:
+    """
+    A pickled section of a phrase file, see CompiledSections.
+    """
+
+    __slots__ = ("data",)
+
+    def __init__(self, data: bytes):
+        self.data = data
+
+
+class CompiledSections(dict):
+    """
+    Dictionary of the sections of phrase files by intent, which unpickles
+     a section (and converts it with the factory) when it's intent is first read.
+    """
+
+    def __init__(self, factory: Optional[Callable[[Any], Any]] = None):
+        super().__init__()
+        self._factory = factory
+
+    def __getitem__(self, intent: str):
+        value = super().__getitem__(intent)
+        if isinstance(value, CompiledSection):
+            value = pickle.loads(value.data)
+            if self._factory:
+                value = self._factory(value)
+            super().__setitem__(intent, value)
+        return value
+
+    def get(self, intent: str, default=None):
+        return self[intent] if intent in self else default
+
+
+def compile_sections(content: bytes) -> Sections:
+    """
+    Parse the content of a phrase file into it's sections.
+
+    * `content`: The YAML documents of the phrase file.
+
+    **Returns:** The sections as (type, name, pickled data), where the data is the list of
+     phrases for phrases-sections, and the whole section otherwise. Raises KeyError if
+     a section has no type or name, or a phrases-section has no phrases, and AttributeError
+     if a qa-section is malformed (see QAPhrases).
+    """
+    sections = []
+    for entry in yaml.safe_load_all(content):
+        data = entry['opts'] if entry['type'] == TYPE_PHRASES else entry
+        if entry['type'] == TYPE_QA:
+            # fails like when the file is parsed without compiling
+            QAPhrases(entry)
+        sections.append((entry['type'], str(entry['name']), pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)))
+    return sections
+
+
+def load_sections(path: str, compiled_dir: str = "") -> Sections:
+    """
+    Load the sections of a phrase file. If a directory for compiled files is given, they are
+     read from the compiled file if it is up to date, and the file is compiled otherwise.
+     A compiled file is up to date if the phrase file has the same modification time
+     and size, or the same content, as when it was compiled.
+
+    * `path`: Path of the phrase file.
+
+    * `compiled_dir`: Directory of the compiled files, e.g. `cache_dir`.
+
+    **Returns:** The sections of the file, see `compile_sections()`.
+     Raises FileNotFoundError if the file does not exist.
+    """
+    stat = os.stat(path)
+    if not compiled_dir:
+        with open(path, 'rb') as input_file:
+            return compile_sections(input_file.read())
+
+    compiled_path = os.path.join(
+        compiled_dir, hashlib.sha1(os.path.realpath(path).encode()).hexdigest() + ".pickle")
+    compiled = _read_compiled(compiled_path)
+    if compiled and compiled[0] == (stat.st_mtime_ns, stat.st_size):
+        return compiled[2]
+
+    with open(path, 'rb') as input_file:
+        content = input_file.read()
+    digest = hashlib.sha256(content).hexdigest()
+    if compiled and compiled[1] == digest:
+        # e.g. the file was checked out again, so only the modification time changed
+        sections = compiled[2]
+    else:
+        sections = compile_sections(content)
+    _write_compiled(compiled_path, ((stat.st_mtime_ns, stat.st_size), digest, sections))
+    return sections
+
+
+def _read_compiled(compiled_path: str) -> Optional[Tuple[Tuple[int, int], str, Sections]]:
+    try:
+        with open(compiled_path, 'rb') as compiled_file:
+            version, compiled = pickle.load(compiled_file)
+        return compiled if version == FORMAT_VERSION else None
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Ignoring compiled phrase file {compiled_path}: {e}")
+        return None
+
+
+def _write_compiled(compiled_path: str, compiled: Tuple[Tuple[int, int], str, Sections]):
+    # Written to a temporary file first, such that concurrent readers never see a partial file
+    tmp_path = f"{compiled_path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(compiled_path), exist_ok=True)
+        with open(tmp_path, 'wb') as compiled_file:
+            pickle.dump((FORMAT_VERSION, compiled), compiled_file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, compiled_path)
+    except OSError as e:
+        logger.warning(f"Failed to write compiled phrase file {compiled_path}: {e}")
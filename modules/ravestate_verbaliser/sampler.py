@@ -0,0 +1,73 @@
+import random
+from collections import OrderedDict
+from threading import Lock
+from typing import Optional, Sequence, Any, Hashable, List
+
+
+class _Bag:
+    """
+    Indices of the phrases of one intent, whose first `remaining` entries were not drawn yet.
+    """
+
+    __slots__ = ("indices", "remaining")
+
+    def __init__(self, size: int):
+        self.indices: List[int] = list(range(size))
+        self.remaining = size
+
+
+class PhraseSampler:
+    """
+    Draws phrases without replacement: Every phrase of an intent is handed out once,
+     in random order, before any phrase is repeated, and the last phrase of a round
+     is never the first one of the next round. A draw takes constant time, since it
+     swaps a random remaining phrase to the end of the bag (Fisher-Yates), and a new
+     round reuses the bag without shuffling it.
+
+    Bags are kept for the `max_intents` most recently used intents. Each context has
+     it's own sampler, see `get_sampler()`.
+
+    _Example:_
+    ```python
+    sampler = PhraseSampler()
+    sampler.sample("greeting", ["hi", "hello", "hey"])  # e.g. "hello"
+    sampler.sample("greeting", ["hi", "hello", "hey"])  # "hi" or "hey"
+    ```
+    """
+
+    def __init__(self, max_intents: int = 256):
+        self._max_intents = max(max_intents, 1)
+        self._bags: OrderedDict = OrderedDict()
+        self._lock = Lock()
+
+    def sample(self, intent: Hashable, options: Optional[Sequence[Any]]) -> Optional[Any]:
+        """
+        Draw one of the options for an intent.
+
+        * `intent`: Key of the bag to draw from, e.g. the intent of the phrases.
+
+        * `options`: The phrases of the intent. If their number changes, a new round starts.
+
+        **Returns:** The drawn option, or the options themselves if there are none (e.g. None).
+        """
+        if not options:
+            return options
+        with self._lock:
+            bag = self._bags.get(intent)
+            if bag is None or len(bag.indices) != len(options):
+                bag = _Bag(len(options))
+                self._bags[intent] = bag
+                while len(self._bags) > self._max_intents:
+                    self._bags.popitem(last=False)
+            else:
+                self._bags.move_to_end(intent)
+            if bag.remaining == 0:
+                # The last round ended with indices[0], which must not start the new one
+                bag.remaining = len(options)
+                i = random.randrange(1, bag.remaining) if bag.remaining > 1 else 0
+            else:
+                i = random.randrange(bag.remaining)
+            bag.remaining -= 1
+            indices = bag.indices
+            indices[i], indices[bag.remaining] = indices[bag.remaining], indices[i]
+            return options[indices[bag.remaining]]
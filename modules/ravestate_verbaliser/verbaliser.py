@@ -1,9 +1,16 @@
 import os
 import random
-import yaml
-from typing import Dict, List, Optional
+from threading import Lock
+from typing import Dict, List, Optional, Union
+from weakref import WeakKeyDictionary
+
+from ravestate.icontext import IContext
+from ravestate.wrappers import ContextWrapper
 
 from ravestate_verbaliser.qa_phrases import QAPhrases
+from ravestate_verbaliser import phrase_store
+from ravestate_verbaliser.phrase_store import CompiledSection, CompiledSections, TYPE_PHRASES, TYPE_QA
+from ravestate_verbaliser.sampler import PhraseSampler
 from reggol import get_logger
 logger = get_logger(__name__)
 
@@ -12,10 +19,15 @@ Produces actual utterances. This should in the future lead to diversifying
 the ways Roboy is expressing information.
 """
 
-TYPE_PHRASES: str = "phrases"
-TYPE_QA: str = "qa"
-phrases: Dict[str, List[str]] = dict()
-qa: Dict[str, QAPhrases] = dict()
+# Sections are unpickled when their intent is first used, see phrase_store
+phrases: Dict[str, List[str]] = CompiledSections()
+qa: Dict[str, QAPhrases] = CompiledSections(factory=QAPhrases)
+
+# Sampler for phrases which are not drawn for a context, see get_sampler()
+default_sampler = PhraseSampler()
+# Sampler of each context, such that the sessions of a process do not repeat each other's phrases
+sampler_per_context: 'WeakKeyDictionary[IContext, PhraseSampler]' = WeakKeyDictionary()
+sampler_lock = Lock()
 
 
 def add_folder(dirpath: str):
@@ -34,7 +46,9 @@ def add_folder(dirpath: str):
 
 def add_file(path: str):
     """
-    Parse the file and add the contents to the current phrases- and qa-dicts
+    Parse the file and add the contents to the current phrases- and qa-dicts.
+    The parsed file is compiled into phrase_store.cache_dir, such that it is
+    not parsed again until it changes.
 
 
     * `path`: Path to the file that should be added
@@ -42,28 +56,26 @@ def add_file(path: str):
     **Returns:** True if the file was successfully added, False if there was an error while adding the file
     """
     try:
-        with open(path, 'r') as input_file:
-            file_data = list(yaml.safe_load_all(input_file))
-
-        for entry in file_data:
-            if entry['type'] == TYPE_PHRASES:
-                if str(entry['name']) in phrases:
-                    logger.error('Import of section ' + str(entry['name']) + ' in ' + path +
-                                  ' would overwrite phrases-list entry ' + str(entry['name']))
-                phrases[str(entry['name'])] = entry['opts']
-            elif entry['type'] == TYPE_QA:
-                if str(entry['name']) in qa:
-                    logger.error('Import of section ' + str(entry['name']) + ' in ' + path +
-                                  ' would overwrite qa-list entry ' + str(entry['name']))
-                qa[str(entry['name'])] = QAPhrases(entry)
-            else:
-                logger.error('Unknown type given for section ' + str(entry['name']) + ' in ' + path)
-
-        return True
+        sections = phrase_store.load_sections(path, phrase_store.cache_dir)
     except (FileNotFoundError, KeyError):
         logger.error('Cannot add file ' + path + ' because it does not exist or is in the wrong format.')
         return False
 
+    for entry_type, name, data in sections:
+        if entry_type == TYPE_PHRASES:
+            if name in phrases:
+                logger.error('Import of section ' + name + ' in ' + path +
+                             ' would overwrite phrases-list entry ' + name)
+            phrases[name] = CompiledSection(data)
+        elif entry_type == TYPE_QA:
+            if name in qa:
+                logger.error('Import of section ' + name + ' in ' + path +
+                             ' would overwrite qa-list entry ' + name)
+            qa[name] = CompiledSection(data)
+        else:
+            logger.error('Unknown type given for section ' + name + ' in ' + path)
+    return True
+
 
 def random_or_none(list_or_none: Optional) -> Optional:
     """
@@ -77,6 +89,28 @@ def random_or_none(list_or_none: Optional) -> Optional:
     return random.choice(list_or_none) if list_or_none else list_or_none
 
 
+def get_sampler(ctx: Union[IContext, ContextWrapper, None] = None) -> PhraseSampler:
+    """
+    Get the sampler which draws random phrases for a context without repetitions.
+
+
+    * `ctx`: The context, or the context wrapper of a state. For anything else
+        (e.g. None or a dict in unit tests), the sampler of the process is returned.
+
+    **Returns:** The sampler of the context, which is created on first use
+    """
+    if isinstance(ctx, ContextWrapper):
+        ctx = ctx.ctx
+    if not isinstance(ctx, IContext):
+        return default_sampler
+    with sampler_lock:
+        sampler = sampler_per_context.get(ctx)
+        if sampler is None:
+            sampler = PhraseSampler()
+            sampler_per_context[ctx] = sampler
+        return sampler
+
+
 def get_phrase_list(intent: str) -> List[str]:
     """
     Get all imported phrases for this intent as a list
@@ -89,16 +123,19 @@ def get_phrase_list(intent: str) -> List[str]:
     return phrases.get(intent)
 
 
-def get_random_phrase(intent: str) -> str:
+def get_random_phrase(intent: str, ctx: Union[IContext, ContextWrapper, None] = None) -> str:
     """
     Get a random phrase for this intent
 
 
     * `intent`: name-parameter of the yml-section with which the phrases were imported
 
+    * `ctx`: The context or context wrapper, whose phrases are not repeated
+        before all others were drawn, see get_sampler()
+
     **Returns:** None if no phrases are known for this intent, otherwise a random element of the phrases for this intent
     """
-    return random_or_none(phrases.get(intent))
+    return get_sampler(ctx).sample((TYPE_PHRASES, intent), phrases.get(intent))
 
 
 def get_question_list(intent: str) -> List[str]:
@@ -113,16 +150,19 @@ def get_question_list(intent: str) -> List[str]:
     return None if not qa.get(intent) else qa.get(intent).questions
 
 
-def get_random_question(intent: str) -> str:
+def get_random_question(intent: str, ctx: Union[IContext, ContextWrapper, None] = None) -> str:
     """
     Get a random question for this intent
 
 
     * `intent`: name-parameter of the yml-section with which the questions were imported
 
+    * `ctx`: The context or context wrapper, whose questions are not repeated
+        before all others were drawn, see get_sampler()
+
     **Returns:** None if no questions are known for this intent, otherwise a random element of the questions for this intent
     """
-    return random_or_none(get_question_list(intent))
+    return get_sampler(ctx).sample(('questions', intent), get_question_list(intent))
 
 
 def get_successful_answer_list(intent: str) -> List[str]:
@@ -137,17 +177,20 @@ def get_successful_answer_list(intent: str) -> List[str]:
     return None if not qa.get(intent) else qa.get(intent).successful_answers
 
 
-def get_random_successful_answer(intent: str) -> str:
+def get_random_successful_answer(intent: str, ctx: Union[IContext, ContextWrapper, None] = None) -> str:
     """
     Get a random successful answer for this intent
 
 
     * `intent`: name-parameter of the yml-section with which the successful answers were imported
 
+    * `ctx`: The context or context wrapper, whose successful answers are not repeated
+        before all others were drawn, see get_sampler()
+
     **Returns:** None if no successful answers are known for this intent,
         otherwise a random element of the successful answers for this intent
     """
-    return random_or_none(get_successful_answer_list(intent))
+    return get_sampler(ctx).sample(('successful_answers', intent), get_successful_answer_list(intent))
 
 
 def get_failure_answer_list(intent: str) -> List[str]:
@@ -162,17 +205,20 @@ def get_failure_answer_list(intent: str) -> List[str]:
     return None if not qa.get(intent) else qa.get(intent).failure_answers
 
 
-def get_random_failure_answer(intent: str) -> str:
+def get_random_failure_answer(intent: str, ctx: Union[IContext, ContextWrapper, None] = None) -> str:
     """
     Get a random failure answer for this intent
 
 
     * `intent`: name-parameter of the yml-section with which the failure answers were imported
 
+    * `ctx`: The context or context wrapper, whose failure answers are not repeated
+        before all others were drawn, see get_sampler()
+
     **Returns:** None if no failure answers are known for this intent,
         otherwise a random element of the failure answers for this intent
     """
-    return random_or_none(get_failure_answer_list(intent))
+    return get_sampler(ctx).sample(('failure_answers', intent), get_failure_answer_list(intent))
 
 
 def get_followup_question_list(intent: str) -> List[str]:
@@ -187,17 +233,20 @@ def get_followup_question_list(intent: str) -> List[str]:
     return None if not qa.get(intent) else qa.get(intent).followup_questions
 
 
-def get_random_followup_question(intent: str) -> str:
+def get_random_followup_question(intent: str, ctx: Union[IContext, ContextWrapper, None] = None) -> str:
     """
     Get a random followup question for this intent
 
 
     * `intent`: name-parameter of the yml-section with which the followup questions were imported
 
+    * `ctx`: The context or context wrapper, whose followup questions are not repeated
+        before all others were drawn, see get_sampler()
+
     **Returns:** None if no followup questions are known for this intent, 
         otherwise a random element of the followup questions for this intent
     """
-    return random_or_none(get_followup_question_list(intent))
+    return get_sampler(ctx).sample(('followup_questions', intent), get_followup_question_list(intent))
 
 
 def get_followup_answer_list(intent: str) -> List[str]:
@@ -212,14 +261,17 @@ def get_followup_answer_list(intent: str) -> List[str]:
     return None if not qa.get(intent) else qa.get(intent).followup_answers
 
 
-def get_random_followup_answer(intent: str) -> str:
+def get_random_followup_answer(intent: str, ctx: Union[IContext, ContextWrapper, None] = None) -> str:
     """
     Get a random followup answer for this intent
 
 
     * `intent`: name-parameter of the yml-section with which the followup answers were imported
 
+    * `ctx`: The context or context wrapper, whose followup answers are not repeated
+        before all others were drawn, see get_sampler()
+
     **Returns:** None if no followup answers are known for this intent,
         otherwise a random element of the followup answers for this intent
     """
-    return random_or_none(get_followup_answer_list(intent))
+    return get_sampler(ctx).sample(('followup_answers', intent), get_followup_answer_list(intent))
@@ -0,0 +1,12 @@
+import os
+from tempfile import TemporaryDirectory
+
+# Phrase files which are added while the tests are collected and run are compiled into
+#  a temporary directory, instead of the user's cache (see ravestate_verbaliser.phrase_store).
+#  The variable is set on import, since modules add their phrase files when they are imported.
+phrase_cache = TemporaryDirectory(prefix="ravestate-test-phrases-")
+os.environ["RAVESTATE_PHRASE_CACHE"] = phrase_cache.name
+
+
+def pytest_unconfigure(config):
+    phrase_cache.cleanup()
@@ -67,6 +67,17 @@ def test_remove_state_with_signal(context_with_property_fixture: Context, state_
     assert state_signal_a_fixture.signal not in context_with_property_fixture._needy_acts_per_state_per_signal
 
 
+def test_consumers(context_with_property_fixture: Context, state_signal_a_fixture: State, state_signal_b_fixture: State):
+    context_with_property_fixture.add_state(st=state_signal_a_fixture)
+    assert context_with_property_fixture.consumers(DEFAULT_PROPERTY) == {state_signal_a_fixture}
+    assert context_with_property_fixture.consumers(state_signal_a_fixture.signal) == set()
+    # the cached consumers are discarded when states are added or removed
+    context_with_property_fixture.add_state(st=state_signal_b_fixture)
+    assert context_with_property_fixture.consumers(state_signal_a_fixture.signal) == {state_signal_b_fixture}
+    context_with_property_fixture.rm_state(st=state_signal_b_fixture)
+    assert context_with_property_fixture.consumers(state_signal_a_fixture.signal) == set()
+
+
 def test_add_state(
         context_with_property_fixture: Context,
         state_fixture: State,
@@ -156,6 +167,16 @@ def test_add_state_configurable_age_not_in_config(context_with_property_fixture:
     assert my_cond.max_age_value == 5.
 
 
+def test_preload_modules(context_fixture: Context):
+    loaded = []
+    with Module(name="preloaded", preload=lambda: loaded.append(True)) as mod:
+        pass
+    context_fixture._add_ravestate_module(mod)
+    assert not loaded
+    context_fixture.preload_modules()
+    assert loaded == [True]
+
+
 def test_add_state_unknown_property(context_fixture: Context, state_fixture: State):
     with LogCapture(attributes=strip_prefix) as log_capture:
         context_fixture.add_state(st=state_fixture)
@@ -47,3 +47,64 @@ def test_run_with_pressure():
 
     ctx.run_once()
     assert specific_state.wait()
+
+
+def test_core_counters():
+
+    with Module(name=DEFAULT_MODULE_NAME):
+
+        a = Signal("a")
+        b = Signal("b")
+
+        @state(cond=a & b)
+        def waiting_state(ctx):
+            pass
+
+    ctx = Context(DEFAULT_MODULE_NAME)
+    assert ctx._num_active_acts == 0
+
+    # Partially fulfilled activation must raise core:activity
+    ctx.emit(a)
+    ctx.run_once()
+    assert ctx._num_active_acts == 1
+    assert ctx.test()
+    assert prop_activity.read()
+
+    # Activation runs and is untracked, which lowers core:activity again
+    ctx.emit(b)
+    ctx.run_once()
+    assert waiting_state.wait()
+    ctx.run_once()
+    assert ctx._num_active_acts == 0
+    assert ctx._num_pressured_acts == 0
+    assert ctx.test()
+    assert not prop_activity.read()
+
+
+def test_compress_unspiky_activations():
+
+    with Module(name=DEFAULT_MODULE_NAME):
+
+        a = Signal("a")
+        b = Signal("b")
+
+        @state(cond=a & b)
+        def waiting_state(ctx):
+            pass
+
+    ctx = Context(DEFAULT_MODULE_NAME)
+    catch_all = ctx._catch_all_act_per_state[waiting_state]
+
+    # The catch-all activation acquires a spike, a new catch-all is created
+    ctx.emit(a)
+    ctx.run_once()
+    assert len(ctx._state_activations(st=waiting_state)) == 2
+    assert ctx._catch_all_act_per_state[waiting_state] is not catch_all
+
+    # The partially fulfilled activation loses it's spike and becomes redundant
+    ctx.wipe(a)
+    assert catch_all in ctx._unspiky_acts
+    ctx.run_once()
+    assert ctx._state_activations(st=waiting_state) == {ctx._catch_all_act_per_state[waiting_state]}
+    assert catch_all not in ctx._needy_acts_per_state_per_signal[a][waiting_state]
+    assert ctx.test()
@@ -0,0 +1,79 @@
+from ravestate.testfixtures import *
+from ravestate.host import ContextHost
+
+
+def test_isolated_sessions():
+
+    with Module(name=DEFAULT_MODULE_NAME, config={"greeting": "hi"}):
+
+        prop = Property(name=DEFAULT_PROPERTY_NAME, default_value="")
+
+        @state(cond=sig_startup, write=prop)
+        def greet(ctx):
+            ctx[prop] = ctx.conf(key="greeting")
+
+    host = ContextHost(DEFAULT_MODULE_NAME)
+    first = host.add_session(1)
+    second = host.add_session(2, runtime_overrides=[(DEFAULT_MODULE_NAME, "greeting", "servus")])
+    assert host.add_session(1) is None
+    assert host.session_ids() == [1, 2]
+
+    host.run_once()
+    assert greet.wait()
+    assert greet.wait()
+
+    # Every session has it's own copy of the property, the template is untouched
+    assert first[prop.id()] is not prop
+    assert first[prop.id()].read() == "hi"
+    assert second[prop.id()].read() == "servus"
+    assert prop.read() == ""
+
+    # States and completed constraints are shared, activations are not
+    assert first._activations_per_state.keys() == second._activations_per_state.keys()
+    assert not first._state_activations() & second._state_activations()
+
+    host.remove_session(1)
+    assert host.session(1) is None
+    assert first.shutting_down()
+    host.shutdown()
+    assert host.session_ids() == []
+
+
+def test_per_session_cooldown():
+
+    with Module(name=DEFAULT_MODULE_NAME):
+
+        prop = Property(name=DEFAULT_PROPERTY_NAME, default_value="")
+
+        @state(cond=sig_startup, weight=2., cooldown=10.)
+        def cool(ctx):
+            pass
+
+    host = ContextHost(DEFAULT_MODULE_NAME)
+    child = Property(name="child", default_value="young")
+    assert prop.push(child)
+    host._template.add_prop(prop=child)
+
+    first = host.add_session(1)
+    second = host.add_session(2)
+
+    # Cloned children are linked to their cloned parents
+    assert first[prop.id()].children["child"] is first[child.id()]
+    assert first[child.id()] is not child
+    assert second[prop.id()].children["child"] is not first[child.id()]
+
+    # Only the first session runs, and it's clock is far ahead of the second session's clock
+    first.run_once(100.)
+    assert first.wait_for_state(cool)
+    assert not second.wait_for_state(cool, timeout=0.)
+    assert first.last_activation_time(cool) == 100.
+    assert cool.get_current_weight(first.clock(), first.last_activation_time(cool)) == 0.
+
+    # The cooldown in the first session must not affect the second session
+    assert second.last_activation_time(cool) is None
+    assert cool.get_current_weight(second.clock(), second.last_activation_time(cool)) == 2.
+    second.run_once(1.)
+    assert second.wait_for_state(cool)
+    assert second.last_activation_time(cool) == 1.
+
+    host.shutdown()
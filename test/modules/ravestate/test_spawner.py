@@ -0,0 +1,23 @@
+import os
+import signal
+import psutil
+
+from ravestate.spawner import ContextSpawner
+
+
+def test_spawn_session():
+    spawner = ContextSpawner()
+    assert spawner.ready(timeout=30.)
+
+    pid = spawner.spawn()
+    session = psutil.Process(pid)
+    assert session.is_running()
+    assert session.ppid() == spawner._template_pid
+
+    # Sessions outlive the template process
+    spawner.shutdown()
+    assert session.is_running()
+    assert spawner.spawn() is None
+
+    os.kill(pid, signal.SIGKILL)
+    session.wait(timeout=10.)
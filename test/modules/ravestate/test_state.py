@@ -83,3 +83,24 @@ def test_decorator_default(under_test):
     assert (test_state.constraint is None)
     assert (test_state(default_context_wrapper) == "Hello world!")
     assert (isinstance(test_state.action, type(under_test.action)))
+
+
+def test_cooldown_weight():
+    def cooling_state(ctx):
+        pass
+
+    under_test = State(
+        signal=None,
+        read=(),
+        write=(),
+        cond=SignalRef("idle"),
+        action=cooling_state,
+        weight=2.,
+        cooldown=4.)
+    assert under_test.get_current_weight(0.) == 2.
+    under_test.activation_finished()
+    assert under_test.wait(timeout=0.)
+    assert under_test.get_current_weight(10., 10.) == 0.
+    assert under_test.get_current_weight(11., 10.) == .5
+    assert under_test.get_current_weight(14., 10.) == 2.
+    assert under_test.get_current_weight(100., 10.) == 2.
@@ -144,3 +144,38 @@ def test_property_nested_2(mocker, context_wrapper_fixture, context_with_propert
             boring=False)
         assert [] == list(context_wrapper_fixture.enum(CHILD_PROPERTY_ID))
         assert CHILD_PROPERTY_ID in list(context_wrapper_fixture.enum(DEFAULT_PROPERTY_ID))
+
+
+def test_property_access_table(mocker, context_wrapper_fixture, context_with_property_fixture, state_fixture):
+    table = context_with_property_fixture.property_access_table(state_fixture)
+    assert context_with_property_fixture.property_access_table(state_fixture) is table
+    assert DEFAULT_PROPERTY in table.writable_props
+    # Property wrappers are only created upon first access
+    assert not context_wrapper_fixture.properties
+    assert context_wrapper_fixture[DEFAULT_PROPERTY_ID] == DEFAULT_PROPERTY_VALUE
+    assert list(context_wrapper_fixture.properties) == [DEFAULT_PROPERTY_ID]
+
+    with mocker.patch.object(context_with_property_fixture, 'emit'):
+        assert context_wrapper_fixture.push(parent_property_or_path=DEFAULT_PROPERTY_ID,
+                                            child=Property(name="lazy_child"))
+        # The shared table must not be modified by the wrapper
+        assert f"{DEFAULT_PROPERTY_ID}:lazy_child" not in table.permissions
+        assert context_wrapper_fixture.pop(f"{DEFAULT_PROPERTY_ID}:lazy_child")
+
+
+def test_read_snapshot_at_construction(context_with_property_fixture):
+    @state(read=DEFAULT_PROPERTY)
+    def read_only_state(ctx):
+        pass
+    read_only_state.module_name = DEFAULT_MODULE_NAME
+
+    prop = context_with_property_fixture[DEFAULT_PROPERTY_ID]
+    ctx_wrapper = ContextWrapper(ctx=context_with_property_fixture, state=read_only_state)
+    try:
+        # A write between the activation and the first read must not be visible
+        prop.write(NEW_PROPERTY_VALUE)
+        assert not ctx_wrapper.properties
+        assert ctx_wrapper[DEFAULT_PROPERTY_ID] == DEFAULT_PROPERTY_VALUE
+        assert ContextWrapper(ctx=context_with_property_fixture, state=read_only_state)[DEFAULT_PROPERTY_ID] == NEW_PROPERTY_VALUE
+    finally:
+        prop.write(DEFAULT_PROPERTY_VALUE)
@@ -1,3 +1,5 @@
+from threading import Thread
+
 from ravestate.testfixtures import *
 from ravestate.constraint import SignalRef
 from ravestate.icontext import IContext
@@ -96,9 +98,13 @@ def test_property_read_only(under_test_read_only: PropertyWrapper, default_prope
 
 def test_property_write(under_test_read_write: PropertyWrapper, default_property_base, context_mock):
     # Make sure that writing to writable wrapper is effective
-    assert (default_property_base._lock.locked())
-    under_test_read_write.set(NEW_PROPERTY_VALUE)
-    assert (under_test_read_write.get() == NEW_PROPERTY_VALUE)
+    assert (not default_property_base._lock.locked())
+    with under_test_read_write:
+        assert (default_property_base._lock.locked())
+        under_test_read_write.set(NEW_PROPERTY_VALUE)
+        assert (under_test_read_write.get() == NEW_PROPERTY_VALUE)
+    assert (not default_property_base._lock.locked())
+    assert (default_property_base.lock_wait_count == 1)
     context_mock.emit.assert_called_once_with(
         SignalRef(f"{under_test_read_write.prop.id()}:changed"),
         parents=None,
@@ -107,11 +113,44 @@ def test_property_write(under_test_read_write: PropertyWrapper, default_property
         boring=False)
 
 
+def test_property_read_during_write(default_property_base, context_mock):
+    # Make sure that readers neither block on writers, nor see their new versions
+    with PropertyWrapper(prop=default_property_base, ctx=context_mock, allow_read=True, allow_write=True) as writer:
+        writer.set(NEW_PROPERTY_VALUE)
+        reader = PropertyWrapper(prop=default_property_base, ctx=context_mock, allow_read=True, allow_write=False)
+        assert (reader.get() == NEW_PROPERTY_VALUE)
+        writer.set(DEFAULT_PROPERTY_VALUE)
+        assert (reader.get() == NEW_PROPERTY_VALUE)
+        assert (reader.frozen_version == default_property_base.version() - 1)
+    assert (default_property_base.lock_wait_count == 1)
+
+
+def test_property_readers_do_not_wait_for_writer(default_property_base, context_mock):
+    num_readers = 50
+    values_read = []
+
+    def read():
+        reader = PropertyWrapper(prop=default_property_base, ctx=context_mock, allow_read=True, allow_write=False)
+        values_read.append(reader.get())
+
+    with PropertyWrapper(prop=default_property_base, ctx=context_mock, allow_read=True, allow_write=True) as writer:
+        writer.set(NEW_PROPERTY_VALUE)
+        # All readers complete while the writer still holds the lock
+        readers = [Thread(target=read) for _ in range(num_readers)]
+        for reader in readers:
+            reader.start()
+        for reader in readers:
+            reader.join(timeout=5.)
+            assert not reader.is_alive()
+    assert (values_read == [NEW_PROPERTY_VALUE] * num_readers)
+    assert (default_property_base.lock_wait_count == 1)
+
+
 def test_flag_property(context_mock):
     prop_base = Property(name="flag_prop", is_flag_property=True)
     prop_base.set_parent_path(DEFAULT_MODULE_NAME)
     prop_wrapper = PropertyWrapper(prop=prop_base, ctx=context_mock, allow_read=True, allow_write=True)
-    assert (prop_base._lock.locked())
+    assert (not prop_base._lock.locked())
 
     prop_wrapper.set(True)
     assert (prop_wrapper.get() is True)
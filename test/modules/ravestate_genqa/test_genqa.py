@@ -23,7 +23,7 @@ def test_drqa_module(mocker, context_wrapper_fixture: Context):
         verbalizer_mock = mocker.patch('ravestate_verbaliser.verbaliser.get_random_phrase')
         import ravestate_genqa
         result = ravestate_genqa.drqa_module(context_wrapper_fixture)
-        verbalizer_mock.assert_called_once_with("question-answering-starting-phrases")
+        verbalizer_mock.assert_called_once_with("question-answering-starting-phrases", ctx=context_wrapper_fixture)
         capture.check_present('Server address is not set. Shutting down GenQA.')
         assert isinstance(result, Delete)
         # TODO: Write test for server address present
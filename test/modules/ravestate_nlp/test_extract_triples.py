@@ -46,3 +46,16 @@ def test_attr_triples(spacy_model, text_input, expected_triples):
                          )
 def test_questions(spacy_model, text_input, expected_triples):
     basic_test(expected_triples, spacy_model, text_input)
+
+
+def test_deep_tree():
+    from ravestate_nlp.parse import ParsedToken, EMPTY_TOKEN
+    from ravestate_nlp.extract_triples import extract_triples_from_tokens
+    # deeper than the recursion limit, e.g. a long paragraph of nested clauses
+    tokens = [ParsedToken(i=i, text=f"w{i}", lemma_=f"w{i}", dep_="prep") for i in range(5000)]
+    tokens[0].dep_ = "ROOT"
+    tokens[1].dep_ = "nsubj"
+    tokens[-1].dep_ = "dobj"
+    for parent, child in zip(tokens, tokens[1:]):
+        parent.children.append(child)
+    assert extract_triples_from_tokens(tokens, EMPTY_TOKEN) == [('w1', 'w0', 'w4999')]
@@ -0,0 +1,27 @@
+from ravestate_nlp import IntentIndex
+
+
+def test_phrases_match_whole_input():
+    index = IntentIndex()
+    index.add_phrases("greeting", ["Hi", "good morning"])
+    assert index.match(" good  Morning", ("good", "morning")) == {"greeting"}
+    assert index.match("hi roboy", ("hi", "roboy")) == set()
+
+
+def test_keywords_match_lemma_sequences():
+    index = IntentIndex()
+    index.add_keywords("food", ["pizza", "ice cream"])
+    index.add_keywords("cold", ["ice"])
+    assert index.match("i ate ice creams", ("i", "eat", "ice", "cream")) == {"food", "cold"}
+    assert index.match("cream and ice", ("cream", "and", "ice")) == {"cold"}
+    assert index.match("i like pizza", ("i", "like", "pizza")) == {"food"}
+    assert index.match("i like pasta", ("i", "like", "pasta")) == set()
+
+
+def test_phrases_and_keywords():
+    index = IntentIndex()
+    index.add_phrases("greeting", ["hi"])
+    index.add_keywords("greeting", ["hello"])
+    index.add_keywords("affectionate", ["cute"])
+    assert index.match("hi", ("hi",)) == {"greeting"}
+    assert index.match("hello cute robot", ("hello", "cute", "robot")) == {"greeting", "affectionate"}
@@ -0,0 +1,54 @@
+import pickle
+
+import pytest
+from ravestate_nlp import spacy_nlp_en, parse_doc, disabled_pipes, NlpPool, ParseResult
+
+
+@pytest.mark.parametrize('text_input',
+                         ['i like pizza and you have cake',
+                          'who are you',
+                          'yes'])
+def test_parse_doc(text_input):
+    doc = spacy_nlp_en(text_input)
+    result = parse_doc(doc)
+    assert result.tokens == tuple(token.text for token in doc)
+    assert result.lemmas == tuple(token.lemma_ for token in doc)
+    assert list(result.triples) == doc._.triples
+    assert result.yesno.yes() == doc._.yesno.yes()
+
+
+def test_parse_doc_features():
+    text = 'i like pizza'
+    doc = spacy_nlp_en(text, disable=disabled_pipes(spacy_nlp_en.pipe_names, {"tokens", "roboy"}))
+    result = parse_doc(doc, {"tokens", "roboy"})
+    assert result.tokens == ('i', 'like', 'pizza')
+    assert not result.roboy
+    assert result.triples == () and result.ner == () and result.yesno is None
+
+
+def test_disabled_pipes():
+    pipes = ["tagger", "parser", "ner"]
+    assert disabled_pipes(pipes, {"tokens", "roboy", "yesno"}) == pipes
+    assert disabled_pipes(pipes, {"lemmas"}) == ["parser", "ner"]
+    assert disabled_pipes(pipes, {"triples", "ner"}) == []
+
+
+def test_parse_result_pickle():
+    result = parse_doc(spacy_nlp_en('my name is roboy'))
+    unpickled: ParseResult = pickle.loads(pickle.dumps(result))
+    assert unpickled.tokens == result.tokens
+    assert unpickled.triples == result.triples
+    assert unpickled.triples[0].match_either_lemma(pred={"be"})
+
+
+def test_pool():
+    texts = ['hi', 'how are you', 'i like pizza and you have cake']
+    pool = NlpPool(pool_size=2, batch_window=.01)
+    try:
+        assert pool.warm_up(timeout=120.)
+        results = pool.parse_all(texts, timeout=120.)
+    finally:
+        pool.shutdown()
+    for text, result in zip(texts, results):
+        assert result.tokens == parse_doc(spacy_nlp_en(text)).tokens
+        assert result.triples == parse_doc(spacy_nlp_en(text)).triples
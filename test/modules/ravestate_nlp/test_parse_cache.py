@@ -0,0 +1,35 @@
+from ravestate_nlp import ParseCache, ParseResult, get_parse_cache, normalize_text, FEATURES
+
+
+def test_normalize_text():
+    assert normalize_text("  What is   your NAME ") == "what is your name"
+
+
+def test_lru_eviction():
+    cache = ParseCache(max_size=2)
+    hi, bye, yes = ParseResult(tokens=("hi",)), ParseResult(tokens=("bye",)), ParseResult(tokens=("yes",))
+    cache.put("hi", FEATURES, hi)
+    cache.put("bye", FEATURES, bye)
+    assert cache.get(" Hi", FEATURES) is hi
+    # bye is the least recently used input now
+    cache.put("yes", FEATURES, yes)
+    assert len(cache) == 2
+    assert cache.get("bye", FEATURES) is None
+    assert cache.get("yes", FEATURES) is yes
+    assert cache.metrics() == {"hits": 2, "misses": 1, "size": 2, "hit_rate": 2 / 3}
+
+
+def test_features_are_part_of_the_key():
+    cache = ParseCache()
+    cache.put("hi", {"tokens"}, ParseResult(tokens=("hi",)))
+    assert cache.get("hi", {"tokens"}) is not None
+    assert cache.get("hi", FEATURES) is None
+
+
+def test_get_parse_cache():
+    class Owner:
+        pass
+    owner = Owner()
+    assert get_parse_cache(16) is get_parse_cache(16)
+    assert get_parse_cache(16, owner) is get_parse_cache(16, owner)
+    assert get_parse_cache(16, owner) is not get_parse_cache(16)
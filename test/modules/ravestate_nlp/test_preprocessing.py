@@ -58,3 +58,28 @@ def test_roboy(capture, basic_input):
     expected = True
     assert basic_input[prop_roboy] == expected
     capture.check_present((f"{FILE_NAME}", 'INFO', f"[NLP:roboy]: {expected}"))
+
+
+def test_consumed_features():
+    import ravestate as rs
+    from ravestate_nlp import consumed_features, sig_is_question
+
+    with rs.Module(name="nlp_consumers"):
+
+        @rs.state(read=prop_lemmas)
+        def read_lemmas(ctx):
+            pass
+
+        @rs.state(cond=sig_is_question)
+        def answer_question(ctx):
+            pass
+
+    ctx = rs.Context("ravestate_nlp")
+    # without consumers, the recognizers of the nlp module do not need any features
+    assert consumed_features(rs.ContextWrapper(ctx=ctx, state=nlp_preprocess)) == set()
+    ctx.add_state(st=read_lemmas)
+    assert consumed_features(rs.ContextWrapper(ctx=ctx, state=nlp_preprocess)) == {"lemmas"}
+    ctx.add_state(st=answer_question)
+    assert consumed_features(rs.ContextWrapper(ctx=ctx, state=nlp_preprocess)) == {"lemmas", "triples", "tags"}
+    # tests which pass a dictionary get all features
+    assert "ner" in consumed_features(dict())
@@ -0,0 +1,36 @@
+from threading import Event
+
+from ravestate_nlp import SpacyModel
+
+
+def test_load_on_first_use():
+    loads = []
+
+    def loader():
+        loads.append(True)
+        return lambda text: text.split()
+
+    model = SpacyModel(loader=loader)
+    assert not model.is_ready() and not loads
+    assert model("hello world") == ["hello", "world"]
+    assert model("bye") == ["bye"]
+    assert model.is_ready() and len(loads) == 1
+
+
+def test_load_async():
+    release = Event()
+    ready = Event()
+
+    def loader():
+        release.wait()
+        return "model"
+
+    model = SpacyModel(loader=loader)
+    model.load_async(on_ready=ready.set)
+    assert not model.is_ready()
+    release.set()
+    assert ready.wait(1.)
+    assert model.is_ready()
+    assert model.load() == "model"
+    # attributes are forwarded to the loaded model
+    assert model.upper() == "MODEL"
@@ -1,8 +1,10 @@
 import logging
+import pickle
 
 import pytest
 
 from ravestate_nlp import Triple, spacy_nlp_en, extract_triples
+from ravestate_nlp.triple import TripleToken
 from testfixtures import LogCapture
 
 
@@ -160,3 +162,10 @@ def test_match_either_lemma_subject_recognition_fail(text_input,  predicate, sub
     else:
         assert False
 
+
+def test_compact_tokens():
+    triple = spacy_nlp_en('how old are you')._.triples[0]
+    # triples keep compact copies of their tokens instead of the spaCy tokens
+    assert isinstance(triple.get_predicate(), TripleToken)
+    assert triple.match_either_lemma(pred={'old'}).preds == ('old',)
+    assert pickle.loads(pickle.dumps(triple)) == triple
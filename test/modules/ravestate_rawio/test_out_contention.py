@@ -0,0 +1,69 @@
+from threading import Semaphore, Event
+from time import sleep, perf_counter
+
+import ravestate_rawio as rawio
+from ravestate.testfixtures import *
+
+NUM_WRITERS = 50
+WRITE_DURATION = .002
+
+
+def test_out_write_lock_contention():
+    ctx = Context("ravestate_rawio")
+    prop_out = ctx[rawio.prop_out.id()]
+    leaked_wrappers = []
+    finished = Semaphore(0)
+
+    @receptor(ctx_wrap=ctx, write=rawio.prop_out)
+    def write_output(ctx_write, value):
+        # Keep the wrapper alive beyond the activation, like a reference cycle would.
+        leaked_wrappers.append(ctx_write)
+        sleep(WRITE_DURATION)
+        ctx_write[rawio.prop_out] = value
+        finished.release()
+
+    for i in range(NUM_WRITERS):
+        write_output(str(i))
+    for _ in range(NUM_WRITERS):
+        assert finished.acquire(timeout=5.)
+
+    # The lock must be released with the end of each state function,
+    #  even though all context wrappers are still referenced.
+    assert prop_out._lock.acquire(timeout=1.)
+    prop_out._lock.release()
+    assert len(leaked_wrappers) == NUM_WRITERS
+
+    metrics = ctx.lock_wait_metrics()[rawio.prop_out.id()]
+    assert metrics["count"] >= NUM_WRITERS
+
+
+def test_out_write_lock_released_before_wrapper():
+    ctx = Context("ravestate_rawio")
+    leaked_wrappers = []
+    first_written = Event()
+    second_written = Event()
+
+    @receptor(ctx_wrap=ctx, write=rawio.prop_out)
+    def write_first(ctx_write):
+        leaked_wrappers.append(ctx_write)
+        ctx_write[rawio.prop_out] = "first"
+        first_written.set()
+
+    @receptor(ctx_wrap=ctx, write=rawio.prop_out)
+    def write_second(ctx_write):
+        ctx_write[rawio.prop_out] = "second"
+        second_written.set()
+
+    write_first()
+    assert first_written.wait(5.)
+    wrapper_referenced_since = perf_counter()
+    # The metrics are cumulative, since the property is shared with other tests
+    metrics_before = ctx.lock_wait_metrics()[rawio.prop_out.id()]
+    write_second()
+    # If the lock was released when the wrapper is deleted, like before,
+    #  the second writer would wait for as long as the first wrapper is referenced.
+    assert second_written.wait(5.)
+    assert len(leaked_wrappers) == 1
+    metrics = ctx.lock_wait_metrics()[rawio.prop_out.id()]
+    assert metrics["count"] - metrics_before["count"] == 1
+    assert metrics["total"] - metrics_before["total"] < perf_counter() - wrapper_referenced_since
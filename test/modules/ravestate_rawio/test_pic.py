@@ -0,0 +1,32 @@
+import os
+
+import ravestate_rawio as rawio
+
+PIC = b"\x89PNG\r\n\x1a\nnot really a png"
+
+
+def test_open_pic(tmp_path):
+    with rawio.open_pic(PIC) as pic:
+        assert pic.read() == PIC
+    with rawio.open_pic(memoryview(PIC)) as pic:
+        assert pic.read() == PIC
+    path = tmp_path / "pic.png"
+    path.write_bytes(PIC)
+    with rawio.open_pic(str(path)) as pic:
+        assert pic.read() == PIC
+
+
+def test_pic_file(tmp_path):
+    with rawio.pic_file(memoryview(PIC), suffix=".png") as path:
+        assert path.endswith(".png")
+        with open(path, "rb") as pic:
+            assert pic.read() == PIC
+    # temporary files are deleted when the context is left
+    assert not os.path.exists(path)
+
+    existing_path = tmp_path / "pic.png"
+    existing_path.write_bytes(PIC)
+    with rawio.pic_file(str(existing_path)) as path:
+        assert path == str(existing_path)
+    # files which were passed by path are kept
+    assert existing_path.exists()
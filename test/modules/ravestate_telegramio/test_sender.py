@@ -0,0 +1,67 @@
+import time
+from threading import Event
+
+from ravestate_telegramio.sender import TelegramSender
+
+
+class FakeBot:
+
+    def __init__(self, expected_messages: int):
+        self.sent = []
+        self.done = Event()
+        self.expected_messages = expected_messages
+
+    def send_message(self, chat_id, text):
+        if text == "fail":
+            raise OSError("connection reset")
+        self.sent.append((time.monotonic(), chat_id, text))
+        if len(self.sent) >= self.expected_messages:
+            self.done.set()
+
+
+def test_send_in_order():
+    bot = FakeBot(expected_messages=3)
+    sender = TelegramSender(bot, messages_per_second=1000., chat_interval=0.)
+    for text in ("a", "b", "c"):
+        sender.send(42, text)
+    assert bot.done.wait(5.)
+    assert [text for _, _, text in bot.sent] == ["a", "b", "c"]
+    assert sender.pending() == 0
+    sender.shutdown()
+
+
+def test_rate_limits():
+    bot = FakeBot(expected_messages=4)
+    sender = TelegramSender(bot, messages_per_second=100., chat_interval=.1)
+    # two messages for each chat: chats are interleaved, messages to one chat are spaced by the chat interval
+    for chat_id in (1, 1, 2, 2):
+        sender.send(chat_id, str(chat_id))
+    assert bot.done.wait(5.)
+    assert [chat_id for _, chat_id, _ in bot.sent] == [1, 2, 1, 2]
+    send_times = [send_time for send_time, _, _ in bot.sent]
+    assert all(later - earlier >= .01 - 1e-3 for earlier, later in zip(send_times, send_times[1:]))
+    assert send_times[2] - send_times[0] >= .1 - 1e-3
+    sender.shutdown()
+
+
+def test_group_chat_interval():
+    bot = FakeBot(expected_messages=4)
+    sender = TelegramSender(bot, messages_per_second=1000., chat_interval=0., group_chat_interval=.2)
+    for chat_id in (-1, -1, 1, 1):
+        sender.send(chat_id, str(chat_id))
+    assert bot.done.wait(5.)
+    # the private chat is not held back by the group chat
+    assert [chat_id for _, chat_id, _ in bot.sent] == [-1, 1, 1, -1]
+    group_send_times = [send_time for send_time, chat_id, _ in bot.sent if chat_id < 0]
+    assert group_send_times[1] - group_send_times[0] >= .2 - 1e-3
+    sender.shutdown()
+
+
+def test_send_after_error():
+    bot = FakeBot(expected_messages=1)
+    sender = TelegramSender(bot, messages_per_second=1000., chat_interval=0.)
+    sender.send(42, "fail")
+    sender.send(42, "a")
+    assert bot.done.wait(5.)
+    assert [text for _, _, text in bot.sent] == ["a"]
+    sender.shutdown()
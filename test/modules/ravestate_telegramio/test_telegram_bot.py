@@ -71,3 +71,41 @@ def test_timestamp(mocker):
         stamp.update()
         assert stamp.value == new_timemock
         assert stamp.age() == 0.
+
+
+def test_chat_ring():
+    ring = ChatRing()
+    assert ring.get(42) is None
+    for worker in range(4):
+        ring.add(worker)
+    assignment = {chat_id: ring.get(chat_id) for chat_id in range(1000)}
+    assert set(assignment.values()) == {0, 1, 2, 3}
+    # only the chats of a removed worker are moved
+    ring.remove(2)
+    for chat_id, worker in assignment.items():
+        if worker != 2:
+            assert ring.get(chat_id) == worker
+        else:
+            assert ring.get(chat_id) in {0, 1, 3}
+
+
+def test_chat_connection():
+    replies = []
+    chat = ChatConnection(42, lambda chat_id, text: replies.append((chat_id, text)))
+    message = ChatMessage(42, text="hi")
+    chat.put(message)
+    assert chat.recv() == message
+    chat.send("reply")
+    assert replies == [(42, "reply")]
+    chat.close()
+    with pytest.raises(EOFError):
+        chat.recv()
+
+
+def test_chat_message_codec():
+    message = ChatMessage(chat_id=-42, user_id=7, username="robo", full_name="Robo Boy", text="h\u00e4llo")
+    assert decode_chat_message(encode_chat_message(message)) == (CHAT_INPUT, message)
+    assert decode_chat_message(encode_chat_message(ChatMessage(5), kind=CHAT_REMOVE)) == (CHAT_REMOVE, ChatMessage(5))
+    replies = [(1, "hi"), (-2, ""), (3, "\u00fcber")]
+    assert decode_chat_replies(encode_chat_replies(replies)) == replies
+    assert decode_chat_replies(encode_chat_replies([])) == []
@@ -0,0 +1,80 @@
+import time
+
+from ravestate_telegramio.user_cache import UserNodeCache, CachedUser
+
+
+def test_lru_eviction():
+    cache = UserNodeCache(max_size=2)
+    cache.put(1, CachedUser(node_id=10))
+    cache.put(2, CachedUser(node_id=20))
+    assert cache.get(1).node_id == 10
+    # 2 is the least recently used user now
+    cache.put(3, CachedUser(node_id=30))
+    assert len(cache) == 2
+    assert cache.get(2) is None
+    assert cache.get(1).node_id == 10
+    assert cache.get(3).node_id == 30
+    assert (cache.hits, cache.misses) == (3, 1)
+
+
+def test_invalidate():
+    cache = UserNodeCache()
+    cache.put(1, CachedUser(node_id=10, username="bob", full_name="Bob"))
+    cache.invalidate(1)
+    assert cache.get(1) is None
+
+
+def test_disk_tier(tmp_path):
+    path = str(tmp_path / "users.db")
+    cache = UserNodeCache(max_size=1, path=path)
+    cache.put(1, CachedUser(node_id=10, username="bob", full_name="Bob"))
+    cache.put(2, CachedUser(node_id=20))
+    # evicted from memory, but still on disk
+    assert cache.get(1) == CachedUser(node_id=10, username="bob", full_name="Bob")
+
+    # another process sees the same entries
+    other_cache = UserNodeCache(path=path)
+    assert other_cache.get(2).node_id == 20
+    other_cache.invalidate(1)
+    assert UserNodeCache(path=path).get(1) is None
+
+
+def test_get_node_hit_does_not_retrieve(mocker):
+    sess = mocker.Mock()
+    node = object()
+    cache = UserNodeCache()
+    cache.put(1, CachedUser(node_id=10, username="bob", full_name="Bob", node=node, retrieved_at=time.time()))
+    assert cache.get_node(1, "bob", "Bob", sess) is node
+    sess.retrieve.assert_not_called()
+
+    # changed profiles invalidate the user
+    assert cache.get_node(1, "bobby", "Bob", sess) is None
+    assert cache.get(1) is None
+    sess.retrieve.assert_not_called()
+
+
+def test_get_node_refresh(mocker):
+    fresh_node = object()
+    sess = mocker.Mock()
+    sess.retrieve.return_value = [fresh_node]
+    cache = UserNodeCache(max_node_age=10.)
+    stale_node = object()
+    cache.put(1, CachedUser(node_id=10, node=stale_node, retrieved_at=time.time() - 20.))
+    # the stale node is returned right away, and refreshed in the background
+    assert cache.get_node(1, "", "", sess) is stale_node
+    cache._refresher().shutdown(wait=True)
+    sess.retrieve.assert_called_once_with(node_id=10)
+    assert cache.get(1).node is fresh_node
+
+
+def test_get_node_from_disk(mocker, tmp_path):
+    node = object()
+    sess = mocker.Mock()
+    sess.retrieve.return_value = [node]
+    path = str(tmp_path / "users.db")
+    UserNodeCache(path=path).put(1, CachedUser(node_id=10, node=node))
+    # only the node id is kept on disk, so the node is retrieved once
+    cache = UserNodeCache(path=path)
+    assert cache.get_node(1, "", "", sess) is node
+    assert cache.get_node(1, "", "", sess) is node
+    sess.retrieve.assert_called_once_with(node_id=10)
@@ -0,0 +1,53 @@
+import os
+from os.path import join, dirname, realpath
+
+from ravestate_verbaliser import phrase_store
+from ravestate_verbaliser.phrase_store import load_sections, CompiledSection, CompiledSections
+from ravestate_verbaliser.qa_phrases import QAPhrases
+
+PHRASES = b"""---
+type: phrases
+name: "greeting"
+opts:
+- "hi"
+- "hello"
+"""
+
+
+def test_compiled_file(tmpdir, mocker):
+    path = join(str(tmpdir), "phrases.yml")
+    compiled_dir = join(str(tmpdir), "compiled")
+    with open(path, 'wb') as phrase_file:
+        phrase_file.write(PHRASES)
+    sections = load_sections(path, compiled_dir)
+    assert [(entry_type, name) for entry_type, name, _ in sections] == [("phrases", "greeting")]
+    assert len(os.listdir(compiled_dir)) == 1
+
+    # the compiled file is read instead of the phrase file
+    compile_spy = mocker.spy(phrase_store, "compile_sections")
+    assert load_sections(path, compiled_dir) == sections
+    # ... also if only the modification time changed
+    os.utime(path, ns=(0, 0))
+    assert load_sections(path, compiled_dir) == sections
+    compile_spy.assert_not_called()
+
+    # a changed file is compiled again
+    with open(path, 'wb') as phrase_file:
+        phrase_file.write(PHRASES.replace(b"hello", b"hey"))
+    sections = load_sections(path, compiled_dir)
+    compile_spy.assert_called_once()
+    phrases = CompiledSections()
+    phrases["greeting"] = CompiledSection(sections[0][2])
+    assert phrases.get("greeting") == ["hi", "hey"]
+
+
+def test_lazy_sections():
+    path = join(dirname(realpath(__file__)), "verbaliser_testfiles", "QAList_test.yml")
+    qa = CompiledSections(factory=QAPhrases)
+    for _, name, data in load_sections(path):
+        qa[name] = CompiledSection(data)
+    assert isinstance(dict.__getitem__(qa, "INTENT"), CompiledSection)
+    assert qa.get("INTENT").questions == ['Q1', 'Q2', 'Q3']
+    assert isinstance(dict.__getitem__(qa, "INTENT"), QAPhrases)
+    assert isinstance(dict.__getitem__(qa, "INTENT2"), CompiledSection)
+    assert qa.get("unknown") is None
@@ -0,0 +1,48 @@
+from ravestate.icontext import IContext
+from ravestate_verbaliser import verbaliser
+from ravestate_verbaliser.sampler import PhraseSampler
+
+PHRASES = ["a", "b", "c", "d", "e"]
+
+
+def test_no_repetitions():
+    sampler = PhraseSampler()
+    last = None
+    for _ in range(20):
+        drawn = [sampler.sample("intent", PHRASES) for _ in PHRASES]
+        # every phrase once per round, and no repetition between rounds
+        assert sorted(drawn) == PHRASES
+        assert drawn[0] != last
+        last = drawn[-1]
+
+
+def test_single_and_no_phrases():
+    sampler = PhraseSampler()
+    assert [sampler.sample("intent", ["a"]) for _ in range(3)] == ["a", "a", "a"]
+    assert sampler.sample("intent", None) is None
+    assert sampler.sample("intent", []) == []
+
+
+def test_changed_phrases():
+    sampler = PhraseSampler()
+    sampler.sample("intent", PHRASES)
+    # a new round starts with the new phrases
+    assert sorted(sampler.sample("intent", ["x", "y"]) for _ in range(2)) == ["x", "y"]
+
+
+def test_bounded_intents():
+    sampler = PhraseSampler(max_intents=2)
+    for intent in ("a", "b", "c"):
+        sampler.sample(intent, PHRASES)
+    assert list(sampler._bags) == ["b", "c"]
+
+
+def test_sampler_per_context():
+    class Ctx(IContext):
+        pass
+
+    ctx_a, ctx_b = Ctx(), Ctx()
+    assert verbaliser.get_sampler(ctx_a) is verbaliser.get_sampler(ctx_a)
+    assert verbaliser.get_sampler(ctx_a) is not verbaliser.get_sampler(ctx_b)
+    assert verbaliser.get_sampler(None) is verbaliser.default_sampler
+    assert verbaliser.get_sampler({}) is verbaliser.default_sampler
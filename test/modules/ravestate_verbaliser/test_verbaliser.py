@@ -3,14 +3,16 @@ from typing import List
 
 from ravestate.property import Property
 from ravestate_verbaliser import verbaliser
+from ravestate_verbaliser.phrase_store import CompiledSections
+from ravestate_verbaliser.qa_phrases import QAPhrases
 
 
 def cleanup_verbaliser():
     """
     Clean the dicts of the verbaliser to test with empty dicts
     """
-    verbaliser.qa = {}
-    verbaliser.phrases = {}
+    verbaliser.qa = CompiledSections(factory=QAPhrases)
+    verbaliser.phrases = CompiledSections()
 
 
 def assert_list_equ(actual: List, expected: List):